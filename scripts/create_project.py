@@ -1,10 +1,23 @@
 import argparse
-import json
-import requests
-import jwt
-import boto3
 import subprocess
+import os
+import sys
+import csv
+import json
+import math
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Determine the parent directory's path.
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to sys.path.
+sys.path.append(parent_dir + "/test")
+
+from utils import get_signed_headers, write_json_atomically  # noqa: E402
+from response_decoder import decode_response  # noqa: E402
+from long_poll import wait_for_generator  # noqa: E402
+from liveness import request_with_backoff  # noqa: E402
 
 
 REMOTE_URL = "https://e22ksqihwjm3chxizytehhluee0jckbd.lambda-url.us-west-2.on.aws"  # Dev_url
@@ -13,49 +26,69 @@ BASE_URL = REMOTE_URL
 
 python_cmd = "python3"  # or "python"
 
+# each onboarding stage and the stages that must finish before it starts
+#   the generators each read the repository directly, so they're independent of one another - data references
+#   upload all of the generated resources, so they wait for every generator
+ONBOARDING_STAGES = {
+    "projectsource": [],
+    "aispec": [],
+    "blueprint": [],
+    "data_references": ["projectsource", "aispec", "blueprint"],
+}
+
+# bulk onboarding runs the account check and project creation ahead of the generators for each repository
+BULK_ONBOARDING_STAGES = {
+    "account": [],
+    "create": ["account"],
+    **{stage: dependencies if dependencies else ["create"] for stage, dependencies in ONBOARDING_STAGES.items()},
+}
+
+# the most requests of each kind in flight across all repositories in bulk mode - generators share one limit
+BULK_STAGE_LIMITS = {
+    "account": 8,
+    "create": 4,
+    "generators": 6,
+    "data_references": 4,
+}
 
-def get_private_key():
-    secret_name = "boost-sara/sara-client-private-key"
-    region_name = "us-west-2"
 
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=region_name
-    )
+def get_headers(email):
+    # signed headers are cached and reused across calls - see test/tokens.py
+    return get_signed_headers(email)
 
-    get_secret_value_response = client.get_secret_value(
-        SecretId=secret_name
-    )
 
-    # Decrypts secret using the associated KMS key.
-    private_key = get_secret_value_response['SecretString']
+def send_with_backoff(verb, url, **kwargs):
+    # retry requests the service pushes back on (429/423) - see test/liveness.py
+    def print_retry(response, attempt, delay):
+        print(f"Service busy ({response.status_code}) for {verb} {url} - retrying in {delay:.1f} seconds")
 
-    return private_key
+    return request_with_backoff(verb, url, on_retry=print_retry, **kwargs)
 
 
-def get_headers(email):
-    private_key = get_private_key()
+class BackoffClient:
+    # GETs for the long-poll helpers, retried on 429/423 like every other onboarding request
+    def get(self, url, **kwargs):
+        return send_with_backoff("GET", url, **kwargs)
+
 
-    unsigned_identity = {"email": email}
-    signed_identity = jwt.encode(unsigned_identity, private_key, algorithm='RS256')
-    signed_headers = {'x-signed-identity': signed_identity}
+backoff_client = BackoffClient()
 
-    # unsignedHeaders = {'x-user-account': email}
 
-    return signed_headers
+def check_account(email, organization):
+    response = send_with_backoff("GET", f"{BASE_URL}/api/user/{organization}/account", headers=get_headers(email))
+    print(f"Account Status: ${response.json()}")
+    return response
 
 
-def create_project(email, organization, github_uri, project_name=None):
+def create_project(email, organization, github_uri, project_name=None, skip_account_check=False):
 
     # check account status
-    response = requests.get(f"{BASE_URL}/api/user/{organization}/account", headers=get_headers(email))
-    print(f"Account Status: ${response.json()}")
+    if not skip_account_check:
+        check_account(email, organization)
 
     data = {"resources": [{"uri": github_uri}]}
 
-    response = requests.post(f"{BASE_URL}/api/user_project/{organization}/{project_name}", json=data, headers=get_headers(email))
+    response = send_with_backoff("POST", f"{BASE_URL}/api/user_project/{organization}/{project_name}", json=data, headers=get_headers(email))
     return response
 
 
@@ -75,70 +108,274 @@ def read_file(file_path):
 
 def post_data_references(email, organization, project_name):
 
-    post_response = requests.post(f"{BASE_URL}/api/user_project/{organization}/{project_name}/data_references/", headers=get_headers(email))
+    post_response = send_with_backoff("POST", f"{BASE_URL}/api/user_project/{organization}/{project_name}/data_references/", headers=get_headers(email))
     if post_response.status_code != 200:
         print(f"Failed to process data references: {post_response.status_code}, {post_response.text}")
-        return
+        return False
 
     # GET request to retrieve processed data
-    get_response = requests.get(f"{BASE_URL}/api/user_project/{organization}/{project_name}/data_references/", headers=get_headers(email))
+    get_response = send_with_backoff("GET", f"{BASE_URL}/api/user_project/{organization}/{project_name}/data_references/", headers=get_headers(email))
     if get_response.status_code == 200:
         print(get_response.text)
     else:
         print(f"Failed to retrieve data references: {get_response.status_code}, {get_response.text}")
+    return True
 
 
-def helper_task_generator_launch(email, organization, project_name, resource_type):
+def helper_task_generator_launch(email, organization, project_name, resource_type, join_running=False):
+    # join_running waits for an already processing generator (e.g. one started by an interrupted bulk run)
+    #       instead of failing
     print(f"Launching a generator for a {resource_type} resource")
 
     headers = get_headers(email)
 
-    response = requests.get(f"{BASE_URL}/api/user_project/{organization}/{project_name}/data/{resource_type}/generator", headers=headers)
-    response_dict = response.json()
-    parsed_dict = json.loads(response_dict['body'])
+    response = send_with_backoff("GET", f"{BASE_URL}/api/user_project/{organization}/{project_name}/data/{resource_type}/generator", headers=headers)
+    parsed_dict = decode_response(response)
 
-    if parsed_dict['status'] != "idle":
-        print("Generator is not idle, please wait for processing to finish")
+    if parsed_dict['status'] == "processing" and join_running:
+        print(f"{resource_type} Generator is already processing - waiting for it to finish")
+    elif parsed_dict['status'] != "idle":
+        print(f"{resource_type} Generator is not idle, please wait for processing to finish")
         print(f"Generator status: {parsed_dict}")
 
-        exit(1)
+        # raised rather than exiting, since generators are launched from worker threads
+        raise RuntimeError(f"{resource_type} Generator is not idle")
+    else:
+        # start the task generator
+        response = send_with_backoff("POST", f"{BASE_URL}/api/user_project/{organization}/{project_name}/data/{resource_type}/generator", json={"status": "processing"}, headers=headers)
+        if response.status_code not in [200, 202]:
+            raise RuntimeError(f"Failed to start {resource_type} Generator: {response.status_code}, {response.text}")
 
-    # start the task generator
-    response = requests.post(f"{BASE_URL}/api/user_project/{organization}/{project_name}/data/{resource_type}/generator", json={"status": "processing"}, headers=headers)
-
-    # we'll loop until the generator is idle or in an error state - for 30 seconds max
-    #       every second, we'll do a GET and check its state
-    #       if it's idle, we'll break out of the loop and pass the test
-    #       if it's in an error state, we'll break out of the loop and fail the test
-    #       if it's still processing, we'll continue looping
-    #       each loop, we'll print the current generator state
-    # for i in range(48):
-    i = 0
-    while True:
-        i += 1
-        print(f"Checking {resource_type} Resource/Generator #{i}")
-
-        response = requests.get(f"{BASE_URL}/api/user_project/{organization}/{project_name}/data/{resource_type}/generator", headers=headers)
-        response_dict = response.json()
-        parsed_dict = json.loads(response_dict['body'])
-
-        print(f"Check {i}:\n\t{response.json()}")
-
-        # if the generator is idle or an error, we'll exit the loop
-        # otherwise, keep 'processing'
-        if parsed_dict["status"] == "idle":
-            break
-        if parsed_dict["status"] == "error":
-            break
-
-        # make sure the blueprint resource is still available
-        response = requests.get(f"{BASE_URL}/api/user_project/{organization}/{project_name}/data/{resource_type}", headers=headers)
-
-        # wait a couple seconds before re-sampling
-        time.sleep(5)
-
-    response = requests.get(f"{BASE_URL}/api/user_project/{organization}/{project_name}/data/{resource_type}", headers=headers)
+    # the service holds each check open until the generator is idle or in an error state, so we see completion
+    #       as soon as it happens - each check, we'll print the current generator state
+    def print_check(i, generator_state):
+        print(f"Check {resource_type} Resource/Generator #{i}:\n\t{generator_state}")
+
+    generator_state = wait_for_generator(BASE_URL, organization, project_name, resource_type, headers, on_check=print_check,
+                                         http=backoff_client)
+
+    response = send_with_backoff("GET", f"{BASE_URL}/api/user_project/{organization}/{project_name}/data/{resource_type}", headers=headers)
     print("Generated File Data: ", resource_type)
+    return generator_state
+
+
+def run_pipeline(stages, run_stage, max_workers=None):
+    # run every stage as soon as all of its dependencies have finished - stages without a dependency between
+    #   them run concurrently, so the total time is the critical path rather than the sum of the stages
+    #   returns {stage: (start, end)} in seconds from the start of the pipeline; a failed stage is re-raised
+    pipeline_start = time.perf_counter()
+    timings = {}
+    pending = dict(stages)
+    running = {}
+
+    def timed(stage):
+        start = time.perf_counter() - pipeline_start
+        run_stage(stage)
+        return start, time.perf_counter() - pipeline_start
+
+    with ThreadPoolExecutor(max_workers=max_workers if max_workers is not None else len(stages)) as executor:
+        while pending or running:
+            ready = [stage for stage, dependencies in pending.items() if all(d in timings for d in dependencies)]
+            for stage in ready:
+                del pending[stage]
+                running[executor.submit(timed, stage)] = stage
+
+            if not running:
+                raise ValueError(f"Stages with unresolvable dependencies: {', '.join(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                timings[stage] = future.result()
+
+    return timings
+
+
+def print_waterfall(timings, width=50):
+    # one bar per stage, positioned on a shared timeline - makes the critical path easy to spot
+    total = max(end for _, end in timings.values()) if timings else 0
+    scale = width / total if total > 0 else 0
+    name_width = max(len(stage) for stage in timings) if timings else 0
+
+    print("\nOnboarding Waterfall:")
+    for stage, (start, end) in sorted(timings.items(), key=lambda item: item[1]):
+        offset = int(start * scale)
+        bar = "#" * max(1, int(end * scale) - offset)
+        print(f"  {stage:<{name_width}} |{' ' * offset}{bar:<{width - offset}}| {start:7.1f}s - {end:7.1f}s ({end - start:.1f}s)")
+
+    serial = sum(end - start for start, end in timings.values())
+    print(f"  Total: {total:.1f}s (critical path) vs {serial:.1f}s if run serially")
+
+
+def load_repositories(repos_file, default_organization=None):
+    # read the repositories to onboard - a JSON list (of uris, or objects with github_uri / organization / project_name)
+    #   or a CSV file (with a github_uri header column, or one uri per line)
+    with open(repos_file, "r") as f:
+        content = f.read()
+
+    if repos_file.endswith(".json") or content.lstrip().startswith("["):
+        entries = json.loads(content)
+    else:
+        rows = [row for row in csv.reader(content.splitlines()) if row and row[0].strip() and not row[0].startswith("#")]
+        if rows and "github_uri" in [column.strip() for column in rows[0]]:
+            header = [column.strip() for column in rows[0]]
+            entries = [dict(zip(header, [value.strip() for value in row])) for row in rows[1:]]
+        else:
+            entries = [row[0].strip() for row in rows]
+
+    repositories = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"github_uri": entry}
+        github_uri = entry["github_uri"].rstrip("/")
+        repositories.append({
+            "github_uri": github_uri,
+            # same defaults as a single onboarding - organization and project come from the GitHub uri
+            "organization": entry.get("organization") or default_organization or github_uri.split('/')[-2],
+            "project_name": entry.get("project_name") or github_uri.split('/')[-1],
+        })
+    return repositories
+
+
+class OnboardingCheckpoint:
+    # records the finished stages of each repository, so a restarted bulk run resumes where it stopped
+    #   saved (atomically) after every stage - the file is plain JSON keyed by org/project
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self.state = json.load(f)
+
+    def completed_stages(self, key):
+        with self._lock:
+            return dict(self.state.get(key, {}).get("stages", {}))
+
+    def is_complete(self, key):
+        with self._lock:
+            return self.state.get(key, {}).get("status") == "complete"
+
+    def record_stage(self, key, stage, seconds):
+        with self._lock:
+            entry = self.state.setdefault(key, {"stages": {}})
+            entry["stages"][stage] = seconds
+            entry.pop("error", None)
+            self._save()
+
+    def record_result(self, key, status, error=None):
+        with self._lock:
+            entry = self.state.setdefault(key, {"stages": {}})
+            entry["status"] = status
+            if error is not None:
+                entry["error"] = error
+            self._save()
+
+    def _save(self):
+        write_json_atomically(self.path, self.state)
+
+
+def percentile(samples, fraction):
+    # nearest-rank percentile of an unsorted list
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def onboard_repositories(email, repositories, checkpoint, concurrency=4, stage_limits=None):
+    # push every repository through the onboarding stages - at most 'concurrency' repositories in flight, and
+    #   each kind of stage bounded separately across all of them; returns {"completed", "failed", "stageSeconds"}
+    stage_limits = stage_limits if stage_limits is not None else BULK_STAGE_LIMITS
+    limiters = {name: threading.BoundedSemaphore(limit) for name, limit in stage_limits.items()}
+    stage_seconds = {stage: [] for stage in BULK_ONBOARDING_STAGES}
+    results = {"completed": 0, "failed": 0, "skipped": 0, "stageSeconds": stage_seconds}
+    results_lock = threading.Lock()
+
+    def onboard(repository):
+        organization = repository["organization"]
+        project_name = repository["project_name"]
+        key = f"{organization}/{project_name}"
+        if checkpoint.is_complete(key):
+            with results_lock:
+                results["skipped"] += 1
+            return
+
+        completed = checkpoint.completed_stages(key)
+
+        def run_stage(stage):
+            if stage in completed:
+                return
+
+            limiter = limiters["generators" if stage in ONBOARDING_STAGES and stage != "data_references" else stage]
+            with limiter:
+                start = time.perf_counter()
+                if stage == "account":
+                    response = check_account(email, organization)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"Account check failed: {response.status_code}, {response.text}")
+                elif stage == "create":
+                    response = create_project(email, organization, repository["github_uri"], project_name, skip_account_check=True)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"Project creation failed: {response.status_code}, {response.text}")
+                elif stage == "data_references":
+                    if not post_data_references(email, organization, project_name):
+                        raise RuntimeError("Data references failed")
+                else:
+                    generator_state = helper_task_generator_launch(email, organization, project_name, stage, join_running=True)
+                    if generator_state.get("status") == "error":
+                        raise RuntimeError(f"{stage} Generator failed: {generator_state.get('statusDetails')}")
+                elapsed = time.perf_counter() - start
+
+            checkpoint.record_stage(key, stage, elapsed)
+            with results_lock:
+                stage_seconds[stage].append(elapsed)
+
+        try:
+            run_pipeline(BULK_ONBOARDING_STAGES, run_stage)
+        except Exception as e:
+            print(f"Failed to onboard {key}: {e}")
+            checkpoint.record_result(key, "failed", str(e))
+            with results_lock:
+                results["failed"] += 1
+            return
+
+        checkpoint.record_result(key, "complete")
+        with results_lock:
+            results["completed"] += 1
+        print(f"Onboarded {key}")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(onboard, repositories))
+
+    return results
+
+
+def print_throughput_report(results, seconds):
+    print("\nBulk Onboarding Report:")
+    print(f"  {results['completed']} onboarded, {results['failed']} failed, {results['skipped']} already complete (checkpoint)"
+          f" in {seconds / 60:.1f} minutes")
+    if seconds > 0:
+        print(f"  Throughput: {results['completed'] * 3600 / seconds:.1f} repos/hour")
+    for stage, samples in results["stageSeconds"].items():
+        if samples:
+            print(f"  {stage:<16} n={len(samples):<5} p50 {percentile(samples, 0.5):7.1f}s   p95 {percentile(samples, 0.95):7.1f}s"
+                  f"   max {max(samples):7.1f}s")
+
+
+def main_bulk(args):
+    repositories = load_repositories(args.repos_file, args.organization)
+    checkpoint = OnboardingCheckpoint(args.checkpoint if args.checkpoint else args.repos_file + ".checkpoint.json")
+    print(f"Onboarding {len(repositories)} repositories with concurrency {args.concurrency} - checkpoint: {checkpoint.path}")
+
+    start = time.perf_counter()
+    results = onboard_repositories(args.email, repositories, checkpoint, args.concurrency)
+    print_throughput_report(results, time.perf_counter() - start)
+
+    if results["failed"]:
+        exit(1)
 
 
 def main():
@@ -148,10 +385,16 @@ def main():
     parser.add_argument('--github_uri', type=str, help='URI to GitHub repository')
     # parser.add_argument('--path_to_summarizer', type=str, help='Path to summarizer folder')
     parser.add_argument('--project_name', nargs='?', type=str, help='Project name (optional)')
+    parser.add_argument('--repos_file', type=str, help='Onboard many repositories - CSV (github_uri[,organization,project_name]) or JSON list')
+    parser.add_argument('--concurrency', type=int, default=4, help='Repositories onboarded at once in --repos_file mode (default: 4)')
+    parser.add_argument('--checkpoint', type=str, help='Checkpoint file for resuming --repos_file mode (default: <repos_file>.checkpoint.json)')
     args = parser.parse_args()
 
     # Print the user information
     print(f"User Email: {args.email}")
+    if args.repos_file:
+        main_bulk(args)
+        return
     if not args.organization:
         # if no organization is provided, then we'll pull the organization name from github uri (e.g. polyverse-appsec)
         args.organization = args.github_uri.split('/')[-2]
@@ -177,12 +420,20 @@ def main():
     if response.status_code == 200:
         print("Project created successfully. Running additional scripts...")
 
-        helper_task_generator_launch(args.email, args.organization, args.project_name, "projectsource")
-        helper_task_generator_launch(args.email, args.organization, args.project_name, "aispec")
-        helper_task_generator_launch(args.email, args.organization, args.project_name, "blueprint")
+        def run_stage(stage):
+            if stage == "data_references":
+                # Poke openai to process the files
+                post_data_references(args.email, args.organization, args.project_name)
+            else:
+                helper_task_generator_launch(args.email, args.organization, args.project_name, stage)
+
+        try:
+            timings = run_pipeline(ONBOARDING_STAGES, run_stage)
+        except Exception as e:
+            print(f"Failed to onboard project: {e}")
+            exit(1)
 
-        # Poke openai to process the files
-        post_data_references(args.email, args.organization, args.project_name)
+        print_waterfall(timings)
         print("Successfully finished script! Created project, generated files, and posted to openai.")
 
     else:
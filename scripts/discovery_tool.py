@@ -5,7 +5,7 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Append the parent directory to sys.path.
 sys.path.append(parent_dir + "/test")
 
-import requests
+from http_client import client
 from utils import get_signed_headers  # Replace with the actual function name
 from constants import LOCAL_URL, CLOUD_URL_DEV, CLOUD_URL_PROD, CLOUD_URL_TEST, PREMIUM_EMAIL
 
@@ -33,21 +33,21 @@ email = "airbear109@gmail.com"
 signed_header_value = get_signed_headers(email)
 
 # Making the GET request
-#response = requests.post(project_creation_endpoint, json={"resources": [{"uri": "https://github.com/barchart/marketdata-api-js"}]}, headers=signed_header_value)
-#response = requests.post(status_endpoint, headers=signed_header_value)
-response = requests.post(discovery_endpoint, headers=signed_header_value)
-#response = requests.post(discovery_endpoint, json={"resetResources": True}, headers=signed_header_value)
-#response = requests.get(data_references_endpoint, headers=signed_header_value)
-#response = requests.post(data_references_endpoint, headers=signed_header_value)
-#response = requests.get(projectsource_generator_endpoint, headers=signed_header_value)
-#response = requests.post(projectsource_generator_start, json={"status": "processing"}, headers=signed_header_value )
-#response = requests.get(projectsource_get_resource, headers=signed_header_value)
-#response = requests.get(aispec_generator_endpoint, headers=signed_header_value)
-#response = requests.post(aispec_generator_start, json={"status": "processing"}, headers=signed_header_value)
-#response = requests.get(aispec_get_resource, headers=signed_header_value)
-#response = requests.get(blueprint_generator_endpoint, headers=signed_header_value)
-#response = requests.post(blueprint_generator_start, json={"status": "processing"}, headers=signed_header_value)
-#response = requests.get(blueprint_get_resource, headers=signed_header_value)
+#response = client.post(project_creation_endpoint, json={"resources": [{"uri": "https://github.com/barchart/marketdata-api-js"}]}, headers=signed_header_value)
+#response = client.post(status_endpoint, headers=signed_header_value)
+response = client.post(discovery_endpoint, headers=signed_header_value)
+#response = client.post(discovery_endpoint, json={"resetResources": True}, headers=signed_header_value)
+#response = client.get(data_references_endpoint, headers=signed_header_value)
+#response = client.post(data_references_endpoint, headers=signed_header_value)
+#response = client.get(projectsource_generator_endpoint, headers=signed_header_value)
+#response = client.post(projectsource_generator_start, json={"status": "processing"}, headers=signed_header_value )
+#response = client.get(projectsource_get_resource, headers=signed_header_value)
+#response = client.get(aispec_generator_endpoint, headers=signed_header_value)
+#response = client.post(aispec_generator_start, json={"status": "processing"}, headers=signed_header_value)
+#response = client.get(aispec_get_resource, headers=signed_header_value)
+#response = client.get(blueprint_generator_endpoint, headers=signed_header_value)
+#response = client.post(blueprint_generator_start, json={"status": "processing"}, headers=signed_header_value)
+#response = client.get(blueprint_get_resource, headers=signed_header_value)
 
 # Output the response
 print(response.status_code)
@@ -0,0 +1,122 @@
+import sys
+import csv
+import json
+from typing import Any, Dict, Iterable, Optional
+
+# flattened columns for search results - search endpoints return the owner/org/project either as the raw
+#   storage names (_userName, _ownerName, _projectName) or, once cleaned up, as owner/org/project
+EXPORT_COLUMNS = ["user", "org", "project", "status", "synchronized", "lastUpdated"]
+
+export_formats = ["ndjson", "csv", "parquet"]
+
+# rows buffered per Parquet row group - bounds memory while keeping row groups a reasonable size
+PARQUET_ROW_GROUP_SIZE = 10000
+
+
+def _last_updated(value: Any) -> Optional[int]:
+    # lastUpdated is normally unix seconds, but older records may store it as a float or a string
+    try:
+        return int(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_item(item: Any) -> Dict[str, Any]:
+    if not isinstance(item, dict):
+        return {"user": None, "org": None, "project": None, "status": None, "synchronized": None, "lastUpdated": None}
+    synchronized = item.get("synchronized")
+    return {
+        "user": item.get("_userName", item.get("owner")),
+        "org": item.get("_ownerName", item.get("org")),
+        "project": item.get("_projectName", item.get("project")),
+        "status": item.get("status"),
+        "synchronized": synchronized if isinstance(synchronized, bool) else None,
+        "lastUpdated": _last_updated(item.get("lastUpdated")),
+    }
+
+
+class NdjsonWriter:
+    # one complete JSON item per line - nothing is flattened or dropped
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, item):
+        self.out.write(json.dumps(item) + "\n")
+
+    def close(self):
+        self.out.flush()
+
+
+class CsvWriter:
+    def __init__(self, out):
+        self.out = out
+        self.writer = csv.DictWriter(out, fieldnames=EXPORT_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, item):
+        self.writer.writerow(flatten_item(item))
+
+    def close(self):
+        self.out.flush()
+
+
+class ParquetWriter:
+    # requires pyarrow - rows are written a row group at a time, so memory stays bounded for any number of items
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception("Parquet export requires pyarrow - pip install pyarrow")
+
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([
+            ("user", pyarrow.string()),
+            ("org", pyarrow.string()),
+            ("project", pyarrow.string()),
+            ("status", pyarrow.string()),
+            ("synchronized", pyarrow.bool_()),
+            ("lastUpdated", pyarrow.int64()),
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        self.rows = []
+
+    def write(self, item):
+        self.rows.append(flatten_item(item))
+        if len(self.rows) >= PARQUET_ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def export_items(items: Iterable[Any], export_format: str, output: Optional[str] = None) -> int:
+    # write items as they're produced - returns the number of items written
+    if export_format not in export_formats:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    if export_format == "parquet" and output is None:
+        raise ValueError("Parquet export requires an output file")
+
+    out = None
+    if export_format == "parquet":
+        writer = ParquetWriter(output)
+    else:
+        out = open(output, "w", newline="") if output is not None else sys.stdout
+        writer = NdjsonWriter(out) if export_format == "ndjson" else CsvWriter(out)
+
+    count = 0
+    try:
+        for item in items:
+            writer.write(item)
+            count += 1
+    finally:
+        writer.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+    return count
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+# Determine the parent directory's path.
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to sys.path.
+sys.path.append(parent_dir)
+
+try:
+    from test.http_client import client, SaraHttpClient
+except ImportError:
+    sys.path.append(parent_dir + "/test")
+
+    from http_client import client, SaraHttpClient  # type: ignore
+
+
+stage_frontend_auth = {
+    "local": "",
+    "dev": "AcU1ASQgZDY5YmJhNDgtNDY5My00MDI4LTk5NjAtZmQxNTQ5YjhkNDUwYjk2MjJmZmU3NjkzNDFjNTk4ZTEwM2I3ZTc0MzRhZjc=",
+    "test": "AbmDASQgN2RkM2Q4NDYtOGQwYy00MDYyLWI2YzItMGQyM2U2YjRiZTdhZmM3YmM3ZTk0OGVhNDNjMGFlYmY3ZWFhMTQyMmNlNjk=",
+    "prod": "AbmFASQgZmJiYWViOTAtYTQ4Ni00ZWViLWE3MWQtY2U3YjIyNzZlM2Y2OWE0NmMxNmRiY2MzNDBmOGIyYTQyMzU1MWFiMWY0MTQ="
+}
+
+stage_frontend_db = {
+    "local": "",
+    "dev": "diverse-sponge-50485",
+    "test": "sweet-bunny-47491",
+    "prod": "polite-cod-47493"
+}
+
+# a local Redis REST stand-in (e.g. serverless-redis-http in front of a local redis) - used for the local stage
+LOCAL_FRONTEND_URL = "http://localhost:8079"
+
+# keys per MGET command, MGET commands per pipeline request, and pipeline requests in flight
+DEFAULT_MGET_BATCH_SIZE = 100
+DEFAULT_COMMANDS_PER_PIPELINE = 10
+DEFAULT_PIPELINE_CONCURRENCY = 8
+
+# keys requested per SCAN round trip - a hint to redis, not a limit
+DEFAULT_SCAN_COUNT = 1000
+
+
+def frontend_url(stage: str) -> str:
+    # UPSTASH_REDIS_REST_URL overrides the stage database, e.g. to point any stage at a local stand-in
+    url = os.environ.get("UPSTASH_REDIS_REST_URL")
+    if url:
+        return url.rstrip("/")
+    if stage == "local" or not stage_frontend_db.get(stage):
+        return LOCAL_FRONTEND_URL
+    return f"https://{stage_frontend_db[stage]}.upstash.io"
+
+
+def frontend_auth_token(stage: str) -> str:
+    # Retrieve the auth token from the environment variable
+    auth_token = os.environ.get("UPSTASH_REDIS_REST_TOKEN") or os.environ.get("VERCEL_AUTH")
+    if not auth_token:
+        auth_token = stage_frontend_auth.get(stage, "")
+    if not auth_token and stage != "local":
+        raise Exception("VERCEL_AUTH environment variable not set.")
+    return auth_token
+
+
+def _decode_value(value: Any) -> Any:
+    # the frontend stores JSON documents as strings - return them parsed, anything else as-is
+    if isinstance(value, str) and len(value) > 0 and value[0] in ['{', '[']:
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+class FrontendDb:
+    # Upstash Redis REST client for the Sara frontend database
+    #   bulk reads batch keys into MGET commands, send several commands per /pipeline round trip, and keep
+    #   several pipelines in flight - so looking up an org's projects costs a handful of requests, not one each
+
+    def __init__(self, base_url: str, auth_token: str = "", http: Optional[SaraHttpClient] = None,
+                 batch_size: int = DEFAULT_MGET_BATCH_SIZE, commands_per_pipeline: int = DEFAULT_COMMANDS_PER_PIPELINE,
+                 concurrency: int = DEFAULT_PIPELINE_CONCURRENCY):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {auth_token}"} if auth_token else {}
+        self.http = http if http is not None else client
+        self.batch_size = batch_size
+        self.commands_per_pipeline = commands_per_pipeline
+        self.concurrency = concurrency
+        self.round_trips = 0
+
+    @classmethod
+    def for_stage(cls, stage: str, **kwargs) -> "FrontendDb":
+        return cls(frontend_url(stage), frontend_auth_token(stage), **kwargs)
+
+    def _raise_for_error(self, response, what: str):
+        if response.ok:
+            return
+        try:
+            error = response.json().get("error")
+        except ValueError:
+            error = response.text
+        raise Exception(f"Failed to {what} from Redis: Status code {response.status_code}, {error}")
+
+    def command_response(self, *args: Any) -> Dict[str, Any]:
+        # a single redis command's full REST response - e.g. {"result": [...]}
+        response = self.http.post(self.base_url, headers=self.headers, json=[str(arg) for arg in args])
+        self.round_trips += 1
+        self._raise_for_error(response, f"run {args[0]}")
+        return response.json()
+
+    def command(self, *args: Any) -> Any:
+        # a single redis command's result - e.g. command("GET", "project:abc")
+        return self.command_response(*args).get("result")
+
+    def pipeline(self, commands: List[List[Any]]) -> List[Any]:
+        # many commands in one round trip - results are returned in command order
+        response = self.http.post(f"{self.base_url}/pipeline", headers=self.headers,
+                                  json=[[str(arg) for arg in command] for command in commands])
+        self.round_trips += 1
+        self._raise_for_error(response, "run pipeline")
+
+        results = []
+        for command, result in zip(commands, response.json()):
+            if result.get("error"):
+                raise Exception(f"Redis {command[0]} failed: {result['error']}")
+            results.append(result.get("result"))
+        return results
+
+    def get(self, key: str) -> Any:
+        return _decode_value(self.command("GET", key))
+
+    def mget(self, keys: List[str]) -> Dict[str, Any]:
+        # look up any number of keys - returns key to (decoded) value, None for missing keys
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        batches = [keys[i:i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+        pipelines = [batches[i:i + self.commands_per_pipeline] for i in range(0, len(batches), self.commands_per_pipeline)]
+
+        def run_pipeline(pipeline_batches):
+            results = self.pipeline([["MGET", *batch] for batch in pipeline_batches])
+            return [(batch, values) for batch, values in zip(pipeline_batches, results)]
+
+        values = {}
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pipelines))) as executor:
+            for batch_results in executor.map(run_pipeline, pipelines):
+                for batch, batch_values in batch_results:
+                    for key, value in zip(batch, batch_values):
+                        values[key] = _decode_value(value)
+        return values
+
+    def scan(self, pattern: str, count: int = DEFAULT_SCAN_COUNT) -> Iterator[str]:
+        # iterate every key matching a pattern, following the SCAN cursor until redis returns it to "0"
+        #   redis may return a key more than once during a scan - duplicates are filtered out
+        seen = set()
+        cursor = "0"
+        while True:
+            cursor, keys = self.command("SCAN", cursor, "MATCH", pattern, "COUNT", count)
+            for key in keys:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+            if str(cursor) == "0":
+                return
+
+    def lookup_pattern(self, pattern: str, count: int = DEFAULT_SCAN_COUNT) -> Dict[str, Any]:
+        # every key matching the pattern, with its value
+        return self.mget(list(self.scan(pattern, count)))
@@ -0,0 +1,448 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+# Determine the parent directory's path.
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to sys.path.
+sys.path.append(parent_dir)
+
+try:
+    from test.utils import get_signed_headers, write_json_atomically
+    from test.http_client import client
+    from test.liveness import request_with_backoff, backoff_delay
+except ImportError:
+    sys.path.append(parent_dir + "/test")
+
+    from utils import get_signed_headers, write_json_atomically  # type: ignore
+    from http_client import client  # type: ignore
+    from liveness import request_with_backoff, backoff_delay  # type: ignore
+
+from sara_client import stage_url  # noqa: E402
+
+
+# files per listing page - the most OpenAI returns at once
+DEFAULT_PURGE_PAGE_SIZE = 1000
+
+# deletes in flight - OpenAI rate limits file deletes, so more workers mostly means more 429s
+DEFAULT_PURGE_CONCURRENCY = 4
+
+# assistants per deletion request (the service accepts at most 15) and deletion requests in flight
+DEFAULT_ASSISTANT_SLICE_SIZE = 10
+DEFAULT_ASSISTANT_CONCURRENCY = 4
+
+
+class PurgeCheckpoint:
+    # records purge progress, so an interrupted run resumes exactly where it stopped
+    #   'cursor' is the listing position of the page being purged, and 'done' the files of that page already handled -
+    #   so a restart re-lists that page and skips them; saved (atomically) after every file
+    #   'failed' files are kept out of 'done' and retried at the start of the next run - even once the purge is complete
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {"cursor": None, "done": [], "deleted": 0, "bytes": 0, "missing": 0, "failed": {}}
+        if path is not None and os.path.exists(path):
+            with open(path, "r") as f:
+                self.state.update(json.load(f))
+        self._done = set(self.state["done"])
+
+    @property
+    def cursor(self):
+        return self.state["cursor"]
+
+    @property
+    def complete(self):
+        return self.state.get("complete", False)
+
+    def is_done(self, file_id):
+        # handled already - failed files count too, since they're retried from 'failed' rather than the listing
+        with self._lock:
+            return file_id in self._done or file_id in self.state["failed"]
+
+    def failed_files(self):
+        # the files to retry - with their size, so a retried delete still counts its bytes
+        with self._lock:
+            return [{"id": file_id, "bytes": failure.get("bytes") if isinstance(failure, dict) else None}
+                    for file_id, failure in self.state["failed"].items()]
+
+    def record_file(self, file, deleted, error=None):
+        # deleted is True, False for a file that no longer exists, or None for a failure
+        with self._lock:
+            if deleted is None:
+                self.state["failed"][file["id"]] = {"error": error, "bytes": file.get("bytes")}
+                self._save()
+                return
+
+            self._done.add(file["id"])
+            self.state["done"].append(file["id"])
+            self.state["failed"].pop(file["id"], None)
+            if deleted:
+                self.state["deleted"] += 1
+                self.state["bytes"] += file.get("bytes") or 0
+            else:
+                self.state["missing"] += 1
+            self._save()
+
+    def record_page(self, next_cursor):
+        # the page is finished - move on to the next one (or mark the purge complete on the last page)
+        with self._lock:
+            self.state["cursor"] = next_cursor
+            self.state["done"] = []
+            self._done = set()
+            if next_cursor is None:
+                self.state["complete"] = True
+            self._save()
+
+    def _save(self):
+        if self.path is not None:
+            write_json_atomically(self.path, self.state)
+
+
+def parse_date(value):
+    # YYYY-MM-DD (UTC) or unix seconds
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    return int(datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+
+class RateLimitedConnector:
+    # signed requests to the service's OpenAI connector - a 429 pauses every worker sharing this connector (not just
+    #   the one that hit it) for the backoff, since they all draw on the same OpenAI rate limit
+
+    def __init__(self, base_url, email, org, http=client):
+        self.base_url = base_url
+        self.email = email
+        self.org = org
+        self.http = http
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def _on_retry(self, response, attempt, delay):
+        with self._lock:
+            self.rate_limited += 1
+        self._pause(delay)
+
+    def _pause(self, delay):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.time() + delay)
+
+    def _wait_for_rate_limit(self):
+        with self._lock:
+            remaining = self._resume_at - time.time()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _request(self, verb, url, **kwargs):
+        self._wait_for_rate_limit()
+        return request_with_backoff(verb, url, http=self.http, on_retry=self._on_retry,
+                                    headers=get_signed_headers(self.email), **kwargs)
+
+    @property
+    def assistants_url(self):
+        return f"{self.base_url}/api/user/{self.org}/connectors/openai/assistants"
+
+    def list_assistants(self):
+        # the caller's assistants - every assistant for an admin
+        response = self._request("GET", self.assistants_url)
+        if response.status_code != 200:
+            raise Exception(f"Failed to list assistants ({response.status_code}): {response.text}")
+        return response.json()
+
+
+class OpenAIFilePurge(RateLimitedConnector):
+    # client-driven purge of OpenAI files - lists files a page at a time through the service, and deletes each page
+    #   with a bounded pool of workers
+
+    def __init__(self, base_url, email, org, checkpoint, concurrency=DEFAULT_PURGE_CONCURRENCY,
+                 page_size=DEFAULT_PURGE_PAGE_SIZE, http=client):
+        super().__init__(base_url, email, org, http)
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.page_size = page_size
+
+    @property
+    def files_url(self):
+        return f"{self.base_url}/api/user/{self.org}/connectors/openai/files"
+
+    def list_page(self, cursor, after_date=None):
+        # one page of files - returns (files, next cursor), the next cursor is None on the last page
+        params = {"limit": self.page_size}
+        if cursor is not None:
+            params["cursor"] = cursor
+        if after_date is not None:
+            params["afterDate"] = datetime.fromtimestamp(after_date, timezone.utc).isoformat()
+        response = self._request("GET", self.files_url, params=params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to list files ({response.status_code}): {response.text}")
+        page = response.json()
+        return page.get("items", []), page.get("cursor")
+
+    def attached_file_ids(self):
+        # files attached to an assistant are still in use - unlike the service's groom, files only referenced by a
+        #   project's data_references (and not attached) aren't kept, so narrow the purge (--before, --prefix) to
+        #   keep those
+        return {file_id for assistant in self.list_assistants() for file_id in (assistant.get("file_ids") or [])}
+
+    def delete_file(self, file):
+        # returns True when deleted, False when the file no longer exists - raises on any other failure
+        response = self._request("DELETE", f"{self.files_url}/{file['id']}")
+        if response.status_code == 404:
+            return False
+        if response.status_code != 200:
+            raise Exception(f"Failed to delete {file['id']} ({response.status_code}): {response.text[:200]}")
+        return True
+
+    def _purge_file(self, file):
+        try:
+            deleted = self.delete_file(file)
+            self.checkpoint.record_file(file, deleted)
+        except Exception as e:
+            self.checkpoint.record_file(file, None, str(e))
+
+    def run(self, should_purge, after_date=None, dry_run=False, on_page=None):
+        # purge every file should_purge(file) selects, resuming from the checkpoint - files that failed on an
+        #   earlier run are retried first
+        #   on_page(page_number, listed, selected) is called as each page is finished
+        #   returns {"listed", "selected", "bytes", "retried"} for this run - in dry-run nothing is deleted or checkpointed
+        totals = {"listed": 0, "selected": 0, "bytes": 0, "retried": 0}
+        cursor = self.checkpoint.cursor
+        page_number = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            if not dry_run:
+                failed = self.checkpoint.failed_files()
+                totals["retried"] = len(failed)
+                list(executor.map(self._purge_file, failed))
+                if self.checkpoint.complete:
+                    return totals
+
+            while True:
+                files, next_cursor = self.list_page(cursor, after_date)
+                page_number += 1
+                selected = [file for file in files if should_purge(file) and not self.checkpoint.is_done(file["id"])]
+
+                totals["listed"] += len(files)
+                totals["selected"] += len(selected)
+                totals["bytes"] += sum(file.get("bytes") or 0 for file in selected)
+
+                if not dry_run:
+                    list(executor.map(self._purge_file, selected))
+                    self.checkpoint.record_page(next_cursor)
+
+                if on_page is not None:
+                    on_page(page_number, len(files), len(selected))
+
+                if next_cursor is None:
+                    return totals
+                cursor = next_cursor
+
+
+class AssistantCheckpoint:
+    # records assistant cleanup progress - the assistants to check (so a restart doesn't enumerate them again) and
+    #   the outcome of each; failed assistants are retried on the next run. Saved (atomically) after every slice
+    #   the mode is recorded too - a run without confirm only reports what it would delete, so its progress is
+    #   never resumed by a confirm run (or the other way round); the checkpoint starts over instead
+
+    def __init__(self, path, confirm=False):
+        self.path = path
+        self.confirm = confirm
+        self._lock = threading.Lock()
+        self.state = {"confirm": confirm, "candidates": None, "deleted": [], "kept": [], "missing": [], "failed": {}}
+        # why saved progress was discarded - None if it was resumed (or there was none)
+        self.reset_reason = None
+        if path is not None and os.path.exists(path):
+            with open(path, "r") as f:
+                saved = json.load(f)
+            if saved.get("confirm") == confirm:
+                self.state.update(saved)
+            else:
+                self.reset_reason = f"recorded by a run {'with' if saved.get('confirm') else 'without'} confirm"
+
+    @property
+    def candidates(self):
+        return self.state["candidates"]
+
+    def set_candidates(self, assistant_ids):
+        with self._lock:
+            self.state["candidates"] = assistant_ids
+            self._save()
+
+    def pending(self):
+        with self._lock:
+            finished = set(self.state["deleted"]) | set(self.state["kept"]) | set(self.state["missing"])
+            return [assistant_id for assistant_id in self.state["candidates"] or [] if assistant_id not in finished]
+
+    def counts(self):
+        with self._lock:
+            return {outcome: len(self.state[outcome]) for outcome in ["deleted", "kept", "missing", "failed"]}
+
+    def record_slice(self, result):
+        with self._lock:
+            for outcome in ["deleted", "kept", "missing"]:
+                for assistant_id in result.get(outcome, []):
+                    self.state[outcome].append(assistant_id)
+                    self.state["failed"].pop(assistant_id, None)
+            self.state["failed"].update(result.get("failed", {}))
+            self._save()
+
+    def _save(self):
+        if self.path is not None:
+            write_json_atomically(self.path, self.state)
+
+
+class AssistantCleanup(RateLimitedConnector):
+    # batched assistant deletion - instead of one request that checks and deletes every assistant (and runs into the
+    #   request timeout), the assistants are enumerated once and sent to the service in bounded slices, several
+    #   slices in flight; the service re-checks each assistant before deleting it and hands back any it didn't reach
+
+    def __init__(self, base_url, email, org, checkpoint, concurrency=DEFAULT_ASSISTANT_CONCURRENCY,
+                 slice_size=DEFAULT_ASSISTANT_SLICE_SIZE, http=client):
+        super().__init__(base_url, email, org, http)
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.slice_size = slice_size
+        self.early_stops = 0
+
+    def delete_slice(self, assistant_ids, no_files=True, confirm=False):
+        # returns the service's slice result - {deleted, kept, missing, failed, remaining}
+        params = {"ids": ",".join(assistant_ids)}
+        if no_files:
+            params["noFiles"] = ""
+        if confirm:
+            params["confirm"] = ""
+        response = self._request("DELETE", self.assistants_url, params=params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to delete assistants ({response.status_code}): {response.text[:200]}")
+        return response.json()
+
+    def run(self, no_files=True, confirm=False, on_progress=None):
+        # check (and with confirm, delete) every assistant - resuming from the checkpoint
+        #   on_progress(counts, total) is called after each slice; returns the checkpoint counts
+        if confirm != self.checkpoint.confirm:
+            raise ValueError(f"Checkpoint is for a run {'with' if self.checkpoint.confirm else 'without'} confirm")
+        if self.checkpoint.candidates is None:
+            self.checkpoint.set_candidates([assistant["id"] for assistant in self.list_assistants()])
+        pending = self.checkpoint.pending()
+        total = len(self.checkpoint.candidates)
+
+        queue = [pending[i:i + self.slice_size] for i in range(0, len(pending), self.slice_size)]
+        queue_lock = threading.Lock()
+
+        def next_slice():
+            with queue_lock:
+                return queue.pop(0) if queue else None
+
+        def worker():
+            while True:
+                assistant_ids = next_slice()
+                if assistant_ids is None:
+                    return
+                try:
+                    result = self.delete_slice(assistant_ids, no_files, confirm)
+                except Exception as e:
+                    result = {"failed": {assistant_id: str(e) for assistant_id in assistant_ids}}
+
+                self.checkpoint.record_slice(result)
+                remaining = result.get("remaining") or []
+                with queue_lock:
+                    if remaining:
+                        # the service stopped early (time budget or OpenAI rate limit) - back off before the rest
+                        self.early_stops += 1
+                        self._pause(backoff_delay(min(self.early_stops, 6), 1, 60))
+                        queue.append(remaining)
+                    else:
+                        self.early_stops = 0
+                if on_progress is not None:
+                    on_progress(self.checkpoint.counts(), total)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(self.concurrency)]:
+                future.result()
+        return self.checkpoint.counts()
+
+
+def format_bytes(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ["KB", "MB", "GB"]:
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Purge stale OpenAI files - resumable, with parallel deletes and rate-limit backoff.")
+    parser.add_argument("--email", required=True, help="The email of the user (an admin purges every file)")
+    parser.add_argument("--org", default="localhost", help="The org to purge (ignored for admins)")
+    parser.add_argument("--stage", default="local", choices=['local', 'dev', 'test', 'prod'], help="The Service to target (default: local)")
+    parser.add_argument("--checkpoint", required=False, help="Progress file - an interrupted purge resumes from it (default: openai_purge_<stage>.json)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_PURGE_CONCURRENCY, help=f"Deletes in flight (default: {DEFAULT_PURGE_CONCURRENCY})")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PURGE_PAGE_SIZE, help=f"Files listed per page (default: {DEFAULT_PURGE_PAGE_SIZE})")
+    parser.add_argument("--after", required=False, help="Only purge files created on or after this date (YYYY-MM-DD or unix seconds)")
+    parser.add_argument("--before", required=False, help="Only purge files created before this date (YYYY-MM-DD or unix seconds)")
+    parser.add_argument("--prefix", required=False, help="Only purge files whose name starts with this prefix")
+    parser.add_argument("--include-attached", action='store_true', help="Also purge files still attached to an assistant - files referenced by a project's data_references are purged either way, unlike the service's groom")
+    parser.add_argument("--dry-run", action='store_true', help="Report how many files (and bytes) would be purged, without deleting")
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint if args.checkpoint else f"openai_purge_{args.stage}.json"
+    checkpoint = PurgeCheckpoint(None if args.dry_run else checkpoint_path)
+    if checkpoint.complete and not checkpoint.state["failed"]:
+        print(f"Purge already complete per {checkpoint_path} - delete it to purge again")
+        return
+
+    purge = OpenAIFilePurge(stage_url[args.stage], args.email, args.org, checkpoint, args.concurrency, args.page_size)
+
+    after_date = parse_date(args.after)
+    before_date = parse_date(args.before)
+    attached = set() if args.include_attached else purge.attached_file_ids()
+    if attached:
+        print(f"Keeping {len(attached)} files attached to assistants")
+
+    def should_purge(file):
+        if file["id"] in attached:
+            return False
+        if before_date is not None and file.get("created_at", 0) >= before_date:
+            return False
+        return args.prefix is None or file.get("filename", "").startswith(args.prefix)
+
+    if checkpoint.state["failed"]:
+        print(f"Retrying {len(checkpoint.state['failed'])} files that failed to delete")
+    if checkpoint.complete:
+        print(f"Purge already complete per {checkpoint_path} - only retrying failures")
+    elif checkpoint.cursor is not None:
+        print(f"Resuming after file {checkpoint.cursor} ({checkpoint.state['deleted']} files deleted so far)")
+
+    start = time.perf_counter()
+
+    def print_page(page_number, listed, selected):
+        state = checkpoint.state
+        print(f"Page {page_number}: {listed} files, {selected} to purge"
+              + ("" if args.dry_run else f" - {state['deleted']} deleted ({format_bytes(state['bytes'])}), {len(state['failed'])} failed so far")
+              + f" - {time.perf_counter() - start:.1f} seconds")
+
+    totals = purge.run(should_purge, after_date, args.dry_run, print_page)
+    elapsed = time.perf_counter() - start
+
+    if args.dry_run:
+        print(f"Would purge {totals['selected']} of {totals['listed']} files ({format_bytes(totals['bytes'])}) in {elapsed:.1f} seconds")
+        return
+
+    state = checkpoint.state
+    print(f"Processed {totals['selected'] + totals['retried']} files this run in {elapsed:.1f} seconds ({(totals['selected'] + totals['retried']) / elapsed if elapsed > 0 else 0:.1f} files/sec)"
+          f" - {state['deleted']} deleted ({format_bytes(state['bytes'])}), {state['missing']} already gone, {len(state['failed'])} failed in total"
+          f"{f', {purge.rate_limited} rate limited retries' if purge.rate_limited else ''}")
+    if state["failed"]:
+        print(f"Failed files are recorded in {checkpoint_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+import os
+import sys
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+# Determine the parent directory's path.
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to sys.path.
+sys.path.append(parent_dir)
+
+try:
+    from test.utils import get_signed_headers
+    from test.http_client import client, SaraHttpClient
+    from test.response_cache import ResponseCache, response_cache, conditional_get
+    from test.long_poll import wait_for_generator, wait_for_project_status
+    from test.response_decoder import decode_response
+except ImportError:
+    sys.path.append(parent_dir + "/test")
+
+    from utils import get_signed_headers  # type: ignore
+    from http_client import client, SaraHttpClient  # type: ignore
+    from response_cache import ResponseCache, response_cache, conditional_get  # type: ignore
+    from long_poll import wait_for_generator, wait_for_project_status  # type: ignore
+    from response_decoder import decode_response  # type: ignore
+
+
+# Constants for URL options
+stage_url = {
+    "local": "http://localhost:3000",
+    "dev": "https://e22ksqihwjm3chxizytehhluee0jckbd.lambda-url.us-west-2.on.aws",
+    "test": "https://sztg3725fqtcptfts5vrvcozoe0nxcew.lambda-url.us-west-2.on.aws",
+    "prod": "https://33pdosoitl22c42c7sf46tabi40qwlae.lambda-url.us-west-2.on.aws"
+}
+
+# how many requests a single SaraClient will have in flight at once by default
+DEFAULT_CONCURRENCY = 16
+
+# GET methods whose responses carry ETag / Last-Modified validators - revalidated against the response cache
+cacheable_methods = ["status", "status_norefresh", "resource", "resource_status"]
+
+# search methods that support ?limit= / ?cursor= paging
+paged_methods = [
+    "status_all", "status_all_complete", "status_all_incomplete",
+    "projects_all",
+    "search_generators_all", "search_generators",
+    "groom_discoveries_list",
+]
+
+DEFAULT_SEARCH_PAGE_SIZE = 100
+
+
+def build_endpoints(URL, org, project, data):
+    # the full API surface used by the CLI, keyed by CLI method name
+    return {
+        "test": f"{URL}/test",
+        "test_patch": f"{URL}/test",
+        "version": f"{URL}/api/status",
+
+        "status": f"{URL}/api/user_project/{org}/{project}/status",
+        "status_norefresh": f"{URL}/api/user_project/{org}/{project}/status?readOnly",
+        "status_refresh": f"{URL}/api/user_project/{org}/{project}/status",
+        "status_assistant": f"{URL}/api/user_project/{org}/{project}/status?verifyAssistant",
+        "status_all": f"{URL}/api/search/projects/status",
+        "status_all_complete": f"{URL}/api/search/projects/status?synchronized=true",
+        "status_all_incomplete": f"{URL}/api/search/projects/status?synchronized=false",
+
+        "account": f"{URL}/api/user/{org}/account",
+        "org_account": f"{URL}/api/org/{org}/account",
+
+        "data_references": f"{URL}/api/user_project/{org}/{project}/data_references",
+        "data_references_refresh": f"{URL}/api/user_project/{org}/{project}/data_references",
+
+        "projects": f"{URL}/api/user_project/{org}/projects",
+        "projects_all": f"{URL}/api/search/projects",
+
+        "project": f"{URL}/api/user_project/{org}/{project}",
+        "project_create": f"{URL}/api/user_project/{org}/{project}",
+        "project_delete": f"{URL}/api/user_project/{org}/{project}",
+
+        "groom": f"{URL}/api/user_project/{org}/{project}/groom",
+        "groom_force": f"{URL}/api/user_project/{org}/{project}/groom?force",
+        "groom_whatif": f"{URL}/api/user_project/{org}/{project}/groom?whatif",
+        "groom_status": f"{URL}/api/user_project/{org}/{project}/groom",
+        "groom_toggle": f"{URL}/api/user_project/{org}/{project}/groom",
+
+        "discover": f"{URL}/api/user_project/{org}/{project}/discovery",
+        "discover_status": f"{URL}/api/user_project/{org}/{project}/discovery",
+        "rediscover": f"{URL}/api/user_project/{org}/{project}/discovery",
+
+        "resource": f"{URL}/api/user_project/{org}/{project}/data/{data}",
+
+        "gen_resource": f"{URL}/api/user_project/{org}/{project}/data/{data}/generator",
+
+        "gen_status": f"{URL}/api/user_project/{org}/{project}/data/{data}/generator",
+
+        "resource_status": f"{URL}/api/user_project/{org}/{project}/data/{data}/status",
+
+        "search_generators_all": f"{URL}/api/search/projects/generators",
+        "search_generators": f"{URL}/api/search/projects/generators?resource={data}",
+
+        "gen_resource_process": f"{URL}/api/user_project/{org}/{project}/data/{data}/generator/process",
+
+        "aifiles": f"{URL}/api/user/{org}/connectors/openai/files",
+        "aifiles_purge": f"{URL}/api/user/{org}/connectors/openai/files?groom&afterDate={data}",
+        "aifiles_purge_at": f"{URL}/api/user/{org}/connectors/openai/files?groom&startAtFile={data}",
+        "aifile_delete": f"{URL}/api/user/{org}/connectors/openai/files/{data}",
+
+        "assistant": f"{URL}/api/user/{org}/connectors/openai/assistants/{data}",
+        "assistants": f"{URL}/api/user/{org}/connectors/openai/assistants",
+        "delete_assistants": f"{URL}/api/user/{org}/connectors/openai/assistants?noFiles" + ("&confirm" if data == "confirm" else ""),
+
+        "github_access": f"{URL}/api/user/{org}/connectors/github/access?uri={data}",
+        "github_fullsource": f"{URL}/api/user/{org}/connectors/github/fullsource?uri={data}",
+
+        "timer_interval": f"{URL}/api/timer/interval",
+        "groom_discoveries_list": f"{URL}/api/search/projects/groom?status=Grooming",
+        "groom_discoveries": f"{URL}/api/groom/projects",
+
+        "aiproxy": f"{URL}/api/proxy/ai/{org}/{data}"
+    }
+
+
+# every method the endpoint table supports
+methods = list(build_endpoints("", None, None, None).keys())
+
+
+def verb_for_method(method: str) -> str:
+    # if method starts with "create_" or is "discover", then it's a POST request
+    return "POST" if (
+        "create" in method or  # noqa: W504
+        method.endswith("_gen") or  # noqa: W504
+        method in [
+            "discover",
+            "rediscover",
+            "data_references_refresh",
+            "status_refresh",
+            "status_assistant",
+            "timer_interval",
+            "groom_discoveries",
+            "groom_toggle",
+            "groom",
+            "groom_force",
+            "groom_whatif"
+        ]
+    ) else "DELETE" if (
+        "delete" in method or  # noqa: W504
+        "purge" in method
+    ) else "PATCH" if (
+        "test_patch" in method
+    ) else "GET"
+
+
+def payload_for_method(method: str, data: Any) -> Any:
+    data = data if method not in ["rediscover"] else json.dumps({"resetResources": True})
+    data = data if method not in ["groom_toggle"] else json.dumps({"status": "Disabled"}) if data is None else json.dumps({"status": "Idle"})
+    data = data if method not in ["project_create"] else json.dumps({"resources": [{"uri": data}]})
+    return data
+
+
+async def gather(aws: Iterable[Union[Awaitable[Any], Callable[[], Awaitable[Any]]]],
+                 limit: int = DEFAULT_CONCURRENCY, return_exceptions: bool = False) -> List[Any]:
+    # like asyncio.gather, but with at most 'limit' awaitables running at once
+    #   accepts coroutines or zero-argument coroutine factories (factories avoid creating hundreds of
+    #   pending coroutine objects up front) - results are returned in input order
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_bounded(aw):
+        async with semaphore:
+            if callable(aw):
+                aw = aw()
+            return await aw
+
+    return await asyncio.gather(*(run_bounded(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+class SaraClient:
+    # asyncio client for the Boost API
+    #   requests run on a dedicated thread pool over the shared pooled keep-alive HTTP client, so
+    #   many calls can be in flight at once while reusing connections and signed identity tokens
+
+    def __init__(self, stage: str = "local", email: Optional[str] = None, base_url: Optional[str] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, http: Optional[SaraHttpClient] = None,
+                 cache: Optional[ResponseCache] = None):
+        self.stage = stage
+        self.base_url = base_url if base_url is not None else stage_url[stage]
+        self.email = email
+        self.concurrency = concurrency
+
+        if http is None:
+            # make sure the connection pool can hold a connection for each in-flight request
+            http = client if concurrency <= client.pool_maxsize else SaraHttpClient(pool_maxsize=concurrency)
+        self.http = http
+        self.cache = cache if cache is not None else response_cache
+
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sara-client")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def endpoint(self, method: str, org: Optional[str] = None, project: Optional[str] = None, data: Any = None) -> str:
+        endpoints = build_endpoints(self.base_url, org, project, data)
+        if method not in endpoints:
+            raise ValueError(f"Method {method} is not supported.")
+        return endpoints[method]
+
+    def send(self, verb: str, url: str, data: Any = None, json_data: Any = None,
+             email: Optional[str] = None, timeout: Any = None, headers: Optional[Dict[str, str]] = None,
+             cached: bool = False, **kwargs):
+        # synchronous request - used directly by the CLI and from the executor by the coroutines
+        #   cached GETs revalidate a local copy, so an unchanged payload costs a 304 instead of a download
+        email = email if email is not None else self.email
+        request_headers = get_signed_headers(email) if email is not None else {}
+        if headers:
+            request_headers.update(headers)
+
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        if cached and verb == "GET" and not kwargs.get("stream"):
+            return conditional_get(url, request_headers, email, self.cache, self.http, **kwargs)
+
+        return self.http.request(verb, url, headers=request_headers, data=data, json=json_data, **kwargs)
+
+    async def request(self, verb: str, url: str, data: Any = None, json_data: Any = None,
+                      email: Optional[str] = None, timeout: Any = None, headers: Optional[Dict[str, str]] = None,
+                      cached: bool = False, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: self.send(verb, url, data, json_data, email, timeout, headers, cached, **kwargs))
+
+    async def call(self, method: str, org: Optional[str] = None, project: Optional[str] = None, data: Any = None,
+                   email: Optional[str] = None, **kwargs):
+        # invoke any endpoint table method by name, with the same verb and payload rules as the CLI
+        url = self.endpoint(method, org, project, data)
+        verb = verb_for_method(method)
+        # only POST methods carry a payload - for other verbs data is only used to build the url
+        payload = payload_for_method(method, data) if verb == "POST" else None
+        kwargs.setdefault("cached", method in cacheable_methods)
+        return await self.request(verb, url, payload, email=email, **kwargs)
+
+    def iter_search(self, url: str, page_size: int = DEFAULT_SEARCH_PAGE_SIZE, email: Optional[str] = None) -> Iterator[Any]:
+        # lazily yield search results a page at a time, following the service's opaque page cursor
+        #   a service without paging support returns the complete list in the first response
+        cursor = None
+        while True:
+            params: Dict[str, Any] = {"limit": page_size}
+            if cursor is not None:
+                params["cursor"] = cursor
+            response = self.send("GET", url, email=email, params=params)
+            if response.status_code != 200:
+                raise Exception(f"Search failed ({response.status_code}): {response.text}")
+
+            page = decode_response(response)
+            if isinstance(page, list):
+                yield from page
+                return
+
+            yield from page.get("items", [])
+            cursor = page.get("cursor")
+            if not cursor:
+                return
+
+    async def gather(self, aws, limit: Optional[int] = None, return_exceptions: bool = False) -> List[Any]:
+        return await gather(aws, limit if limit is not None else self.concurrency, return_exceptions)
+
+    def _project_url(self, org: str, project: str, path: str = "") -> str:
+        return f"{self.base_url}/api/user_project/{org}/{project}{path}"
+
+    # service
+    async def test(self):
+        return await self.call("test")
+
+    async def version(self):
+        return await self.call("version")
+
+    # accounts
+    async def account(self, org: str):
+        return await self.call("account", org)
+
+    async def org_account(self, org: str):
+        return await self.call("org_account", org)
+
+    # projects
+    async def projects(self, org: str):
+        return await self.call("projects", org)
+
+    async def project(self, org: str, project: str):
+        return await self.call("project", org, project)
+
+    async def create_project(self, org: str, project: str, uri: str):
+        return await self.request("POST", self._project_url(org, project), json_data={"resources": [{"uri": uri}]})
+
+    async def delete_project(self, org: str, project: str):
+        return await self.call("project_delete", org, project)
+
+    # status
+    async def status(self, org: str, project: str, refresh: bool = True):
+        return await self.call("status" if refresh else "status_norefresh", org, project)
+
+    async def refresh_status(self, org: str, project: str, verify_assistant: bool = False):
+        return await self.call("status_assistant" if verify_assistant else "status_refresh", org, project)
+
+    async def wait_for_status(self, org: str, project: str, states: Optional[List[str]] = None,
+                              timeout: Optional[float] = None, email: Optional[str] = None):
+        # long-polls until the project reaches one of the states (default: synchronized) - returns the decoded status
+        headers = get_signed_headers(email if email is not None else self.email)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: wait_for_project_status(self.base_url, org, project, headers, states, timeout, http=self.http))
+
+    # discovery
+    async def discovery(self, org: str, project: str):
+        return await self.call("discover_status", org, project)
+
+    async def discover(self, org: str, project: str, reset_resources: bool = False):
+        return await self.call("rediscover" if reset_resources else "discover", org, project)
+
+    # generators & resources
+    async def resource(self, org: str, project: str, resource: str):
+        return await self.call("resource", org, project, resource)
+
+    async def resource_status(self, org: str, project: str, resource: str):
+        return await self.call("resource_status", org, project, resource)
+
+    async def generator(self, org: str, project: str, resource: str):
+        return await self.call("gen_status", org, project, resource)
+
+    async def wait_for_generator(self, org: str, project: str, resource: str, states: Optional[List[str]] = None,
+                                 timeout: Optional[float] = None, email: Optional[str] = None):
+        # long-polls until the generator is idle or in error (or one of 'states') - returns the decoded generator state
+        headers = get_signed_headers(email if email is not None else self.email)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: wait_for_generator(self.base_url, org, project, resource, headers, states, timeout, http=self.http))
+
+    async def start_generator(self, org: str, project: str, resource: str, status: str = "processing"):
+        url = self._project_url(org, project, f"/data/{resource}/generator")
+        return await self.request("POST", url, json_data={"status": status})
+
+    async def process_generator_stage(self, org: str, project: str, resource: str, stage: str,
+                                      force_processing: bool = False):
+        url = self._project_url(org, project, f"/data/{resource}/generator/process")
+        body: Dict[str, Any] = {"stage": stage}
+        if force_processing:
+            body["forceProcessing"] = True
+        return await self.request("POST", url, json_data=body)
+
+    # data references
+    async def data_references(self, org: str, project: str):
+        return await self.call("data_references", org, project)
+
+    async def refresh_data_references(self, org: str, project: str):
+        return await self.call("data_references_refresh", org, project)
+
+    # search
+    async def search_projects(self):
+        return await self.call("projects_all")
+
+    async def search_status(self, synchronized: Optional[bool] = None):
+        return await self.call("status_all" if synchronized is None else
+                               "status_all_complete" if synchronized else "status_all_incomplete")
+
+    async def search_generators(self, resource: Optional[str] = None):
+        return await self.call("search_generators_all" if resource is None else "search_generators", data=resource)
+
+    async def search_grooming(self):
+        return await self.call("groom_discoveries_list")
+
+    # grooming
+    async def groom(self, org: str, project: str, force: bool = False, whatif: bool = False):
+        return await self.call("groom_force" if force else "groom_whatif" if whatif else "groom", org, project)
+
+    async def groom_status(self, org: str, project: str):
+        return await self.call("groom_status", org, project)
+
+    async def groom_projects(self):
+        return await self.call("groom_discoveries")
+
+    # openai connectors
+    async def openai_files(self, org: str):
+        return await self.call("aifiles", org)
+
+    async def delete_openai_file(self, org: str, file_id: str):
+        return await self.call("aifile_delete", org, data=file_id)
+
+    async def purge_openai_files(self, org: str, after_date: Optional[str] = None, start_at_file: Optional[str] = None):
+        if start_at_file is not None:
+            return await self.call("aifiles_purge_at", org, data=start_at_file)
+        return await self.call("aifiles_purge", org, data=after_date)
+
+    async def assistants(self, org: str):
+        return await self.call("assistants", org)
+
+    async def assistant(self, org: str, assistant_id: str):
+        return await self.call("assistant", org, data=assistant_id)
+
+    async def delete_assistants(self, org: str, confirm: bool = False):
+        return await self.call("delete_assistants", org, data="confirm" if confirm else None)
+
+    # github connectors
+    async def github_access(self, org: str, uri: str):
+        return await self.call("github_access", org, data=uri)
+
+    async def github(self, org: str, connector: str, uri: str, path: Optional[str] = None):
+        # connector is one of file, files, folders, fullsource, details
+        params = {"uri": uri}
+        if path is not None:
+            params["path"] = path
+        url = f"{self.base_url}/api/user/{org}/connectors/github/{connector}"
+        return await self.request("GET", url, params=params)
@@ -5,6 +5,7 @@ import sys
 import json
 import datetime
 import time
+import asyncio
 
 # Determine the parent directory's path.
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -13,261 +14,174 @@ sys.path.append(parent_dir)
 
 try:
     from test.utils import get_signed_headers
+    from test.response_decoder import decode_response, decode_text
+    from test.streaming import stream_to_file, iter_response_items
+    from test.liveness import wait_until_ready, BackgroundProbe
+    from test.response_cache import ResponseCache
 except ImportError:
     sys.path.append(parent_dir + "/test")
 
     from utils import get_signed_headers  # type: ignore
+    from response_decoder import decode_response, decode_text  # type: ignore
+    from streaming import stream_to_file, iter_response_items  # type: ignore
+    from liveness import wait_until_ready, BackgroundProbe  # type: ignore
+    from response_cache import ResponseCache  # type: ignore
 
+from sara_client import SaraClient, methods, verb_for_method, payload_for_method, paged_methods  # noqa: E402
+from frontend_db import FrontendDb  # noqa: E402
+from export import export_items, export_formats  # noqa: E402
+from openai_purge import AssistantCleanup, AssistantCheckpoint, DEFAULT_ASSISTANT_CONCURRENCY  # noqa: E402
 
-# Constants for URL options
-stage_url = {
-    "local": "http://localhost:3000",
-    "dev": "https://e22ksqihwjm3chxizytehhluee0jckbd.lambda-url.us-west-2.on.aws",
-    "test": "https://sztg3725fqtcptfts5vrvcozoe0nxcew.lambda-url.us-west-2.on.aws",
-    "prod": "https://33pdosoitl22c42c7sf46tabi40qwlae.lambda-url.us-west-2.on.aws"
-}
-
-stage_frontend_auth = {
-    "local": "",
-    "dev": "AcU1ASQgZDY5YmJhNDgtNDY5My00MDI4LTk5NjAtZmQxNTQ5YjhkNDUwYjk2MjJmZmU3NjkzNDFjNTk4ZTEwM2I3ZTc0MzRhZjc=",
-    "test": "AbmDASQgN2RkM2Q4NDYtOGQwYy00MDYyLWI2YzItMGQyM2U2YjRiZTdhZmM3YmM3ZTk0OGVhNDNjMGFlYmY3ZWFhMTQyMmNlNjk=",
-    "prod": "AbmFASQgZmJiYWViOTAtYTQ4Ni00ZWViLWE3MWQtY2U3YjIyNzZlM2Y2OWE0NmMxNmRiY2MzNDBmOGIyYTQyMzU1MWFiMWY0MTQ="
-}
-
-stage_frontend_db = {
-    "local": "",
-    "dev": "diverse-sponge-50485",
-    "test": "sweet-bunny-47491",
-    "prod": "polite-cod-47493"
-}
-
-
-def make_request(method, url, email, data, timeout=None):
-    signed_header_value = get_signed_headers(email) if email is not None else None
-    if method == "GET":
-        if timeout is not None:
-            response = requests.get(url, headers=signed_header_value, timeout=timeout)
-        else:
-            response = requests.get(url, headers=signed_header_value)
-    elif method == "POST":
-        response = requests.post(url, headers=signed_header_value, data=data)
-    elif method == "DELETE":
-        response = requests.delete(url, headers=signed_header_value)
-    elif method == "PATCH":
-        response = requests.patch(url, headers=signed_header_value)
-    else:
-        raise ValueError("Unsupported method")
-    return response
+# methods that can return very large payloads - streamed straight to --output instead of buffered in memory
+streaming_methods = ["resource", "github_fullsource"]
 
 
-def fetch_redis_key(stage, method, project, key):
-    # Use the Upstash Redis base URL
-    base_url = f"https://{stage_frontend_db[stage]}.upstash.io"
-    # Retrieve the auth token from the environment variable
-    auth_token = os.environ.get("VERCEL_AUTH")
-    if not auth_token:
-        auth_token = stage_frontend_auth[stage]
-    if not auth_token:
-        raise Exception("VERCEL_AUTH environment variable not set.")
-
+def frontend_key(method, project):
     if method == 'status':
-        redis_key = f"mget/project:{project}"
-    else:
-        raise Exception(f"Method {method} not supported for Redis lookup.")
-
-    # Construct the full URL for the GET operation
-    full_url = f"{base_url}/{redis_key}"
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = requests.get(full_url, headers=headers)
-    if response.ok:
-        return response.json()
-    else:
-        error_response = response.json()
-        raise Exception(f"Failed to fetch key {key if key is not None else project} from Redis: Status code {response.status_code}, {error_response['error']}")
-
-
-def main(email, org, project, method, stage, data, frontend=False, output=None):
-    if frontend:
-        try:
-            redis_response = fetch_redis_key(stage, method, project, data)
-            print(f"Sara DB ({stage}) Lookup:{method}:   {data if data is not None else project}: {redis_response}")
-            exit(0)
-        except Exception as e:
-            print(f"Error during Redis lookup: {e}")
-            sys.exit(1)
-
-    if method in ["create_auth_token"]:
-        expires = True if data is True else False
-        auth_token = get_signed_headers(email, expires, True)
-        print(f"Auth Token:\n{json.dumps(auth_token, indent=4)}")
-
-        exit(0)
-
-    URL = stage_url[stage]
-    endpoints = {
-        "test": f"{URL}/test",
-        "test_patch": f"{URL}/test",
-        "version": f"{URL}/api/status",
-
-        "status": f"{URL}/api/user_project/{org}/{project}/status",
-        "status_norefresh": f"{URL}/api/user_project/{org}/{project}/status?readOnly",
-        "status_refresh": f"{URL}/api/user_project/{org}/{project}/status",
-        "status_assistant": f"{URL}/api/user_project/{org}/{project}/status?verifyAssistant",
-        "status_all": f"{URL}/api/search/projects/status",
-        "status_all_complete": f"{URL}/api/search/projects/status?synchronized=true",
-        "status_all_incomplete": f"{URL}/api/search/projects/status?synchronized=false",
-
-        "account": f"{URL}/api/user/{org}/account",
-        "org_account": f"{URL}/api/org/{org}/account",
-
-        "data_references": f"{URL}/api/user_project/{org}/{project}/data_references",
-        "data_references_refresh": f"{URL}/api/user_project/{org}/{project}/data_references",
-
-        "projects": f"{URL}/api/user_project/{org}/projects",
-        "projects_all": f"{URL}/api/search/projects",
-
-        "project": f"{URL}/api/user_project/{org}/{project}",
-        "project_create": f"{URL}/api/user_project/{org}/{project}",
-        "project_delete": f"{URL}/api/user_project/{org}/{project}",
-
-        "groom": f"{URL}/api/user_project/{org}/{project}/groom",
-        "groom_force": f"{URL}/api/user_project/{org}/{project}/groom?force",
-        "groom_whatif": f"{URL}/api/user_project/{org}/{project}/groom?whatif",
-        "groom_status": f"{URL}/api/user_project/{org}/{project}/groom",
-        "groom_toggle": f"{URL}/api/user_project/{org}/{project}/groom",
-
-        "discover": f"{URL}/api/user_project/{org}/{project}/discovery",
-        "discover_status": f"{URL}/api/user_project/{org}/{project}/discovery",
-        "rediscover": f"{URL}/api/user_project/{org}/{project}/discovery",
-
-        "resource": f"{URL}/api/user_project/{org}/{project}/data/{data}",
-
-        "gen_resource": f"{URL}/api/user_project/{org}/{project}/data/{data}/generator",
-
-        "gen_status": f"{URL}/api/user_project/{org}/{project}/data/{data}/generator",
+        return f"project:{project}"
+    raise Exception(f"Method {method} not supported for Redis lookup.")
 
-        "resource_status": f"{URL}/api/user_project/{org}/{project}/data/{data}/status",
 
-        "search_generators_all": f"{URL}/api/search/projects/generators",
-        "search_generators": f"{URL}/api/search/projects/generators?resource={data}",
-
-        "gen_resource_process": f"{URL}/api/user_project/{org}/{project}/data/{data}/generator/process",
-
-        "aifiles": f"{URL}/api/user/{org}/connectors/openai/files",
-        "aifiles_purge": f"{URL}/api/user/{org}/connectors/openai/files?groom&afterDate={data}",
-        "aifiles_purge_at": f"{URL}/api/user/{org}/connectors/openai/files?groom&startAtFile={data}",
-        "aifile_delete": f"{URL}/api/user/{org}/connectors/openai/files/{data}",
-
-        "assistant": f"{URL}/api/user/{org}/connectors/openai/assistants/{data}",
-        "assistants": f"{URL}/api/user/{org}/connectors/openai/assistants",
-        "delete_assistants": f"{URL}/api/user/{org}/connectors/openai/assistants?noFiles" + ("&confirm" if data == "confirm" else ""),
-
-        "github_access": f"{URL}/api/user/{org}/connectors/github/access?uri={data}",
-
-        "timer_interval": f"{URL}/api/timer/interval",
-        "groom_discoveries_list": f"{URL}/api/search/projects/groom?status=Grooming",
-        "groom_discoveries": f"{URL}/api/groom/projects",
+def fetch_redis_key(stage, method, project, key):
+    redis_key = frontend_key(method, project)
+    try:
+        # the full {"result": ...} response - the single-key output consumers already parse
+        return FrontendDb.for_stage(stage).command_response("MGET", redis_key)
+    except Exception as e:
+        raise Exception(f"Failed to fetch key {key if key is not None else project}: {e}")
+
+
+def fetch_redis_keys(stage, method, targets=None, key_pattern=None, out=sys.stdout):
+    # bulk frontend lookup - the keys for many projects (or every key matching a pattern) are fetched with
+    #   pipelined MGETs, and written as NDJSON lines of {"key": ..., "value": ...}; returns the count of keys found
+    db = FrontendDb.for_stage(stage)
+    if key_pattern is not None:
+        values = db.lookup_pattern(key_pattern)
+    else:
+        values = db.mget([frontend_key(method, target_project) for _, target_project in targets])
+
+    found = 0
+    for redis_key, value in values.items():
+        if value is not None:
+            found += 1
+        out.write(json.dumps({"key": redis_key, "value": value}) + "\n")
+    out.flush()
+    print(f"Sara DB ({stage}) Lookup: {found} of {len(values)} keys found in {db.round_trips} round trips", file=sys.stderr)
+    return found
+
+
+def load_targets(projects_file, default_org):
+    # projects file is either JSON (a list of "org/project" strings or {"org": ..., "project": ...} objects)
+    #   or plain text with one "org/project" (or just "project") per line - blank lines and # comments are skipped
+    with open(projects_file, "r") as f:
+        content = f.read()
+
+    if content.lstrip().startswith("["):
+        entries = json.loads(content)
+    else:
+        entries = [line.strip() for line in content.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+    targets = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            targets.append((entry.get("org", default_org), entry["project"]))
+        elif "/" in entry:
+            entry_org, entry_project = entry.split("/", 1)
+            targets.append((entry_org, entry_project))
+        else:
+            targets.append((default_org, entry))
+    return targets
 
-        "aiproxy": f"{URL}/api/proxy/ai/{org}/{data}"
-    }
 
-    if method not in endpoints:
-        print(f"Method {method} is not supported.")
-        return
+async def run_batch(sara, method, targets, data, concurrency, out):
+    # run one method across all targets in this process - sharing the connection pool and signing cache
+    #   results are streamed as NDJSON lines as each target completes
+    semaphore = asyncio.Semaphore(concurrency)
 
-    test_url = endpoints["test"]
-    retry = 0
-    while True:
-        if method == "test":
-            break
-
-        def retryConnect():
-            nonlocal retry
-            if retry == 0:
-                print("Remote Server not responding... Retrying...")
-            retry += 1
-            # print a single dot s(without a newline) for every retry
-            print(".", end="", flush=True)
+    async def run_target(target_org, target_project):
+        async with semaphore:
+            start = time.perf_counter()
+            result = {"org": target_org, "project": target_project, "method": method}
             try:
-                time.sleep(1)
-            except KeyboardInterrupt:
-                print("Aborting...")
-                return False
-            return True
-
+                response = await sara.call(method, target_org, target_project, data)
+                result["status"] = response.status_code
+                result["response"] = decode_response(response)
+            except requests.exceptions.RequestException as e:
+                result["status"] = None
+                result["error"] = str(e)
+            result["latencyMs"] = round((time.perf_counter() - start) * 1000, 1)
+            return result
+
+    failures = 0
+    for completed in asyncio.as_completed([run_target(target_org, target_project) for target_org, target_project in targets]):
+        result = await completed
+        if result["status"] is None or result["status"] >= 400:
+            failures += 1
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+    return failures
+
+
+def delete_assistants_in_batches(base_url, email, org, confirm, concurrency=None, checkpoint_path=None):
+    # enumerate the assistants once, then check and delete them in parallel slices - resumable from the checkpoint
+    checkpoint = AssistantCheckpoint(checkpoint_path, confirm)
+    cleanup = AssistantCleanup(base_url, email, org, checkpoint,
+                               concurrency=concurrency if concurrency else DEFAULT_ASSISTANT_CONCURRENCY)
+    if checkpoint.reset_reason is not None:
+        print(f"Starting over - {checkpoint_path} was {checkpoint.reset_reason}")
+    elif checkpoint.candidates is not None:
+        print(f"Resuming from {checkpoint_path}: {len(checkpoint.pending())} of {len(checkpoint.candidates)} assistants left to check")
+
+    start = time.perf_counter()
+
+    def print_progress(counts, total):
+        checked = counts["deleted"] + counts["kept"] + counts["missing"]
+        elapsed = time.perf_counter() - start
+        print(f"{checked}/{total} checked - {counts['deleted']} {'deleted' if confirm else 'to delete'}, {counts['kept']} kept, "
+              f"{counts['missing']} already gone, {counts['failed']} failed - {elapsed:.1f} seconds", flush=True)
+
+    counts = cleanup.run(no_files=True, confirm=confirm, on_progress=print_progress)
+    print(f"{'Deleted' if confirm else 'Would delete'} {counts['deleted']} assistants in {time.perf_counter() - start:.1f} seconds"
+          f" ({counts['failed']} failed{f' - rerun to retry, progress is in {checkpoint_path}' if counts['failed'] and checkpoint_path else ''})")
+
+
+def print_timing(timing, out=sys.stderr):
+    # where a request's time went - the client's phases, then the service's own breakdown from its Server-Timing
+    #   header; the gap between the two is network and gateway time (API Gateway, Lambda cold starts)
+    if timing is None:
+        print("\nTiming: no request was sent", file=out)
+        return
+    phases = ", ".join(f"{phase} {seconds * 1000:.1f}" for phase, seconds in timing.phases.items() if seconds)
+    round_trip = sum(seconds for phase, seconds in timing.phases.items() if phase != "decode")
+    print(f"\nTiming ({timing.route} - {timing.status or timing.error}):", file=out)
+    print(f"    {'client':<16}{round_trip * 1000:10.1f} ms  ({phases})", file=out)
+
+    metrics = [metric for metric in timing.server_metrics if metric["name"] != "total"]
+    if timing.server is None and not metrics:
+        print(f"    {'service':<16}{'-':>10}     no Server-Timing header (an older service, or a proxy that drops it)", file=out)
+        return
+    if timing.server is not None:
+        print(f"    {'service':<16}{timing.server * 1000:10.1f} ms", file=out)
+    for metric in metrics:
+        milliseconds = f"{metric['milliseconds']:10.1f} ms" if metric["milliseconds"] is not None else f"{'-':>10}   "
+        print(f"      {metric['name']:<14}{milliseconds}  {metric['description'] or ''}", file=out)
+    if timing.server is not None:
+        print(f"    {'network/gateway':<16}{max(0.0, round_trip - timing.server) * 1000:10.1f} ms", file=out)
+
+
+def print_response(response, stream, output):
+    # a single method's response - streamed to the output file, or decoded and printed (or written)
+    if stream and response.status_code == 200:
+        print(f"Success({response.status_code})\n")
         try:
-            response = make_request("GET", test_url, None, None, (1, 2))
-            if response.status_code == 200:
-                break
-
-            if not retryConnect():
-                return
-        # control-c
-        except KeyboardInterrupt:
-            print("Aborting...")
-            return
-        # look for RemoteDisconnected to retry
-        # or NewConnectionError to retry
-        except requests.exceptions.ConnectionError as e:
-            if "NewConnectionError" in str(e) or "RemoteDisconnected" in str(e):
-                if not retryConnect():
-                    return
-
-                continue
-            else:
-                print(f"Failed: {e}")
-                return
+            stats = stream_to_file(response, output)
         except requests.exceptions.RequestException as e:
-            if type(e.args[0]).__name__ == "ReadTimeoutError":
-                if not retryConnect():
-                    return
-
-                continue
             print(f"Failed: {e}")
             return
-        except Exception as e:
-            print(f"Failed: {e}")
-            return
-    if retry > 0:
-        print("")
-
-    url = endpoints[method]
-    # if method starts with "create_" or is "discover", then it's a POST request
-    verb = "POST" if (
-        "create" in method or  # noqa: W504
-        method.endswith("_gen") or  # noqa: W504
-        method in [
-            "discover",
-            "rediscover",
-            "data_references_refresh",
-            "status_refresh",
-            "status_assistant",
-            "timer_interval",
-            "groom_discoveries",
-            "groom_toggle",
-            "groom",
-            "groom_force",
-            "groom_whatif"
-        ]
-    ) else "DELETE" if (
-        "delete" in method or  # noqa: W504
-        "purge" in method
-    ) else "PATCH" if (
-        "test_patch" in method
-    ) else "GET"
-    data = data if method not in ["rediscover"] else json.dumps({"resetResources": True})
-    data = data if method not in ["groom_toggle"] else json.dumps({"status": "Disabled"}) if data is None else json.dumps({"status": "Idle"})
-    data = data if method not in ["project_create"] else json.dumps({"resources": [{"uri": data}]})
-
-    if data is None:
-        print(f"Requesting {verb} {url}")
-    else:
-        print(f"Requesting {verb} {url} with data: {data}")
-
-    try:
-        response = make_request(verb, url, email, data)
-    except requests.exceptions.RequestException as e:
-        print(f"Failed: {e}")
+        finally:
+            response.close()
+        print(f"Downloaded {stats['bytesReceived'] / (1024 * 1024):.2f} MB in {stats['seconds']:.2f} seconds "
+              f"({stats['mbPerSecond']:.2f} MB/s) - wrote {stats['bytesWritten'] / (1024 * 1024):.2f} MB to {output}")
         return
 
     if (response.status_code != 200):
@@ -276,7 +190,10 @@ def main(email, org, project, method, stage, data, frontend=False, output=None):
         else:
             print(f"Failed ({response.status_code}):\n\t{response.text}")
     else:
-        print(f"Success({response.status_code})\n")
+        if getattr(response, "from_cache", False):
+            print(f"Success({response.status_code}) - not modified, using cached copy\n")
+        else:
+            print(f"Success({response.status_code})\n")
 
         if len(response.text) == 0:
             return
@@ -311,19 +228,150 @@ def main(email, org, project, method, stage, data, frontend=False, output=None):
             else:
                 print_json(responseObj)
 
-        if response.headers.get('content-type').startswith('application/json'):
-            responseObj = response.json() if 'body' not in response.json() else json.loads(response.json()['body']) if (len(response.json()['body']) > 0 and response.json()['body'][0] in ['{', '[']) else response.json()['body']
+        # parse the response once, unwrapping any Lambda function URL envelope
+        if response.headers.get('content-type', '').startswith('application/json'):
+            print_json_response(decode_response(response))
+        else:
+            print_text_response(decode_text(response), output)
+
+
+def main(email, org, project, method, stage, data, frontend=False, output=None, projects_file=None, concurrency=None,
+         parallel_warmup=False, no_probe_cache=False, no_cache=False, key_pattern=None, page_size=None,
+         export_format=None, batch=False, checkpoint=None, timing=False):
+    if frontend and (projects_file is not None or key_pattern is not None):
+        targets = load_targets(projects_file, org) if projects_file is not None else None
+        try:
+            if output is not None:
+                with open(output, "w") as out:
+                    fetch_redis_keys(stage, method, targets, key_pattern, out)
+            else:
+                fetch_redis_keys(stage, method, targets, key_pattern)
+            exit(0)
+        except Exception as e:
+            print(f"Error during Redis lookup: {e}")
+            sys.exit(1)
+
+    if frontend:
+        try:
+            redis_response = fetch_redis_key(stage, method, project, data)
+            print(f"Sara DB ({stage}) Lookup:{method}:   {data if data is not None else project}: {redis_response}")
+            exit(0)
+        except Exception as e:
+            print(f"Error during Redis lookup: {e}")
+            sys.exit(1)
+
+    if method in ["create_auth_token"]:
+        expires = True if data is True else False
+        auth_token = get_signed_headers(email, expires, True)
+        print(f"Auth Token:\n{json.dumps(auth_token, indent=4)}")
+
+        exit(0)
+
+    cache = ResponseCache(enabled=False) if no_cache else None
+    sara = SaraClient(stage, email, concurrency=concurrency, cache=cache) if concurrency else SaraClient(stage, email, cache=cache)
+
+    if method not in methods:
+        print(f"Method {method} is not supported.")
+        return
+
+    test_url = sara.endpoint("test")
+    retried = False
+
+    def on_retry(attempt, delay):
+        nonlocal retried
+        if not retried:
+            print("Remote Server not responding... Retrying...")
+            retried = True
+        # print a single dot s(without a newline) for every retry
+        print(".", end="", flush=True)
 
-            print_json_response(responseObj)
+    if method != "test":
+        try:
+            if parallel_warmup:
+                # warm the Lambda while we fetch the signing key and sign our identity
+                probe = BackgroundProbe(test_url, stage, on_retry, use_cache=not no_probe_cache)
+                if email is not None:
+                    get_signed_headers(email)
+                probe.wait()
+            else:
+                wait_until_ready(test_url, stage, on_retry, use_cache=not no_probe_cache)
+        # control-c
+        except KeyboardInterrupt:
+            print("Aborting...")
+            return
+        except Exception as e:
+            print(f"Failed: {e}")
+            return
+    if retried:
+        print("")
+
+    if method == "delete_assistants" and batch:
+        try:
+            delete_assistants_in_batches(sara.base_url, email, org, data == "confirm", concurrency, checkpoint)
+        except KeyboardInterrupt:
+            print(f"Aborting...{f' progress is in {checkpoint}' if checkpoint else ''}")
+        return
+
+    if projects_file is not None:
+        targets = load_targets(projects_file, org)
+        print(f"Running {method} on {len(targets)} projects with concurrency {sara.concurrency}", file=sys.stderr)
+        batch_start = time.perf_counter()
+        if output is not None:
+            with open(output, "w") as out:
+                failures = asyncio.run(run_batch(sara, method, targets, data, sara.concurrency, out))
         else:
-            # check if response.text starts with a JSON character
-            if response.text[0] in ['{', '[']:
-                if 'body' not in response.json():
-                    print_text_response(response, output)
-                else:
-                    print_text_response(response.json()['body'])
+            failures = asyncio.run(run_batch(sara, method, targets, data, sara.concurrency, sys.stdout))
+        print(f"Completed {len(targets)} projects ({failures} failed) in {time.perf_counter() - batch_start:.2f} seconds", file=sys.stderr)
+        return
+
+    url = sara.endpoint(method, org, project, data)
+    verb = verb_for_method(method)
+    payload = payload_for_method(method, data)
+
+    # keep stdout clean for exported data
+    log = sys.stderr if method in paged_methods and (page_size is not None or export_format is not None) else sys.stdout
+    if payload is None:
+        print(f"Requesting {verb} {url}", file=log)
+    else:
+        print(f"Requesting {verb} {url} with data: {payload}", file=log)
+
+    if method in paged_methods and (page_size is not None or export_format is not None):
+        # items are written as they arrive - either page by page, or parsed incrementally from one streamed
+        #   response - so memory stays bounded however many projects match
+        try:
+            if page_size is not None:
+                items = sara.iter_search(url, page_size)
             else:
-                print_text_response(response.text, output)
+                response = asyncio.run(sara.call(method, org, project, data, stream=True))
+                if response.status_code != 200:
+                    print(f"Failed ({response.status_code}):\n\t{response.text}")
+                    return
+                items = iter_response_items(response)
+            count = export_items(items, export_format if export_format is not None else "ndjson", output)
+        except Exception as e:
+            print(f"Failed: {e}", file=sys.stderr)
+            return
+        print(f"{count} items", file=sys.stderr)
+        return
+
+    stream = output is not None and method in streaming_methods
+
+    # only the method's own request is timed - the readiness probe above has already run
+    timings = []
+    if timing:
+        sara.http.instrument(timings.append)
+
+    # printed once the response has been downloaded and decoded, so the decode phase is included
+    try:
+        try:
+            response = asyncio.run(sara.call(method, org, project, data, stream=stream))
+        except requests.exceptions.RequestException as e:
+            print(f"Failed: {e}")
+            return
+        print_response(response, stream, output)
+    finally:
+        if timing:
+            print_timing(timings[-1] if timings else None)
 
 
 if __name__ == "__main__":
@@ -389,6 +437,7 @@ if __name__ == "__main__":
                                  'delete_assistants',
 
                                  'github_access',
+                                 'github_fullsource',
 
                                  'timer_interval',
                                  'groom_discoveries_list',
@@ -399,10 +448,21 @@ if __name__ == "__main__":
     parser.add_argument("--stage", default="local", choices=['local', 'dev', 'test', 'prod'], help="The Service to target (default: local)")
     parser.add_argument("--data", default=None, help="Data to pass to the method")
     parser.add_argument("--frontend", action='store_true', help="Lookup with Sara frontend")
+    parser.add_argument("--projects-file", required=False, help="Run the method across many projects - file of org/project lines or a JSON list; results are written as NDJSON")
+    parser.add_argument("--concurrency", type=int, default=None, help="Maximum concurrent requests in --projects-file mode (default: 16)")
+    parser.add_argument("--parallel-warmup", action='store_true', help="Probe (and warm) the service in parallel with fetching the signing key")
+    parser.add_argument("--no-probe-cache", action='store_true', help="Always probe the service, even if it responded within the last SARA_PROBE_CACHE_TTL seconds")
+    parser.add_argument("--no-cache", action='store_true', help="Always download status and resources, instead of revalidating a locally cached copy")
+    parser.add_argument("--page-size", type=int, default=None, help="Page through search methods (status_all*, projects_all, search_generators*) this many results at a time, printing NDJSON as pages arrive")
+    parser.add_argument("--format", choices=export_formats, default=None, help="Export search methods as NDJSON, CSV or Parquet (requires --output and pyarrow) - items are streamed, not buffered")
+    parser.add_argument("--batch", action='store_true', help="With delete_assistants, check and delete assistants in parallel slices (--concurrency) with progress, instead of one long request")
+    parser.add_argument("--checkpoint", required=False, help="With --batch, record progress here - a rerun resumes from it and retries failures")
+    parser.add_argument("--key-pattern", required=False, help="With --frontend, look up every key matching a redis pattern (e.g. 'project:*')")
+    parser.add_argument("--timing", action='store_true', help="Show where the request's time went - client phases and the service's Server-Timing breakdown (on stderr); single requests only")
 
     args = parser.parse_args()
 
-    if (args.project is None and args.method not in [
+    if (args.project is None and args.projects_file is None and args.key_pattern is None and args.method not in [
         "test",
         "test_patch",
         "version",
@@ -419,6 +479,7 @@ if __name__ == "__main__":
         "assistant",
 
         "github_access",
+        "github_fullsource",
 
         "projects",
         "projects_all",
@@ -458,4 +519,10 @@ if __name__ == "__main__":
         else:
             args.org = "localhost"  # default org to make connector calls, even though it will be ignored
 
-    main(args.email, args.org, args.project, args.method, args.stage, args.data, args.frontend, args.output)
+    # --timing breaks down a single request - batches, paged searches and exports make many
+    if args.timing and (args.projects_file is not None or args.batch or args.page_size is not None or args.format is not None):
+        parser.error("--timing times a single request - it can't be combined with --projects-file, --batch, --page-size or --format")
+
+    main(args.email, args.org, args.project, args.method, args.stage, args.data, args.frontend, args.output,
+         args.projects_file, args.concurrency, args.parallel_warmup, args.no_probe_cache, args.no_cache,
+         args.key_pattern, args.page_size, args.format, args.batch, args.checkpoint, args.timing)
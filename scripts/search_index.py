@@ -0,0 +1,169 @@
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# must match src/storage.ts - records whose dataPath ends in one of these types carry the search index keys
+SEARCHABLE_ANALYSIS_TYPES = ['project', 'status', 'generator', 'groom', 'data_references']
+
+SEARCH_TYPE_INDEX_NAME = 'searchType-projectPath-index'
+SEARCH_OWNER_TYPE_INDEX_NAME = 'searchOwnerType-projectPath-index'
+
+DEFAULT_SCAN_SEGMENTS = 8
+
+
+def analysis_table_name(stage):
+    return os.environ.get("DYNAMO_DB_ANALYSIS", f"Boost.AnalysisDataStore.{stage}")
+
+
+def search_index_attributes(project_path, data_path):
+    # the index keys for a record - empty for records that aren't searchable (e.g. resources and their parts)
+    search_type = data_path[data_path.rfind('/') + 1:]
+    if search_type not in SEARCHABLE_ANALYSIS_TYPES:
+        return {}
+    # projectPath is {user}/{sourceType}/{owner}/{project}
+    owner = project_path.split('/')[2] if project_path.count('/') >= 3 else ''
+    return {
+        "searchType": search_type,
+        "searchOwnerType": f"{owner}#{search_type}",
+    }
+
+
+def search_index_definitions():
+    # attribute definitions and GSIs for the analysis table - both indexes are sorted by projectPath, so a
+    #   user's records are a key prefix (begins_with) rather than a filter
+    attribute_definitions = [
+        {"AttributeName": "projectPath", "AttributeType": "S"},
+        {"AttributeName": "searchType", "AttributeType": "S"},
+        {"AttributeName": "searchOwnerType", "AttributeType": "S"},
+    ]
+    indexes = [
+        {
+            "IndexName": SEARCH_TYPE_INDEX_NAME,
+            "KeySchema": [
+                {"AttributeName": "searchType", "KeyType": "HASH"},
+                {"AttributeName": "projectPath", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        },
+        {
+            "IndexName": SEARCH_OWNER_TYPE_INDEX_NAME,
+            "KeySchema": [
+                {"AttributeName": "searchOwnerType", "KeyType": "HASH"},
+                {"AttributeName": "projectPath", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        },
+    ]
+    return attribute_definitions, indexes
+
+
+def create_search_indexes(dynamodb, table_name, wait=True):
+    # add any missing search GSIs to an existing table - DynamoDB only allows one index creation per update
+    description = dynamodb.describe_table(TableName=table_name)["Table"]
+    existing = {index["IndexName"] for index in description.get("GlobalSecondaryIndexes", [])}
+    provisioned = description.get("BillingModeSummary", {}).get("BillingMode", "PROVISIONED") == "PROVISIONED"
+
+    attribute_definitions, indexes = search_index_definitions()
+    for index in indexes:
+        if index["IndexName"] in existing:
+            print(f"Index {index['IndexName']} already exists")
+            continue
+
+        create = dict(index)
+        if provisioned:
+            throughput = description["ProvisionedThroughput"]
+            create["ProvisionedThroughput"] = {
+                "ReadCapacityUnits": throughput["ReadCapacityUnits"],
+                "WriteCapacityUnits": throughput["WriteCapacityUnits"],
+            }
+        print(f"Creating index {index['IndexName']} on {table_name}")
+        dynamodb.update_table(TableName=table_name, AttributeDefinitions=attribute_definitions,
+                              GlobalSecondaryIndexUpdates=[{"Create": create}])
+        if wait:
+            wait_for_index(dynamodb, table_name, index["IndexName"])
+
+
+def wait_for_index(dynamodb, table_name, index_name, poll_seconds=10):
+    while True:
+        description = dynamodb.describe_table(TableName=table_name)["Table"]
+        status = next((index.get("IndexStatus") for index in description.get("GlobalSecondaryIndexes", [])
+                       if index["IndexName"] == index_name), None)
+        if status in [None, "ACTIVE"]:
+            return
+        print(f"Index {index_name} is {status}...")
+        time.sleep(poll_seconds)
+
+
+def backfill_search_attributes(dynamodb, table_name, segments=DEFAULT_SCAN_SEGMENTS, dry_run=False):
+    # add the index keys to existing searchable records - a parallel scan, only reading the key attributes
+    #   returns (records scanned, records updated)
+    def backfill_segment(segment):
+        scanned = 0
+        updated = 0
+        kwargs = {
+            "TableName": table_name,
+            "Segment": segment,
+            "TotalSegments": segments,
+            "ProjectionExpression": "projectPath, dataPath, searchType",
+        }
+        while True:
+            response = dynamodb.scan(**kwargs)
+            for item in response.get("Items", []):
+                scanned += 1
+                if "searchType" in item:
+                    continue
+                attributes = search_index_attributes(item["projectPath"]["S"], item["dataPath"]["S"])
+                if not attributes:
+                    continue
+                updated += 1
+                if dry_run:
+                    continue
+                dynamodb.update_item(
+                    TableName=table_name,
+                    Key={"projectPath": item["projectPath"], "dataPath": item["dataPath"]},
+                    UpdateExpression="SET searchType = :searchType, searchOwnerType = :searchOwnerType",
+                    # don't resurrect a record deleted since the scan read it
+                    ConditionExpression="attribute_exists(projectPath)",
+                    ExpressionAttributeValues={
+                        ":searchType": {"S": attributes["searchType"]},
+                        ":searchOwnerType": {"S": attributes["searchOwnerType"]},
+                    })
+            if "LastEvaluatedKey" not in response:
+                return scanned, updated
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        results = list(executor.map(backfill_segment, range(segments)))
+    return sum(scanned for scanned, _ in results), sum(updated for _, updated in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create and backfill the analysis table search indexes.")
+    parser.add_argument("--stage", default="dev", choices=['dev', 'test', 'prod'], help="The stage whose table to update (default: dev)")
+    parser.add_argument("--table", required=False, help="Table name (default: Boost.AnalysisDataStore.<stage>)")
+    parser.add_argument("--endpoint-url", required=False, help="DynamoDB endpoint, e.g. http://localhost:8000 for DynamoDB Local")
+    parser.add_argument("--create", action='store_true', help="Create any missing search indexes")
+    parser.add_argument("--backfill", action='store_true', help="Add the index keys to existing searchable records")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SCAN_SEGMENTS, help="Parallel scan segments for --backfill (default: 8)")
+    parser.add_argument("--dry-run", action='store_true', help="Report what --backfill would update without writing")
+    args = parser.parse_args()
+
+    if not args.create and not args.backfill:
+        parser.error("Nothing to do - pass --create and/or --backfill")
+
+    import boto3
+
+    dynamodb = boto3.client("dynamodb", region_name="us-west-2", endpoint_url=args.endpoint_url)
+    table_name = args.table if args.table else analysis_table_name(args.stage)
+
+    if args.create:
+        create_search_indexes(dynamodb, table_name)
+    if args.backfill:
+        start = time.perf_counter()
+        scanned, updated = backfill_search_attributes(dynamodb, table_name, args.segments, args.dry_run)
+        print(f"{'Would update' if args.dry_run else 'Updated'} {updated} of {scanned} records in {time.perf_counter() - start:.1f} seconds")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import { Request, Response } from 'express';
 import * as jwt from 'jsonwebtoken';
 import { getSingleSecret } from './secrets';
 import { HTTP_FAILURE_UNAUTHORIZED, logRequest } from './utility/dispatch';
+import { ServerTimingMetric, timed } from './utility/timing';
 
 export const header_X_Signed_Identity = 'X-Signed-Identity';
 export const header_X_Signing_Algorithm = 'X-Signing-Algorithm';
@@ -19,6 +20,10 @@ export enum AuthType {
 }
 
 export async function validateUser(req: Request, res: Response, accessType: AuthType = AuthType.User, throwIfNotAuthorized : boolean = false): Promise<string | undefined> {
+    return timed(ServerTimingMetric.Auth, () => authenticateUser(req, res, accessType, throwIfNotAuthorized));
+}
+
+async function authenticateUser(req: Request, res: Response, accessType: AuthType, throwIfNotAuthorized : boolean): Promise<string | undefined> {
     let email = '';
 
     // if the identity of the caller is signed, we need to verify AuthN
@@ -6,6 +6,7 @@ import { signedAuthHeader } from '../auth';
 import { Stages } from '../types/GeneratorState';
 import { AIResponse }  from '../boost-python-api/AIResponse';
 import { AIFunctionResponse } from '../boost-python-api/AIFunctionResponse';
+import { ServerTimingMetric, timed } from '../utility/timing';
 import path from 'path';
 
 enum BlueprintStage {
@@ -316,11 +317,12 @@ readonly defaultBlueprint =
             filelist: fileList,
             projectName: this.projectData.name
         };
-        const response = await fetch(this.serviceEndpoint + `/api/proxy/ai/${this.projectData.org}/${Services.DraftBlueprint}`, {
+        const authHeader = await signedAuthHeader(this.email);
+        const response = await timed(ServerTimingMetric.SelfDispatch, () => fetch(this.serviceEndpoint + `/api/proxy/ai/${this.projectData.org}/${Services.DraftBlueprint}`, {
             method: 'POST',
-            headers: await signedAuthHeader(this.email),
+            headers: authHeader,
             body: JSON.stringify(draftInput)
-        });
+        }));
         if (!response.ok) {
             throw new Error(`Unable to draft blueprint: ${response.status}`);
         }
@@ -338,11 +340,12 @@ readonly defaultBlueprint =
     }
 
     async createSampledCodeBlueprint(inputData: QuickBlueprintInput) : Promise<string> {
-        const response = await fetch(this.serviceEndpoint + `/api/proxy/ai/${this.projectData.org}/${Services.QuickBlueprint}`, {
+        const authHeader = await signedAuthHeader(this.email);
+        const response = await timed(ServerTimingMetric.SelfDispatch, () => fetch(this.serviceEndpoint + `/api/proxy/ai/${this.projectData.org}/${Services.QuickBlueprint}`, {
             method: 'POST',
-            headers: await signedAuthHeader(this.email),
+            headers: authHeader,
             body: JSON.stringify(inputData)
-        });
+        }));
         if (!response.ok) {
             throw new Error(`Unable to build blueprint from project samples: ${response.status}`);
         }
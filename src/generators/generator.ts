@@ -7,6 +7,7 @@ import { FileContent, RepoDetails } from "../github";
 import { Stages } from "../types/GeneratorState";
 import { localSelfDispatch, HTTP_FAILURE_NOT_FOUND, HTTP_LOCKED, secondsBeforeRestRequestMaximumTimeout, secondsBeforeRestRequestShortTimeout, HTTP_CONFLICT } from "../utility/dispatch";
 import axios, { Axios } from "axios";
+import { ServerTimingMetric, timed } from "../utility/timing";
 
 const ignore = require('ignore');
 
@@ -116,13 +117,13 @@ export class Generator {
 
         const authHeader = await signedAuthHeader(this.email);
 
-        const response = await fetch(this.resourceUri, {
+        const response = await timed(ServerTimingMetric.SelfDispatch, () => fetch(this.resourceUri, {
             method: 'GET',
             headers: {
                 'Content-Type': 'text/plain',
                 ...authHeader
             }
-        });
+        }));
 
         // if we got HTTP_FAILURE_NOT_FOUND Not Found, that's OK - we'll just start with an empty string
         if (response.status === HTTP_FAILURE_NOT_FOUND) {
@@ -227,14 +228,14 @@ export class Generator {
         }
 
         const authHeader = await signedAuthHeader(this.email);
-        const response = await fetch(this.resourceUri, {
+        const response = await timed(ServerTimingMetric.SelfDispatch, () => fetch(this.resourceUri, {
             method: 'PUT',
             headers: {
                 'Content-Type': 'text/plain',
                 ...authHeader
             },
             body: this.data
-        });
+        }));
 
         if (!response.ok) {
             const errorText = await response.text() || 'Unknown Error';
@@ -269,14 +270,14 @@ export class Generator {
         console.info(`${this.email} ${this.projectData.org}:${this.projectData.name}:${this.dataType} Progress Update on Stage ${this.currentStage}: ${JSON.stringify(state)}`);
 
         const authHeader = await signedAuthHeader(this.email);
-        const response = await fetch(this.resourceUri + `/generator`, {
+        const response = await timed(ServerTimingMetric.SelfDispatch, () => fetch(this.resourceUri + `/generator`, {
             method: 'PATCH',
             headers: {
                 'Content-Type': 'application/json',
                 ...authHeader
             },
             body: JSON.stringify(state)
-        });
+        }));
         if (!response.ok) {
             if (response.status === HTTP_FAILURE_NOT_FOUND) {
                 if (process.env.TRACE_LEVEL) {
@@ -321,12 +322,12 @@ export class Generator {
         const encodedFilename = encodeURIComponent(filename);
         const encodedRepo = encodeURIComponent(this.projectData.resources[0].uri);
         const getFileEndpoint = `${this.serviceEndpoint}/api/user/${this.projectData.org}/connectors/github/file?repo=${encodedRepo}&path=${encodedFilename}`;
-        const response = await fetch(getFileEndpoint, {
+        const response = await timed(ServerTimingMetric.SelfDispatch, () => fetch(getFileEndpoint, {
             method: 'GET',
             headers: {
                 ...authHeader
             }
-        });
+        }));
 
         // if we can't load the project file, just return an empty string - caller can decide if that's a fatal issue
         if (!response.ok) {
@@ -361,10 +362,11 @@ export class Generator {
     async getFilenameList() : Promise<string[]> {
         const encodedUri = encodeURIComponent(this.projectData.resources[0].uri);
         const getFilesEndpoint = this.serviceEndpoint + `/api/user/${this.projectData.org}/connectors/github/files?uri=${encodedUri}`;
-        const response = await fetch(getFilesEndpoint, {
+        const authHeader = await signedAuthHeader(this.email);
+        const response = await timed(ServerTimingMetric.SelfDispatch, () => fetch(getFilesEndpoint, {
             method: 'GET',
-            headers: await signedAuthHeader(this.email)
-        });
+            headers: authHeader
+        }));
         if (response.ok) {
 
             const objectResponseRaw = await response.json();
@@ -425,10 +427,11 @@ export class Generator {
     }
 
     async getBoostIgnoreFileSpecs() : Promise<string[]> {
-        const response = await fetch(this.serviceEndpoint + `/api/user_project/${this.projectData.org}/${this.projectData.name}/config/.boostignore`, {
+        const authHeader = await signedAuthHeader(this.email);
+        const response = await timed(ServerTimingMetric.SelfDispatch, () => fetch(this.serviceEndpoint + `/api/user_project/${this.projectData.org}/${this.projectData.name}/config/.boostignore`, {
             method: 'GET',
-            headers: await signedAuthHeader(this.email)
-        });
+            headers: authHeader
+        }));
         if (response.ok) {
 
             const objectResponseRaw = await response.json();
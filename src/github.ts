@@ -17,9 +17,16 @@ import {
     secondsBeforeRestRequestMaximumTimeout,
 } from './utility/dispatch';
 import zlib from 'zlib';
+import { ServerTimingMetric, timed } from './utility/timing';
 
 const BoostGitHubAppId = "472802";
 
+// every GitHub API call made through the client counts towards the request's GitHub Server-Timing
+const timeGitHubRequests = <T extends { hook: { wrap: (...args: any[]) => any } }>(octokit: T) : T => {
+    octokit.hook.wrap('request', (request: any, options: any) => timed(ServerTimingMetric.GitHub, () => request(options)));
+    return octokit;
+}
+
 export async function getFileFromRepo(email: string, fullFileUri: URL, repoUri: URL, pathUri: string, req: Request, res: Response, allowPrivateAccess: boolean): Promise<any> {
     let owner: string;
     let repo: string;
@@ -63,7 +70,7 @@ export async function getFileFromRepo(email: string, fullFileUri: URL, repoUri:
 
     // try to get the file from GitHub via public path without authentication
     try {
-        const octokit = new Octokit();
+        const octokit = timeGitHubRequests(new Octokit());
         const fileContent = await getFileContent(octokit);
 
         console.log(`[GitHub:getFileFromRepo] ${email} Success Retrieving File ${filePathWithoutBranch} from Public Repo ${repo}`)
@@ -126,14 +133,14 @@ export async function getFileFromRepo(email: string, fullFileUri: URL, repoUri:
         const secretKeyPrivateKey = secretStore + '/' + 'private-key';
         const privateKey = await getSingleSecret(secretKeyPrivateKey);
 
-        const octokit = new Octokit({
+        const octokit = timeGitHubRequests(new Octokit({
             authStrategy: createAppAuth,
             auth: {
                 appId: BoostGitHubAppId,
                 privateKey: privateKey,
                 installationId: installationId,
             }
-        });
+        }));
 
         const fileContent = await getFileContent(octokit);
 
@@ -187,7 +194,7 @@ export async function getFolderPathsFromRepo(email: string, uri: URL, req: Reque
     
     // Try to get the folders from GitHub via public path without authentication
     try {
-        const octokit = new Octokit();
+        const octokit = timeGitHubRequests(new Octokit());
         const folderPaths = await getFolderPaths(octokit, owner, repo);
 
         return res
@@ -243,14 +250,14 @@ export async function getFolderPathsFromRepo(email: string, uri: URL, req: Reque
         const privateKey = await getSingleSecret(secretKeyPrivateKey);
 
         // Configure the auth strategy for Octokit
-        const octokit = new Octokit({
+        const octokit = timeGitHubRequests(new Octokit({
             authStrategy: createAppAuth,
             auth: {
                 appId: BoostGitHubAppId,
                 privateKey: privateKey,
                 installationId: installationId,
             }
-        });
+        }));
 
         const folderPaths = await getFolderPaths(octokit, owner, repo);
 
@@ -293,7 +300,7 @@ export async function getFilePathsFromRepo(email: string, uri: URL, req: Request
 
     // Try to get the files from GitHub via public path without authentication
     try {
-        const octokit = new Octokit();
+        const octokit = timeGitHubRequests(new Octokit());
         const filePaths : string[] = await getFilePathsGitTree(octokit, owner, repo);
 
         console.log(`[GitHub:getFilePathsFromRepo] ${email} ${uri.toString()} Success Retrieving ${filePaths.length} file paths from Public Repo ${repo}`)
@@ -350,14 +357,14 @@ export async function getFilePathsFromRepo(email: string, uri: URL, req: Request
         const privateKey = await getSingleSecret(secretKeyPrivateKey);
 
         // Configure the auth strategy for Octokit
-        const octokit = new Octokit({
+        const octokit = timeGitHubRequests(new Octokit({
             authStrategy: createAppAuth,
             auth: {
                 appId: BoostGitHubAppId,
                 privateKey: privateKey,
                 installationId: installationId,
             }
-        });
+        }));
 
         const filePaths : string[] = await getFilePathsGitTree(octokit, owner, repo);
 
@@ -394,7 +401,7 @@ export async function getDetailsFromRepo(email: string, uri: URL, req: Request,
         return { errorResponse: handleErrorResponse(email, new Error(`Invalid GitHub.com resource URI: ${uri.toString()}`), req, res, undefined, HTTP_FAILURE_BAD_REQUEST_INPUT)};
     }
 
-    const octokit = new Octokit();
+    const octokit = timeGitHubRequests(new Octokit());
     try {
         // Fetch repository details to get the default branch
         const startTimestamp = Date.now();
@@ -494,7 +501,7 @@ export async function getDetailsFromRepo(email: string, uri: URL, req: Request,
                 appId: BoostGitHubAppId,
                 privateKey: privateKey,
             });
-            const octokit = await app.getInstallationOctokit(Number(installationId));            
+            const octokit = timeGitHubRequests(await app.getInstallationOctokit(Number(installationId)));            
 
             const startTimestamp = Date.now();
             const repoDetailsRaw = await octokit.rest.repos.get({
@@ -568,7 +575,7 @@ export async function verifyUserAccessToPrivateRepo(email: string, uri: URL) : P
         appId: BoostGitHubAppId,
         privateKey: privateKey,
     });
-    const octokit = await app.getInstallationOctokit(Number(installationId));
+    const octokit = timeGitHubRequests(await app.getInstallationOctokit(Number(installationId)));
 
     // check if the user can see the repos (if we are using a user's connection to github)
     if (installationId === user.installationId) {
@@ -648,7 +655,7 @@ export async function getFullSourceFromRepo(email: string, uri: URL, req: Reques
     
         let zip = undefined;
         try {
-            const response = await axios.get(url, getConfig);
+            const response = await timed(ServerTimingMetric.GitHub, () => axios.get(url, getConfig));
             zip = new AdmZip(response.data);
         } catch (error) {
             if (axios.isCancel(error)) {
@@ -715,7 +722,7 @@ export async function getFullSourceFromRepo(email: string, uri: URL, req: Reques
         return buffer.includes(0x00);  // Checks for null byte
     }    
     
-    const octokit = new Octokit();
+    const octokit = timeGitHubRequests(new Octokit());
     try {
         // Fetch repository details to get the default branch
         const repoDetails = await octokit.rest.repos.get({
@@ -784,7 +791,7 @@ export async function getFullSourceFromRepo(email: string, uri: URL, req: Reques
                 appId: BoostGitHubAppId,
                 privateKey: privateKey,
             });
-            const octokit = await app.getInstallationOctokit(Number(installationId));
+            const octokit = timeGitHubRequests(await app.getInstallationOctokit(Number(installationId)));
             // Fetch repository details to get the default branch
             const repoDetails = await octokit.rest.repos.get({
                 owner: owner,
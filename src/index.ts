@@ -8,6 +8,8 @@ import serverless from 'serverless-http';
 import {
     getProjectData,
     searchProjectData,
+    searchProjectDataPage,
+    InvalidSearchCursorError,
     storeProjectData,
     SourceType,
     convertToSourceType,
@@ -35,11 +37,14 @@ import {
     OpenAIFile,
     deleteAssistantFile,
     searchOpenAIFiles,
+    searchOpenAIFilesPage,
+    OpenAIRateLimitError,
     uploadProjectDataForAIAssistant,
     deleteOpenAIFiles,
     searchOpenAIAssistants,
     OpenAIAssistant,
     deleteOpenAIAssistant,
+    isAssistantMatch,
     getOpenAIFile,
     getOpenAIAssistant
 } from './openai';
@@ -86,20 +91,27 @@ import {
     HTTP_SUCCESS_NO_CONTENT,
     HTTP_LOCKED,
     HTTP_FAILURE_SERVICE_UNAVAILABLE,
+    HTTP_NOT_MODIFIED,
     millisecondsBeforeRestRequestMicroTimeout,
 } from './utility/dispatch';
+import { contentETag, isNotModified, setConditionalHeaders } from './utility/conditional';
+import { getLongPollRequest, waitForState } from './utility/longpoll';
 
 import { usFormatter } from './utility/log';
 import { getCurrentVersion, isCurrentMinorVersion } from './utility/version';
 import { DiscoverState } from './types/DiscoverState';
 import { ProjectGoals } from './types/ProjectGoals';
 import { sendWelcomeEmail } from './serviceEmails';
+import { serverTiming } from './utility/timing';
 
 export const app = express();
 
 export const mbLimitForJSON = 10
 export const mbLimitForText = 10
 
+// Server-Timing breakdown (auth, storage, GitHub, OpenAI, self-dispatch) on every response
+app.use(serverTiming);
+
 app.use(express.json({ limit: `${mbLimitForJSON}mb` }));
 app.use(express.text({ limit: `${mbLimitForText}mb` }));
 
@@ -1088,7 +1100,13 @@ app.get(`${api_root_endpoint}/${search_projects}`, async (req: Request, res: Res
             return handleErrorResponse(email, new Error("User must be a string"), req, res, "Invalid user", HTTP_FAILURE_BAD_REQUEST_INPUT);
         }
 
-        const projectDataList : UserProjectData[] = await searchProjectData<UserProjectData>(user?user as string:searchWildcard, SourceType.General, org?org as string:searchWildcard, project?project as string:searchWildcard, "", 'project');
+        const paging = getSearchPaging(req);
+        if (paging instanceof Error) {
+            return handleErrorResponse(email, paging, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
+
+        const searchResults = await searchProjectDataPage<UserProjectData>(user?user as string:searchWildcard, SourceType.General, org?org as string:searchWildcard, project?project as string:searchWildcard, "", 'project', paging?.limit, paging?.cursor);
+        const projectDataList : UserProjectData[] = searchResults.items;
 
         if (process.env.TRACE_LEVEL) {
             console.log(`${email} ${req.method} ${req.originalUrl} : retrieved data for ${projectDataList.length} raw project data`);
@@ -1126,12 +1144,12 @@ app.get(`${api_root_endpoint}/${search_projects}`, async (req: Request, res: Res
             console.log(`${email} ${req.method} ${req.originalUrl}  retrieved data for ${projectDataList.length} projects`);
         }
 
-        return res
-            .status(HTTP_SUCCESS)
-            .contentType('application/json')
-            .send(projectDataList);
+        return sendSearchResults(res, projectDataList, paging, searchResults.cursor);
 
     } catch (error) {
+        if (error instanceof InvalidSearchCursorError) {
+            return handleErrorResponse(email, error, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
         return handleErrorResponse(email, error, req, res);
     }
 });
@@ -1177,11 +1195,18 @@ app.get(`${api_root_endpoint}/${search_projects_groom}`, async (req: Request, re
             return res.status(HTTP_FAILURE_BAD_REQUEST_INPUT).send('Invalid status');
         }
 
-        const groomingDataList : ProjectGroomState[] =
-            await searchProjectData<ProjectGroomState>(
+        const paging = getSearchPaging(req);
+        if (paging instanceof Error) {
+            return handleErrorResponse(email, paging, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
+
+        const searchResults =
+            await searchProjectDataPage<ProjectGroomState>(
             user?user as string:searchWildcard, SourceType.General,
             org?org as string:searchWildcard,
-            project?project as string:searchWildcard, "", 'groom');
+            project?project as string:searchWildcard, "", 'groom',
+            paging?.limit, paging?.cursor);
+        const groomingDataList : ProjectGroomState[] = searchResults.items;
 
         cleanupProjectDataSearchResults(groomingDataList);
 
@@ -1195,16 +1220,50 @@ app.get(`${api_root_endpoint}/${search_projects_groom}`, async (req: Request, re
         const listOfProjectNames : string = groomingDataListFilteredByStatus.map((groomData) => `${(groomData as any).owner} org=${(groomData as any).org} project=${(groomData as any).project}`).join('\n');
         console.info(`${email} ${req.method} ${req.originalUrl}  retrieved ${groomingDataListFilteredByStatus.length} Projects to Groom with status:${status?status:'all'}: ${listOfProjectNames}`);
 
-        return res
-            .status(HTTP_SUCCESS)
-            .contentType('application/json')
-            .send(groomingDataListFilteredByStatus);
+        return sendSearchResults(res, groomingDataListFilteredByStatus, paging, searchResults.cursor);
 
     } catch (error) {
+        if (error instanceof InvalidSearchCursorError) {
+            return handleErrorResponse(email, error, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
         return handleErrorResponse(email, error, req, res);
     }
 });
 
+interface SearchPaging {
+    limit: number;
+    cursor?: string;
+}
+
+const defaultSearchPageSize = 100;
+const maximumSearchPageSize = 1000;
+
+// optional paging of search results - ?limit=N (and ?cursor= from the previous page) returns one page
+//      as {items, cursor} instead of the complete list; the last page has no cursor
+function getSearchPaging(req: Request) : SearchPaging | Error | undefined {
+    const { limit, cursor } = req.query;
+    if (limit === undefined && cursor === undefined) {
+        return undefined;
+    }
+    if (limit !== undefined && (typeof limit !== 'string' || !/^[1-9][0-9]*$/.test(limit))) {
+        return new Error("Limit must be a positive integer");
+    }
+    if (cursor !== undefined && typeof cursor !== 'string') {
+        return new Error("Cursor must be a string");
+    }
+    return {
+        limit: limit ? Math.min(parseInt(limit as string), maximumSearchPageSize) : defaultSearchPageSize,
+        cursor: cursor ? cursor as string : undefined,
+    };
+}
+
+function sendSearchResults(res: Response, items: any[], paging: SearchPaging | undefined, cursor: string | undefined) : Response {
+    return res
+        .status(HTTP_SUCCESS)
+        .contentType('application/json')
+        .send(paging ? { items, cursor } : items);
+}
+
 function cleanupProjectDataSearchResults(projectSearchData: any[]) {
     // we need to remove the _userName, _ownerName, and _projectName from the data, and replace them
     //   with the owner, org, and project values
@@ -1252,11 +1311,18 @@ app.get(`${api_root_endpoint}/${search_projects_status}`, async (req: Request, r
             return res.status(HTTP_FAILURE_BAD_REQUEST_INPUT).send('Invalid synchronized');
         }
 
-        const statusDataList : ProjectStatusState[] =
-            await searchProjectData<ProjectStatusState>(
+        const paging = getSearchPaging(req);
+        if (paging instanceof Error) {
+            return handleErrorResponse(email, paging, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
+
+        const searchResults =
+            await searchProjectDataPage<ProjectStatusState>(
             user?user as string:searchWildcard, SourceType.General,
             org?org as string:searchWildcard,
-            project?project as string:searchWildcard, "", 'status');
+            project?project as string:searchWildcard, "", 'status',
+            paging?.limit, paging?.cursor);
+        const statusDataList : ProjectStatusState[] = searchResults.items;
 
         cleanupProjectDataSearchResults(statusDataList);
 
@@ -1272,12 +1338,12 @@ app.get(`${api_root_endpoint}/${search_projects_status}`, async (req: Request, r
         const listOfProjectNames : string = statusDataListFilteredBySynchronized.map((statusData) => `${(statusData as any).owner} org=${(statusData as any).org} project=${(statusData as any).project}`).join('\n');
         console.info(`${email} ${req.method} ${req.originalUrl} retrieved ${statusDataListFilteredBySynchronized.length} Project Status with synchronized:${synchronizedMatch?synchronizedMatch:'all'}: ${listOfProjectNames}`);
 
-        return res
-            .status(HTTP_SUCCESS)
-            .contentType('application/json')
-            .send(statusDataListFilteredBySynchronized);
+        return sendSearchResults(res, statusDataListFilteredBySynchronized, paging, searchResults.cursor);
 
     } catch (error) {
+        if (error instanceof InvalidSearchCursorError) {
+            return handleErrorResponse(email, error, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
         return handleErrorResponse(email, error, req, res);
     }
 });
@@ -1314,25 +1380,32 @@ app.get(`${api_root_endpoint}/${search_projects_generators_groom}`, async (req:
             return handleErrorResponse(email, new Error("Status must be a string"), req, res, "Invalid status", HTTP_FAILURE_BAD_REQUEST_INPUT);
         }
 
-        const generatorDataList : GeneratorState[] =
-            await searchProjectData<GeneratorState>(
+        const paging = getSearchPaging(req);
+        if (paging instanceof Error) {
+            return handleErrorResponse(email, paging, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
+
+        const searchResults =
+            await searchProjectDataPage<GeneratorState>(
             user?user as string:searchWildcard, SourceType.GitHub,
             org?org as string:searchWildcard,
             project?project as string:searchWildcard,
             resource?`/${resource as string}`:searchWildcard,
-            'generator');
+            'generator',
+            paging?.limit, paging?.cursor);
+        const generatorDataList : GeneratorState[] = searchResults.items;
 
         console.info(`${email} ${req.method} ${req.originalUrl}  retrieved ${generatorDataList.length} Generators`);
 
         const generatorDataListFilteredByStatus : GeneratorState[] =
             generatorDataList.filter((generatorData) => status?generatorData.status === status:true);
 
-        return res
-            .status(HTTP_SUCCESS)
-            .contentType('application/json')
-            .send(generatorDataListFilteredByStatus);
+        return sendSearchResults(res, generatorDataListFilteredByStatus, paging, searchResults.cursor);
 
     } catch (error) {
+        if (error instanceof InvalidSearchCursorError) {
+            return handleErrorResponse(email, error, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
         return handleErrorResponse(email, error, req, res);
     }
 });
@@ -1844,6 +1917,21 @@ app.patch(`${api_root_endpoint}/${user_project_org_project_status}`, async (req:
     }
 });
 
+// the states a project status long-poll can wait for - the status itself, plus the common summary states
+const projectLongPollStates = (projectStatus: ProjectStatusState) : string[] => {
+    const states : string[] = [projectStatus.status];
+    if (projectStatus.synchronized || projectStatus.status === ProjectStatus.Synchronized) {
+        states.push('synchronized');
+    }
+    if (!projectStatus.activelyUpdating) {
+        states.push('idle');
+    }
+    if (projectStatus.status === ProjectStatus.ResourcesInError) {
+        states.push('error');
+    }
+    return states;
+}
+
 app.get(`${api_root_endpoint}/${user_project_org_project_status}`, async (req: Request, res: Response) => {
 
     let email : string | undefined = undefined;
@@ -1899,10 +1987,28 @@ app.get(`${api_root_endpoint}/${user_project_org_project_status}`, async (req: R
                 .send(unknownStatus);
         }
 
+        // ?waitFor=synchronized|idle|error holds the request until the project reaches one of the states (or the wait times out)
+        //      the stored status is re-read while waiting - it's kept current by the generators and status refresh
+        const longPoll = getLongPollRequest(req);
+        if (longPoll) {
+            projectStatus = await waitForState<ProjectStatusState>(longPoll, async () => {
+                    const rawStatus = await getProjectData(email!, SourceType.General, org, project, '', 'status');
+                    return rawStatus ? JSON.parse(rawStatus) as ProjectStatusState : projectStatus!;
+                }, projectLongPollStates, projectStatus);
+        }
+
         if (process.env.TRACE_LEVEL) {
             console.log(`${email} ${req.method} ${req.originalUrl} Project Status: ${JSON.stringify(projectStatus)}`);
         }
 
+        const projectStatusETag = contentETag(projectStatus);
+        setConditionalHeaders(res, projectStatusETag, projectStatus.lastUpdated);
+        if (isNotModified(req, projectStatusETag, projectStatus.lastUpdated)) {
+            return res
+                .status(HTTP_NOT_MODIFIED)
+                .send();
+        }
+
         return res
             .status(HTTP_SUCCESS)
             .contentType('application/json')
@@ -3246,11 +3352,31 @@ app.get(`${api_root_endpoint}/${user_project_org_project_data_resource}`, async
         }
 
         const { _, __, resource } = req.params;
+
+        // the resource status is a small read - if the client is revalidating by date, we can skip loading the
+        //      (potentially multi-part) resource entirely
+        const resourceStatus : ResourceStatusState | undefined =
+            await getCachedProjectData<ResourceStatusState>(email, SourceType.GitHub, ownerName, repoName, `resource/${resource}`, "status");
+        if (isNotModified(req, undefined, resourceStatus?.lastUpdated)) {
+            setConditionalHeaders(res, undefined, resourceStatus?.lastUpdated);
+            return res
+                .status(HTTP_NOT_MODIFIED)
+                .send();
+        }
+
         const resourceData = await getCachedProjectData<string>(email, SourceType.GitHub, ownerName, repoName, '', resource);
         if (!resourceData) {
             return handleErrorResponse(email, new Error(`Resource not found: ${ownerName}/${repoName}/data/${resource}`), req, res, undefined, HTTP_FAILURE_NOT_FOUND);
         }
 
+        const resourceETag = contentETag(resourceData);
+        setConditionalHeaders(res, resourceETag, resourceStatus?.lastUpdated);
+        if (isNotModified(req, resourceETag, resourceStatus?.lastUpdated)) {
+            return res
+                .status(HTTP_NOT_MODIFIED)
+                .send();
+        }
+
         return res
             .status(HTTP_SUCCESS)
             .contentType('text/plain')
@@ -3480,15 +3606,14 @@ app.get(`${api_root_endpoint}/${user_project_org_project_data_resource_generator
         }
 
         const { _, __, resource } = req.params;
-        const currentInput = await getProjectData(email, SourceType.GitHub, ownerName, repoName, '', `${resource}/generator`);
-        if (!currentInput) {
-            console.log(`${email} ${req.method} ${req.originalUrl} : simulated idle data`);
 
-            return res
-                .status(HTTP_SUCCESS)
-                .contentType('application/json')
-                .send({status: TaskStatus.Idle} as GeneratorState);
-        } else {
+        const loadGeneratorState = async () : Promise<GeneratorState> => {
+            const currentInput = await getProjectData(email!, SourceType.GitHub, ownerName, repoName, '', `${resource}/generator`);
+            if (!currentInput) {
+                console.log(`${email} ${req.method} ${req.originalUrl} : simulated idle data`);
+
+                return {status: TaskStatus.Idle} as GeneratorState;
+            }
 
             // for backward compatibility (old field name)
             if ((currentInput as any)?.status_details) {
@@ -3498,22 +3623,26 @@ app.get(`${api_root_endpoint}/${user_project_org_project_data_resource_generator
 
             // Ensure parsing safety with a try-catch around JSON.parse
             try {
-                const generatorData = JSON.parse(currentInput) as GeneratorState;
-
                 // Additional checks can be placed here to ensure generatorData contains expected properties
-                return res
-                    .status(HTTP_SUCCESS)
-                    .contentType('application/json')
-                    .send(generatorData);
+                return JSON.parse(currentInput) as GeneratorState;
             } catch (parseError: any) {
                 console.error(`${email} ${req.method} ${req.originalUrl} Parsing error for generator data: `, parseError.stack || parseError);
 
-                return res
-                    .status(HTTP_SUCCESS)
-                    .contentType('application/json')
-                    .send({status: TaskStatus.Error, statusDetails: `Parsing error for generator data: ${parseError.stack || parseError}`} as GeneratorState);
+                return {status: TaskStatus.Error, statusDetails: `Parsing error for generator data: ${parseError.stack || parseError}`} as GeneratorState;
             }
         }
+
+        // ?waitFor=idle|error holds the request until the generator reaches one of the states (or the wait times out)
+        //      so callers don't need to poll for completion
+        const longPoll = getLongPollRequest(req);
+        const generatorData = longPoll ?
+            await waitForState<GeneratorState>(longPoll, loadGeneratorState, (state) => state.status) :
+            await loadGeneratorState();
+
+        return res
+            .status(HTTP_SUCCESS)
+            .contentType('application/json')
+            .send(generatorData);
     } catch (error) {
         return handleErrorResponse(email, error, req, res);
     }
@@ -5287,16 +5416,53 @@ app.get(`${api_root_endpoint}/${user_org_connectors_openai_files}`, async (req:
 
     let email : string | undefined = undefined;
     try {
-        email = await validateUser(req, res);
+        const paging = getSearchPaging(req);
+
+        let admin = false;
+        if (paging && !(paging instanceof Error)) {
+            try {
+                // paged listing is used to walk every file (e.g. a client-driven purge) - so like the purge, an admin
+                //      sees all files rather than only their own
+                email = await validateUser(req, res, AuthType.Admin, true);
+                admin = true;
+            } catch (error) {
+                email = await validateUser(req, res);
+            }
+        } else {
+            email = await validateUser(req, res);
+        }
         if (!email) {
             return;
         }
 
+        if (paging instanceof Error) {
+            return handleErrorResponse(email, paging, req, res, "Invalid paging", HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
+
         const org = req.params.org;
         if (!org) {
             return handleErrorResponse(email, new Error('Org is required'), req, res, undefined, HTTP_FAILURE_BAD_REQUEST_INPUT);
         }
 
+        if (paging) {
+            // one page of files (oldest first) - the cursor is the last file id read, so a page may hold fewer
+            //      files than the limit once filtered (or none) and still not be the last page
+            const afterDate : string | undefined = typeof req.query.afterDate === 'string' ? req.query.afterDate : undefined;
+            const creationStart : number = afterDate ? new Date(afterDate).getTime() / 1000 : 0;
+            if (isNaN(creationStart)) {
+                return handleErrorResponse(email, new Error('Invalid afterDate'), req, res, undefined, HTTP_FAILURE_BAD_REQUEST_INPUT);
+            }
+
+            const filePage = await searchOpenAIFilesPage({
+                email: admin ? undefined : email,
+                org: admin ? undefined : org,
+                limit: paging.limit,
+                startAtFileId: paging.cursor,
+                creationStart });
+
+            return sendSearchResults(res, filePage.files, paging, filePage.lastFileId);
+        }
+
         const project = typeof req.query.project === 'string' ? req.query.project : undefined;
         const dataType = typeof req.query.dataType === 'string' ? req.query.dataType : undefined;
         let repoUri = undefined;
@@ -5404,6 +5570,19 @@ app.get(`${api_root_endpoint}/${user_org_connectors_openai_assistant}`, async (r
     }
 });
 
+// assistants per ?ids= deletion slice - each is looked up, checked and deleted at most once a second, so a full slice
+//      finishes well inside the request timeout
+const maximumAssistantsPerDeletionSlice = 15;
+const secondsAssistantDeletionSliceBudget = secondsBeforeRestRequestMaximumTimeout - 5;
+
+interface AssistantDeletionSlice {
+    deleted: string[];                  // deleted (or, without confirm, would be deleted)
+    kept: string[];                     // not matching the criteria or not owned by the caller
+    missing: string[];                  // already deleted
+    failed: Record<string, string>;     // assistant id to error
+    remaining: string[];                // not reached - time budget or OpenAI rate limit
+}
+
 app.delete(`${api_root_endpoint}/${user_org_connectors_openai_assistants}`, async (req: Request, res: Response, next) => {
 
     let email : string | undefined = undefined;
@@ -5433,6 +5612,11 @@ app.delete(`${api_root_endpoint}/${user_org_connectors_openai_assistants}`, asyn
         const noFiles = req.query.noFiles != undefined;
         const confirm = req.query.confirm != undefined;
 
+        const assistantIds : string[] | undefined = (typeof req.query.ids === 'string') ? req.query.ids.split(',').filter((id) => id) : undefined;
+        if (assistantIds && (assistantIds.length === 0 || assistantIds.length > maximumAssistantsPerDeletionSlice)) {
+            return handleErrorResponse(email, new Error(`Between 1 and ${maximumAssistantsPerDeletionSlice} assistant ids are required`), req, res, undefined, HTTP_FAILURE_BAD_REQUEST_INPUT);
+        }
+
         const shouldDeleteAssistantHandler = async (assistant: OpenAIAssistant) : Promise<boolean> => {
             const createdDate = new Date(assistant.created_at * 1000);
 
@@ -5461,6 +5645,65 @@ app.delete(`${api_root_endpoint}/${user_org_connectors_openai_assistants}`, asyn
             return false;
         }
 
+        if (assistantIds) {
+            // delete a bounded slice of assistants - each is re-checked against the criteria (and ownership) before it's
+            //      deleted, and any not reached before the request time budget (or an OpenAI rate limit) are returned
+            //      as remaining, so a client can delete thousands of assistants in parallel slices without a timeout
+            const sliceResult : AssistantDeletionSlice = { deleted: [], kept: [], missing: [], failed: {}, remaining: [] };
+            const sliceStartTimeInMs = Date.now();
+
+            for (let i = 0; i < assistantIds.length; i++) {
+                const assistantId = assistantIds[i];
+                if ((Date.now() - sliceStartTimeInMs) / 1000 > secondsAssistantDeletionSliceBudget) {
+                    sliceResult.remaining = assistantIds.slice(i);
+                    break;
+                }
+
+                const beforeDeleteTimeInMs = Date.now();
+                try {
+                    const assistant : OpenAIAssistant | undefined = await getOpenAIAssistant(assistantId);
+                    if (!assistant) {
+                        sliceResult.missing.push(assistantId);
+                        continue;
+                    }
+                    if (!isAssistantMatch(assistant, { email, org }) || !await shouldDeleteAssistantHandler(assistant)) {
+                        sliceResult.kept.push(assistantId);
+                        continue;
+                    }
+                    if (!confirm) {
+                        sliceResult.deleted.push(assistantId);
+                        continue;
+                    }
+                    if (await deleteOpenAIAssistant(assistantId)) {
+                        sliceResult.deleted.push(assistantId);
+                        console.info(`${email} ${req.method} ${req.originalUrl} Deleted assistant ${assistant.name}:${assistant.id} created at ${new Date(assistant.created_at * 1000).toLocaleDateString()}`);
+                    } else {
+                        sliceResult.missing.push(assistantId);
+                    }
+                } catch (error: any) {
+                    if (error instanceof OpenAIRateLimitError) {
+                        console.warn(`${email} ${req.method} ${req.originalUrl} Rate limited deleting assistant ${assistantId} - returning ${assistantIds.length - i} assistants as remaining`);
+                        sliceResult.remaining = assistantIds.slice(i);
+                        break;
+                    }
+                    console.error(`${email} ${req.method} ${req.originalUrl} Error deleting assistant ${assistantId}:`, error);
+                    sliceResult.failed[assistantId] = error.message;
+                }
+
+                if (confirm) {
+                    const remainingTimeOutOfOneSecond = 1000 - (Date.now() - beforeDeleteTimeInMs);
+                    if (remainingTimeOutOfOneSecond > 0) {
+                        await delay(remainingTimeOutOfOneSecond);
+                    }
+                }
+            }
+
+            return res
+                .status(HTTP_SUCCESS)
+                .contentType('application/json')
+                .send(sliceResult);
+        }
+
         const aiAssistants : OpenAIAssistant[] = await searchOpenAIAssistants({ email, org, project },
             shouldDeleteAssistantHandler);
         
@@ -5516,7 +5759,12 @@ app.delete(`${api_root_endpoint}/${user_org_connectors_openai_files_id}`, async
             return handleErrorResponse(email, new Error('FileId is required'), req, res, undefined, HTTP_FAILURE_BAD_REQUEST_INPUT);
         }
         
-        await deleteAssistantFile(fileId);
+        if (!await deleteAssistantFile(fileId)) {
+            return res
+                .status(HTTP_FAILURE_NOT_FOUND)
+                .contentType('plain/text')
+                .send('File not found');
+        }
 
         return res
             .status(HTTP_SUCCESS)
@@ -5524,6 +5772,10 @@ app.delete(`${api_root_endpoint}/${user_org_connectors_openai_files_id}`, async
             .send(fileId);
             
     } catch (error) {
+        if (error instanceof OpenAIRateLimitError) {
+            // let the caller back off and retry, rather than treating the file as failed
+            return handleErrorResponse(email, error, req, res, undefined, HTTP_FAILURE_BUSY);
+        }
         return handleErrorResponse(email, error, req, res);
     }
 });
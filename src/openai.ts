@@ -7,6 +7,7 @@ import fetch from 'node-fetch';
 import FormData from 'form-data';
 import axios from 'axios';
 import { HTTP_FAILURE_BUSY, HTTP_FAILURE_NOT_FOUND } from './utility/dispatch';
+import { ServerTimingMetric, timed } from './utility/timing';
 
 export async function uploadProjectDataForAIAssistant(email: string, org: string, project: string, repoUri: URL, dataTypeId: string, simpleFilename: string, projectData: string) : Promise<ProjectDataReference> {
 
@@ -141,14 +142,14 @@ const createAssistantFile = async (dataFilename: string, data: string): Promise<
     // get the current date time as a us formatted string
     const currentTime = usFormatter.format(new Date());
 
-    const response = await fetch(createFileRest, {
+    const response = await timed(ServerTimingMetric.OpenAI, () => fetch(createFileRest, {
         method: 'POST',
         headers: {
             'Authorization': `Bearer ${openAiKey}`,
             ...formData.getHeaders(),
         },
         body: formData
-    });
+    }));
 
     if (response.ok) {
         console.log(`[OpenAI:createAssistantFile] ${dataFilename} UPLOAD:SUCCEEDED: ${dataFilename} (${dataSize} bytes)`);
@@ -205,7 +206,7 @@ export const getOpenAIFile = async (fileId: string): Promise<OpenAIFile | undefi
 
     while (attempt <= maxRetries) {
         try {
-            const response = await axios.get(getFileRest, axiosConfig);
+            const response = await timed(ServerTimingMetric.OpenAI, () => axios.get(getFileRest, axiosConfig));
             return response.data as OpenAIFile;
         } catch (error: any) {
             if (error?.response.status === 404) {
@@ -227,7 +228,7 @@ export const getOpenAIFile = async (fileId: string): Promise<OpenAIFile | undefi
                     const errorMessage = error.response.data.error?.message || 'No error message';
                     const statusCode = error.response.status;
                     if (statusCode === HTTP_FAILURE_BUSY) {
-                        throw new Error(`OpenAI Get Call Rate limit exceeded for ${fileId}: ${errorMessage}`);
+                        throw new OpenAIRateLimitError(`OpenAI Get Call Rate limit exceeded for ${fileId}: ${errorMessage}`);
                     } else {
                         throw new Error(`OpenAI Get file failure for ${fileId} status: ${statusCode}, error: ${errorMessage}`);
                     }
@@ -244,7 +245,15 @@ export const getOpenAIFile = async (fileId: string): Promise<OpenAIFile | undefi
     return undefined;
 }
 
-export const deleteAssistantFile = async (fileId: string): Promise<void> => {
+export class OpenAIRateLimitError extends Error {
+    constructor(message: string) {
+        super(message);
+        this.name = 'OpenAIRateLimitError';
+    }
+}
+
+// returns false if the file doesn't exist (e.g. it was already deleted)
+export const deleteAssistantFile = async (fileId: string): Promise<boolean> => {
     const openAiKey : any = await getSecretsAsObject('exetokendev', 'openai-personal');
     if (!openAiKey) {
         throw new Error('OpenAI API key not found');
@@ -265,10 +274,10 @@ export const deleteAssistantFile = async (fileId: string): Promise<void> => {
 
     while (attempt <= maxRetries) {
         try {
-            await axios.delete(deleteFileIdRest, axiosConfig);
+            await timed(ServerTimingMetric.OpenAI, () => axios.delete(deleteFileIdRest, axiosConfig));
 
             // If call was successful, break out of the loop
-            return;
+            return true;
         } catch (error: any) {
             if (axios.isAxiosError(error) && error.code === 'ECONNABORTED') {
                 attempt++;
@@ -282,9 +291,9 @@ export const deleteAssistantFile = async (fileId: string): Promise<void> => {
             } else {
                 if (axios.isAxiosError(error) && error.response?.status === HTTP_FAILURE_NOT_FOUND) {
                     console.warn(`[OpenAI:deleteAssistantFile] FAILED: ${fileId} not found`);
-                } else {
-                    console.error(`[OpenAI:deleteAssistantFile] FAILED: ${fileId} after Error: ${error.message}`);
+                    return false;
                 }
+                console.error(`[OpenAI:deleteAssistantFile] FAILED: ${fileId} after Error: ${error.message}`);
 
                 // Handle non-timeout errors
                 if (error.response) {
@@ -292,8 +301,8 @@ export const deleteAssistantFile = async (fileId: string): Promise<void> => {
                     // that falls out of the range of 2xx
                     const errorMessage = error.response.data.error?.message || 'No error message';
                     const statusCode = error.response.status;
-                    if (statusCode === HTTP_FAILURE_BUSY.toString()) {
-                        throw new Error(`OpenAI Delete Call Rate limit exceeded for ${fileId}: ${errorMessage}`);
+                    if (statusCode === HTTP_FAILURE_BUSY) {
+                        throw new OpenAIRateLimitError(`OpenAI Delete Call Rate limit exceeded for ${fileId}: ${errorMessage}`);
                     } else {
                         throw new Error(`OpenAI Delete file failure for ${fileId} status: ${statusCode}, error: ${errorMessage}`);
                     }
@@ -307,6 +316,7 @@ export const deleteAssistantFile = async (fileId: string): Promise<void> => {
             }
         }
     }
+    return false;
 };
 
 
@@ -322,92 +332,101 @@ export interface DataSearchCriteria {
     filePrefixFilter?: string;
 }
 
+const filterOpenAIFiles = (retrievedFiles: OpenAIFile[], criteria: DataSearchCriteria) : OpenAIFile[] => {
+    const { email, org, project, repoUri, dataType } = criteria;
+
+    // Split the pathname by '/' and filter out empty strings
+    const pathSegments = !repoUri?undefined:repoUri.pathname!.split('/').filter(segment => segment);
+
+    // The relevant part is the last segment of the path
+    const repoName = pathSegments?pathSegments.pop():undefined;
+    const ownerName = pathSegments?pathSegments.pop():undefined;
+
+    const filteredFiles = retrievedFiles.filter((file) => {
+        let isMatch = true;
+        if (email) {
+            isMatch &&= file.filename.includes(`${email.replace(/[^a-zA-Z0-9]/g, '_')}`);
+        }
+        if (org) {
+            isMatch &&= file.filename.includes(`_${org.replace(/[^a-zA-Z0-9]/g, '_')}`);
+        }
+        if (project) {
+            isMatch &&= file.filename.includes(`_${project.replace(/[^a-zA-Z0-9]/g, '_')}`);
+        }
+        if (repoName) {
+            isMatch &&= file.filename.includes(`${repoName.toString().replace(/[^a-zA-Z0-9]/g, '_')}`);
+        }
+        if (ownerName) {
+            isMatch &&= file.filename.includes(`${ownerName.toString().replace(/[^a-zA-Z0-9]/g, '_')}`);
+        }
+        if (dataType) {
+            isMatch &&= file.filename.includes(`${dataType}`);
+        }
+        return isMatch;
+    });
+    return filteredFiles;
+}
+
+const fetchOpenAIFilesPage = async (openAiKey: string, criteria: DataSearchCriteria, lastFileId: string | undefined, limitPerPage: number, ascending: boolean = true) : Promise<FileSearchResult> => {
+    // we're going to use an internal undocumented OpenAI API to search files - as the public API only supports 10,000 files, no pagination, no sorting
+    const getFilesRestEndpoint = `https://api.openai.com/v1/internal/files?${lastFileId ? `after=${lastFileId}&` : ''}limit=${limitPerPage}&order=${ascending?"asc":"desc"}&order_by=created_at`;
+
+    let response = undefined;
+    for (const iteration of [1, 2, 3]) {
+        try {
+            response = await timed(ServerTimingMetric.OpenAI, () => fetch(getFilesRestEndpoint, {
+                method: 'GET',
+                headers: {
+                    'Authorization': `Bearer ${openAiKey}`,
+                },
+            }));
+
+            if (!response.ok) {
+                const errorText = await response.text();
+                throw new Error(`Failed to fetch files: ${getFilesRestEndpoint} ${errorText}`);
+            }
+        } catch (error: any) {
+            if (iteration < 3) {
+                console.warn(`[OpenAI:searchOpenAIFiles] RETRY: ${getFilesRestEndpoint} ${error.message}`);
+                await delay(1000);
+                continue;
+            }
+            console.error(`[OpenAI:searchOpenAIFiles] FAILED: ${getFilesRestEndpoint} ${error.message}`);
+            throw error;
+        }
+        break;
+    }
+    if (!response) {
+        console.error(`[OpenAI:searchOpenAIFiles] FAILED ${JSON.stringify(criteria)}: No response`);
+        throw new Error('Failed to fetch files');
+    }
+
+    return await response.json() as FileSearchResult;
+}
+
+// the most files OpenAI returns in one page
+export const maximumOpenAIFilesPageSize = 1000;
+
 export const searchOpenAIFiles = async (criteria: DataSearchCriteria): Promise<OpenAIFile[]> => {
     const openAiKey : any = await getSecretsAsObject('exetokendev', 'openai-personal');
     if (!openAiKey) {
         throw new Error('OpenAI API key not found');
     }
 
-    const { email, org, project, repoUri, dataType, limit, creationStart, startAtFileId, filePrefixFilter } = criteria;
+    const { limit, creationStart, startAtFileId, filePrefixFilter } = criteria;
 
     let files: OpenAIFile[] = [];
     let lastFileId: string | undefined = startAtFileId;
-    const limitPerPage = 1000; // Max limit per page
+    const limitPerPage = maximumOpenAIFilesPageSize; // Max limit per page
     const actualLimit = limit || Infinity; // Use specified limit or no limit
     let totalFetched = 0;
 
     const ascending = true;
 
-    const filterFiles = (retrievedFiles: OpenAIFile[]) : OpenAIFile[] => {
-        // Split the pathname by '/' and filter out empty strings
-        const pathSegments = !repoUri?undefined:repoUri.pathname!.split('/').filter(segment => segment);
-
-        // The relevant part is the last segment of the path
-        const repoName = pathSegments?pathSegments.pop():undefined;
-        const ownerName = pathSegments?pathSegments.pop():undefined;
-
-        const filteredFiles = retrievedFiles.filter((file) => {
-            let isMatch = true;
-            if (email) {
-                isMatch &&= file.filename.includes(`${email.replace(/[^a-zA-Z0-9]/g, '_')}`);
-            }
-            if (org) {
-                isMatch &&= file.filename.includes(`_${org.replace(/[^a-zA-Z0-9]/g, '_')}`);
-            }
-            if (project) {
-                isMatch &&= file.filename.includes(`_${project.replace(/[^a-zA-Z0-9]/g, '_')}`);
-            }
-            if (repoName) {
-                isMatch &&= file.filename.includes(`${repoName.toString().replace(/[^a-zA-Z0-9]/g, '_')}`);
-            }
-            if (ownerName) {
-                isMatch &&= file.filename.includes(`${ownerName.toString().replace(/[^a-zA-Z0-9]/g, '_')}`);
-            }
-            if (dataType) {
-                isMatch &&= file.filename.includes(`${dataType}`);
-            }
-            return isMatch;
-        });
-        return filteredFiles;
-    }
-
     let page = 0;
 
     do {
-        // we're going to use an internal undocumented OpenAI API to search files - as the public API only supports 10,000 files, no pagination, no sorting
-        const getFilesRestEndpoint = `https://api.openai.com/v1/internal/files?${lastFileId ? `after=${lastFileId}&` : ''}limit=${limitPerPage}&order=${ascending?"asc":"desc"}&order_by=created_at`;
-
-        let response = undefined;
-        for (const iteration of [1, 2, 3]) {
-            try {
-                response = await fetch(getFilesRestEndpoint, {
-                    method: 'GET',
-                    headers: {
-                        'Authorization': `Bearer ${openAiKey}`,
-                    },
-                });
-
-                if (!response.ok) {
-                    const errorText = await response.text();
-                    throw new Error(`Failed to fetch files: ${getFilesRestEndpoint} ${errorText}`);
-                }
-            } catch (error: any) {
-                if (iteration < 3) {
-                    console.warn(`[OpenAI:searchOpenAIFiles] RETRY: ${getFilesRestEndpoint} ${error.message}`);
-                    await delay(1000);
-                    continue;
-                }
-                console.error(`[OpenAI:searchOpenAIFiles] FAILED: ${getFilesRestEndpoint} ${error.message}`);
-                throw error;
-            }
-            break;
-        }
-        if (!response) {
-            console.error(`[OpenAI:searchOpenAIFiles] FAILED ${JSON.stringify(criteria)}: No response`);
-            throw new Error('Failed to fetch files');
-        }
-
-        const searchResult = await response.json() as FileSearchResult;
+        const searchResult = await fetchOpenAIFilesPage(openAiKey, criteria, lastFileId, limitPerPage, ascending);
 
         const data = searchResult.data as OpenAIFile[];
 
@@ -435,7 +454,7 @@ export const searchOpenAIFiles = async (criteria: DataSearchCriteria): Promise<O
                     continue; // Skip this file
                 }
                 console.warn(`[OpenAI:searchOpenAIFiles] SKIPPED: ${file.filename} created at: ${file.created_at} before ${new Date(creationStart * 1000).toLocaleString()}`);
-                return filterFiles(files); // Return current files without adding more
+                return filterOpenAIFiles(files, criteria); // Return current files without adding more
             }
             // Apply filePrefixFilter if present
             if (filePrefixFilter && !file.filename.startsWith(filePrefixFilter)) {
@@ -457,7 +476,41 @@ export const searchOpenAIFiles = async (criteria: DataSearchCriteria): Promise<O
         // If a limit is specified and reached, or no more files to fetch, stop the loop
     } while (files.length < actualLimit && lastFileId && totalFetched < actualLimit);
 
-    return filterFiles(files.slice(0, actualLimit)); // Ensure only the limited number of files are returned
+    return filterOpenAIFiles(files.slice(0, actualLimit), criteria); // Ensure only the limited number of files are returned
+};
+
+export interface OpenAIFilePage {
+    files: OpenAIFile[];
+    // the last file read from OpenAI (before filtering) - the cursor for the next page, undefined on the last page
+    lastFileId?: string;
+}
+
+// one page of files, oldest first, after criteria.startAtFileId - so a caller can walk (and delete) every file a
+//      page at a time, resuming from any page's lastFileId, instead of in one long search
+export const searchOpenAIFilesPage = async (criteria: DataSearchCriteria): Promise<OpenAIFilePage> => {
+    const openAiKey : any = await getSecretsAsObject('exetokendev', 'openai-personal');
+    if (!openAiKey) {
+        throw new Error('OpenAI API key not found');
+    }
+
+    const { limit, creationStart, startAtFileId, filePrefixFilter } = criteria;
+    const limitPerPage = Math.min(limit || maximumOpenAIFilesPageSize, maximumOpenAIFilesPageSize);
+
+    const searchResult = await fetchOpenAIFilesPage(openAiKey, criteria, startAtFileId, limitPerPage);
+    const data = searchResult.data as OpenAIFile[];
+
+    const files = data.filter((file) => {
+        if (creationStart && file.created_at < creationStart) {
+            return false;
+        }
+        return !filePrefixFilter || file.filename.startsWith(filePrefixFilter);
+    });
+
+    const hasMore = data.length > 0 && (searchResult.has_more || data.length >= limitPerPage);
+    return {
+        files: filterOpenAIFiles(files, criteria),
+        lastFileId: hasMore ? data[data.length - 1].id : undefined,
+    };
 };
 
 export interface OpenAIAssistant {
@@ -508,7 +561,7 @@ export const getOpenAIAssistant = async (assistantId: string): Promise<OpenAIAss
 
     while (attempt <= maxRetries) {
         try {
-            const response = await axios.get(getAssistantIdRest, axiosConfig);
+            const response = await timed(ServerTimingMetric.OpenAI, () => axios.get(getAssistantIdRest, axiosConfig));
             return response.data as OpenAIAssistant;
         } catch (error: any) {
             if (error?.response.status === 404) {
@@ -530,7 +583,7 @@ export const getOpenAIAssistant = async (assistantId: string): Promise<OpenAIAss
                     const errorMessage = error.response.data.error?.message || 'No error message';
                     const statusCode = error.response.status;
                     if (statusCode === HTTP_FAILURE_BUSY) {
-                        throw new Error(`OpenAI Get Call Rate limit exceeded for ${assistantId}: ${errorMessage}`);
+                        throw new OpenAIRateLimitError(`OpenAI Get Call Rate limit exceeded for ${assistantId}: ${errorMessage}`);
                     } else {
                         throw new Error(`OpenAI Get Assistant failure for ${assistantId} status: ${statusCode}, error: ${errorMessage}`);
                     }
@@ -547,7 +600,8 @@ export const getOpenAIAssistant = async (assistantId: string): Promise<OpenAIAss
     return undefined;
 }
 
-export const deleteOpenAIAssistant = async (assistantId: string): Promise<void> => {
+// returns false if the assistant doesn't exist (e.g. it was already deleted)
+export const deleteOpenAIAssistant = async (assistantId: string): Promise<boolean> => {
     const openAiKey : any = await getSecretsAsObject('exetokendev', 'openai-personal');
     if (!openAiKey) {
         throw new Error('OpenAI API key not found');
@@ -569,10 +623,10 @@ export const deleteOpenAIAssistant = async (assistantId: string): Promise<void>
 
     while (attempt <= maxRetries) {
         try {
-            await axios.delete(deleteAssistantIdRest, axiosConfig);
+            await timed(ServerTimingMetric.OpenAI, () => axios.delete(deleteAssistantIdRest, axiosConfig));
 
             // If call was successful, break out of the loop
-            return;
+            return true;
         } catch (error: any) {
             if (axios.isAxiosError(error) && error.code === 'ECONNABORTED') {
                 attempt++;
@@ -582,6 +636,10 @@ export const deleteOpenAIAssistant = async (assistantId: string): Promise<void>
                 const errorDetails = error.response?.data ? JSON.stringify(error.response.data) : 'No additional error information';
                 console.warn(`[OpenAI:deleteOpenAIAssistant] RETRY ${attempt} for ${assistantId} after Error: ${error.message} - ${errorDetails}`);
             } else {
+                if (axios.isAxiosError(error) && error.response?.status === HTTP_FAILURE_NOT_FOUND) {
+                    console.warn(`[OpenAI:deleteOpenAIAssistant] FAILED: ${assistantId} not found`);
+                    return false;
+                }
                 console.error(`[OpenAI:deleteOpenAIAssistant] FAILED: ${assistantId} after Error: ${error.message}`);
                 // Handle non-timeout errors
                 if (error.response) {
@@ -590,7 +648,7 @@ export const deleteOpenAIAssistant = async (assistantId: string): Promise<void>
                     const errorMessage = error.response.data.error?.message || 'No error message';
                     const statusCode = error.response.status;
                     if (statusCode === HTTP_FAILURE_BUSY) {
-                        throw new Error(`OpenAI Delete Call Rate limit exceeded for ${assistantId}: ${errorMessage}`);
+                        throw new OpenAIRateLimitError(`OpenAI Delete Call Rate limit exceeded for ${assistantId}: ${errorMessage}`);
                     } else {
                         throw new Error(`OpenAI Delete assistant failure for ${assistantId} status: ${statusCode}, error: ${errorMessage}`);
                     }
@@ -604,8 +662,43 @@ export const deleteOpenAIAssistant = async (assistantId: string): Promise<void>
             }
         }
     }
+    return false;
 };
 
+const ASSISTANT_METADATA_CREATOR = 'sara.frontend'
+
+// whether an assistant belongs to the search criteria - an assistant without metadata for a field matches any value
+export const isAssistantMatch = (assistant: OpenAIAssistant, searchCriteria: DataSearchCriteria): boolean => {
+    const { email, org, project } = searchCriteria;
+
+    const assistantMetadataToMatch = {
+        projectId: project,
+        userName: email,
+        orgName: org,
+        creator: ASSISTANT_METADATA_CREATOR,
+    }
+
+    let isMatch = true;
+
+    if (assistantMetadataToMatch.creator && assistant.metadata.creator) {
+        isMatch &&= assistant.metadata.creator === assistantMetadataToMatch.creator;
+    }
+
+    if (isMatch && assistantMetadataToMatch.userName && assistant.metadata.userName) {
+        isMatch &&= assistant.metadata.userName === assistantMetadataToMatch.userName;
+    }
+
+    if (isMatch && assistantMetadataToMatch.orgName && assistant.metadata.orgName) {
+        isMatch &&= assistant.metadata.orgName === assistantMetadataToMatch.orgName;
+    }
+
+    if (isMatch && assistantMetadataToMatch.projectId && assistant.metadata.projectId) {
+        isMatch &&= assistant.metadata.projectId === assistantMetadataToMatch.projectId;
+    }
+
+    return isMatch;
+}
+
 export const searchOpenAIAssistants = async (searchCriteria: DataSearchCriteria, assistantHandler?: any): Promise<OpenAIAssistant[]> => {
     const openAiKey : any = await getSecretsAsObject('exetokendev', 'openai-personal');
     if (!openAiKey) {
@@ -625,13 +718,13 @@ export const searchOpenAIAssistants = async (searchCriteria: DataSearchCriteria,
 
     do {
         const getAssistantsRestEndpoint = `https://api.openai.com/v1/assistants?limit=${pageSize}${afterCursor ? `&after=${afterCursor}` : ''}`;
-        const response = await fetch(getAssistantsRestEndpoint, {
+        const response = await timed(ServerTimingMetric.OpenAI, () => fetch(getAssistantsRestEndpoint, {
             method: 'GET',
             headers: {
                 'Authorization': `Bearer ${openAiKey}`,
                 'OpenAI-Beta': 'assistants=v1',
             },
-        });
+        }));
 
         if (!response.ok) {
 
@@ -672,39 +765,7 @@ export const searchOpenAIAssistants = async (searchCriteria: DataSearchCriteria,
 
     console.log(`[OpenAI:searchOpenAIAssistants] SUCCEEDED: ${allAssistants.length} Assistants : ${searchParameters}`);
 
-    const ASSISTANT_METADATA_CREATOR = 'sara.frontend'
-
-    const assistantMetadataToMatch = {
-        projectId: project,
-        userName: email,
-        orgName: org,
-        creator: ASSISTANT_METADATA_CREATOR,
-    }
-
-    let filteredAssistants = allAssistants.filter((assistant: OpenAIAssistant) => {
-        let isMatch = true;
-
-        if (assistantMetadataToMatch.creator && assistant.metadata.creator) {
-            isMatch &&= assistant.metadata.creator === assistantMetadataToMatch.creator;
-        }
-
-        if (isMatch && assistantMetadataToMatch.userName && assistant.metadata.userName) {
-            isMatch &&= assistant.metadata.userName === assistantMetadataToMatch.userName;
-        }
-
-        if (isMatch && assistantMetadataToMatch.orgName && assistant.metadata.orgName) {
-            isMatch &&= assistant.metadata.orgName === assistantMetadataToMatch.orgName;
-        }
-
-        if (isMatch && assistantMetadataToMatch.projectId && assistant.metadata.projectId) {
-            isMatch &&= assistant.metadata.projectId === assistantMetadataToMatch.projectId;
-        }
-        
-        if (!isMatch) {
-            return false;
-        }
-        return true;
-    });
+    let filteredAssistants = allAssistants.filter((assistant: OpenAIAssistant) => isAssistantMatch(assistant, searchCriteria));
 
     if (assistantHandler) {
         async function filterAsync(array: any, predicate: any) {
@@ -760,7 +821,10 @@ export const deleteOpenAIFiles = async (searchCriteria: DataSearchCriteria, shou
                 const beforeDeleteTimeInMs = Date.now();
 
                 try {
-                    await deleteAssistantFile(file.id);
+                    if (!await deleteAssistantFile(file.id)) {
+                        console.warn(`[OpenAI:deleteOpenAIFiles] SKIPPED: ${file.filename} : id: ${file.id} : already deleted`);
+                        continue;
+                    }
                     filesDeleted.push(file);
                     deletedFilesInThisPage++;
 
@@ -1,6 +1,7 @@
-import { DynamoDBClient, ScanCommand, ScanCommandInput } from "@aws-sdk/client-dynamodb";
+import { DynamoDBClient, QueryCommand, QueryCommandInput, ScanCommand, ScanCommandInput } from "@aws-sdk/client-dynamodb";
 import { DeleteCommand, DeleteCommandInput, GetCommand, GetCommandInput, PutCommand, PutCommandInput } from "@aws-sdk/lib-dynamodb";
 import { DynamoDBDocumentClient } from "@aws-sdk/lib-dynamodb";
+import { ServerTimingMetric, timed } from "./utility/timing";
 
 // Use the region from the serverless environment configuration
 const region = process.env.AWS_REGION || 'us-west-2'; // Fallback to 'us-west-2' if not set
@@ -19,6 +20,23 @@ interface BoostDynamoItem {
 // Use the environment variable DYNAMO_DB_ANALYSIS for the table name
 const analysisDatastoreTableName = process.env.DYNAMO_DB_ANALYSIS || "Boost.AnalysisDataStore.prod";
 
+// searchable records (the last segment of the dataPath) carry secondary index keys, so searches can Query
+//      instead of Scan the whole table - large resources and their parts are never indexed
+export const searchableAnalysisTypes = ['project', 'status', 'generator', 'groom', 'data_references'];
+
+// GSI partitioned by analysis type, sorted by projectPath (so a user's records are a key prefix)
+export const searchTypeIndexName = 'searchType-projectPath-index';
+// GSI partitioned by owner (org) and analysis type, sorted by projectPath
+export const searchOwnerTypeIndexName = 'searchOwnerType-projectPath-index';
+
+// the indexes are only used once they've been created and existing records backfilled (scripts/search_index.py)
+const useSearchIndexes = !!process.env.DYNAMO_DB_ANALYSIS_SEARCH_INDEXES;
+
+export interface SearchPage<T> {
+    items: T[];
+    cursor?: string;       // opaque - pass back to continue the search; undefined when there are no more results
+}
+
 export enum SourceType {
     GitHub = 'github',
     General = 'blob'
@@ -52,7 +70,7 @@ export async function getProjectData(
     let attempt = 0;
     while (attempt < 5) {
         try {
-            const data = await dynamoDB.send(new GetCommand(params));
+            const data = await timed(ServerTimingMetric.DatabaseRead, () => dynamoDB.send(new GetCommand(params)));
             return data.Item ? data.Item.data : undefined;
         } catch (storageReadError: any) {
             console.error(`[Storage] Attempt ${attempt + 1}: Error getting project data: `, storageReadError.stack || storageReadError);
@@ -69,34 +87,146 @@ export async function getProjectData(
     throw new Error('Maximum retry attempts reached');    
 }
 
+function searchIndexAttributes(owner: string, dataPath: string) : Record<string, string> {
+    const searchType = dataPath.substring(dataPath.lastIndexOf('/') + 1);
+    if (!searchableAnalysisTypes.includes(searchType)) {
+        return {};
+    }
+    return {
+        searchType,
+        searchOwnerType: `${owner}#${searchType}`
+    };
+}
+
+interface SearchCursor {
+    index: string;                              // the index (or table scan) the key belongs to
+    key: Record<string, any>;                   // DynamoDB LastEvaluatedKey
+}
+
+const tableScan = 'scan';
+
+// a cursor that isn't one this search returned - a client error, not a storage failure
+export class InvalidSearchCursorError extends Error {
+    constructor(message: string) {
+        super(message);
+        this.name = 'InvalidSearchCursorError';
+    }
+}
+
+function encodeSearchCursor(index: string, key: Record<string, any> | undefined) : string | undefined {
+    if (!key) {
+        return undefined;
+    }
+    return Buffer.from(JSON.stringify({ index, key } as SearchCursor)).toString('base64url');
+}
+
+function decodeSearchCursor(cursor: string | undefined, index: string) : Record<string, any> | undefined {
+    if (!cursor) {
+        return undefined;
+    }
+    let decoded : SearchCursor;
+    try {
+        decoded = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8')) as SearchCursor;
+    } catch (error) {
+        throw new InvalidSearchCursorError(`Invalid search cursor`);
+    }
+    if (decoded?.index !== index || !decoded.key) {
+        throw new InvalidSearchCursorError(`Invalid search cursor - search does not match`);
+    }
+    return decoded.key;
+}
+
+function convertSearchItem<T>(item: Record<string, any>) : T | null {
+    const thisItem = item as BoostDynamoItem;
+    try {
+        const projectPathParts = thisItem.projectPath.S.split('/');
+
+        if (!thisItem?.data?.S) {
+            console.error(`[Storage] SchemaError: No data field found for ${thisItem.projectPath.S}${thisItem.dataPath.S}`);
+            return null;
+        }
+
+        const convertedItem = JSON.parse(thisItem.data.S) as T;
+        return {
+            ...convertedItem,
+            _userName: projectPathParts[0],
+            _ownerName: projectPathParts[2],
+            _projectName: projectPathParts[3],
+        } as T; // Cast to T, if T is the type you're working with
+    } catch (error: any) {
+        console.error(`[Storage] SchemaError: Error retrieving ${thisItem?.projectPath?.S} ${thisItem?.dataPath?.S}:`, error.stack || error);
+        return null;
+    }
+}
+
 // to search "public" data, pass "*" as email
 // to search private data for all users, pass null as email
 // to search for any project - use "*" fpr project name
 // to search for any owner - use "*" for owner name
 export async function searchProjectData<T>(email: string | undefined, sourceType: string, owner: string, project: string, resourcePath: string, analysisType: string): Promise<any[]> {
+    const searchResults = await searchProjectDataPage<T>(email, sourceType, owner, project, resourcePath, analysisType);
+    return searchResults.items;
+}
+
+// search one page of project data - returns up to 'limit' items (all items if no limit), and a cursor to continue
+//      searchable analysis types use a Query on the search indexes (when enabled), anything else falls back to a Scan
+export async function searchProjectDataPage<T>(
+    email: string | undefined, sourceType: string,
+    owner: string, project: string,
+    resourcePath: string, analysisType: string,
+    limit?: number, cursor?: string): Promise<SearchPage<T>> {
+
+    const isUserSearch = email !== "*" && email !== null;
+
+    const index = !useSearchIndexes || !searchableAnalysisTypes.includes(analysisType) ? tableScan :
+        owner !== searchWildcard ? searchOwnerTypeIndexName : searchTypeIndexName;
+
+    let keyConditionExpression = '';
     let filterExpression = '';
     const expressionAttributeValues: Record<string, any> = {};
 
-    // Handle wildcard and specific cases for email
-    if (email !== "*" && email !== null) {
-        // check for starting with this email
-        filterExpression += 'begins_with(projectPath, :emailVal)';
-        expressionAttributeValues[':emailVal'] = { S: email + '/' };
+    const addFilter = (expression: string) => {
+        filterExpression += (filterExpression ? ' AND ' : '') + expression;
+    }
+
+    if (index === tableScan) {
+        // Handle wildcard and specific cases for email
+        if (isUserSearch) {
+            // check for starting with this email
+            addFilter('begins_with(projectPath, :emailVal)');
+            expressionAttributeValues[':emailVal'] = { S: email + '/' };
+        }
+    } else {
+        if (index === searchOwnerTypeIndexName) {
+            keyConditionExpression = 'searchOwnerType = :searchOwnerTypeVal';
+            expressionAttributeValues[':searchOwnerTypeVal'] = { S: `${owner}#${analysisType}` };
+        } else {
+            keyConditionExpression = 'searchType = :searchTypeVal';
+            expressionAttributeValues[':searchTypeVal'] = { S: analysisType };
+        }
+
+        // a user's records are a projectPath prefix - narrowed by source type (and owner) as well
+        if (isUserSearch) {
+            keyConditionExpression += ' AND begins_with(projectPath, :emailVal)';
+            expressionAttributeValues[':emailVal'] = { S: `${email}/${sourceType}/` + (owner !== searchWildcard ? `${owner}/` : '') };
+        }
     }
 
     // Add sourceType to the filter
-    filterExpression += (filterExpression ? ' AND ' : '') + 'contains(projectPath, :sourceTypeVal)';
-    expressionAttributeValues[':sourceTypeVal'] = { S: "/" + sourceType + "/" };
+    if (index === tableScan || !isUserSearch) {
+        addFilter('contains(projectPath, :sourceTypeVal)');
+        expressionAttributeValues[':sourceTypeVal'] = { S: "/" + sourceType + "/" };
+    }
 
     // Handle wildcard for owner
-    if (owner !== "*") {
-        filterExpression += ' AND contains(projectPath, :ownerVal)';
+    if (owner !== "*" && index === tableScan) {
+        addFilter('contains(projectPath, :ownerVal)');
         expressionAttributeValues[':ownerVal'] = { S: "/" + owner + "/" };
     }
 
     // Handle wildcard for project
     if (project !== "*") {
-        filterExpression += ' AND contains(projectPath, :projectVal)';
+        addFilter('contains(projectPath, :projectVal)');
         expressionAttributeValues[':projectVal'] = { S: project };
     }
 
@@ -104,64 +234,60 @@ export async function searchProjectData<T>(email: string | undefined, sourceType
     const dataPathTarget = ((resourcePath == searchWildcard)?'':resourcePath) + '/' + analysisType;
 
     // Add dataPath to the filter (required and cannot be wildcarded)
-    filterExpression += (resourcePath == searchWildcard)?' AND contains(dataPath, :dataPathTarget)':' AND dataPath = :dataPathTarget';
+    addFilter((resourcePath == searchWildcard)?'contains(dataPath, :dataPathTarget)':'dataPath = :dataPathTarget');
     expressionAttributeValues[':dataPathTarget'] = { S: dataPathTarget };
 
     let items: T[] = [];
-    let exclusiveStartKey = undefined;
+    let exclusiveStartKey = decodeSearchCursor(cursor, index);
     let attempt = 0;
     const maxAttempts = 3;
 
     do {
+        const remaining = limit !== undefined ? limit - items.length : undefined;
         const params = {
             TableName: analysisDatastoreTableName,
             FilterExpression: filterExpression,
             ExpressionAttributeValues: expressionAttributeValues,
-            ExclusiveStartKey: exclusiveStartKey
+            ExclusiveStartKey: exclusiveStartKey,
+            // DynamoDB applies the Limit before the filter - fine for an index Query, whose key condition already
+            //      narrows the records read; a Scan with a sparse filter would instead read many tiny pages, so it
+            //      reads full (1MB) pages and stops part way through one once the limit is reached
+            Limit: index === tableScan ? undefined : remaining,
         } as ScanCommandInput;
 
-        exclusiveStartKey = undefined; // Reset exclusiveStartKey for each attempt
         try {
-            const response = await dynamoDB.send(new ScanCommand(params));
-            if (response.Items?.length) {
-                const tempItems = response.Items    
-                    // if we are filtering on the resourcePath, then we need to filter the results
-                    .filter(item =>
-                        resourcePath !== searchWildcard || item.dataPath.S?.endsWith(dataPathTarget))
-                    .map(item => {
-                        const thisItem = item as BoostDynamoItem;
-                        try {
-                            const projectPathParts = thisItem.projectPath.S.split('/');
-
-                            if (!thisItem?.data?.S) {
-                                console.error(`[Storage] SchemaError: No data field found for ${thisItem.projectPath.S}${thisItem.dataPath.S}`);
-                                return null;
-                            }
-
-                            const convertedItem = JSON.parse(thisItem.data.S) as T;
-                            return {
-                                ...convertedItem,
-                                _userName: projectPathParts[0],
-                                _ownerName: projectPathParts[2],
-                                _projectName: projectPathParts[3],
-                            } as T; // Cast to T, if T is the type you're working with
-                        } catch (error: any) {
-                            console.error(`[Storage] SchemaError: Error retrieving ${thisItem?.projectPath?.S} ${thisItem?.dataPath?.S}:`, error.stack || error);
-                            return null;
-                        }
-                    });
-                // Now filter out the null values (or the flag values you used to indicate a failed conversion)
-                items = items.concat(tempItems.filter(item => item !== null) as T[]);
-            }
-
+            const response = (index === tableScan) ?
+                await timed(ServerTimingMetric.DatabaseRead, () => dynamoDB.send(new ScanCommand(params))) :
+                await timed(ServerTimingMetric.DatabaseRead, () => dynamoDB.send(new QueryCommand({
+                    ...params,
+                    IndexName: index,
+                    KeyConditionExpression: keyConditionExpression,
+                } as QueryCommandInput)));
             exclusiveStartKey = response.LastEvaluatedKey;
-            if (!exclusiveStartKey) {
-                break; // Exit loop if no more items to retrieve
-            }
 
+            const pageItems = response.Items ?? [];
+            for (let i = 0; i < pageItems.length; i++) {
+                const item = pageItems[i];
+                // if we are filtering on the resourcePath, then we need to filter the results
+                if (resourcePath === searchWildcard && !item.dataPath.S?.endsWith(dataPathTarget)) {
+                    continue;
+                }
+                // skip the null values (the flag value used to indicate a failed conversion)
+                const converted = convertSearchItem<T>(item);
+                if (converted !== null) {
+                    items.push(converted);
+                }
+                if (limit !== undefined && items.length >= limit) {
+                    // the page was cut short - resume after the last item returned (by its table key)
+                    if (i < pageItems.length - 1) {
+                        exclusiveStartKey = { projectPath: item.projectPath, dataPath: item.dataPath };
+                    }
+                    break;
+                }
+            }
             attempt = 0; // Reset attempt after successful response
         } catch (error: any) {
-            console.error(`[Storage] Attempt ${attempt + 1}: Error scanning project data:`, error.stack || error);
+            console.error(`[Storage] Attempt ${attempt + 1}: Error searching project data:`, error.stack || error);
             if (error.name === 'ProvisionedThroughputExceededException' && attempt < maxAttempts - 1) {
                 const waitTime = (1000 * attempt) + (Math.random() * 1000); // Exponential backoff with jitter
                 await new Promise(resolve => setTimeout(resolve, waitTime));
@@ -171,13 +297,12 @@ export async function searchProjectData<T>(email: string | undefined, sourceType
                 throw error; // Rethrow error if not related to throughput or max attempts reached
             }
         }
-    } while (exclusiveStartKey);
+    } while (exclusiveStartKey && (limit === undefined || items.length < limit));
 
-    if (attempt >= maxAttempts && exclusiveStartKey) {
-        console.warn('Not all items might have been retrieved due to reaching the maximum number of attempts.');
-    }
-
-    return items;
+    return {
+        items,
+        cursor: encodeSearchCursor(index, exclusiveStartKey)
+    };
 }
 
 function sleep(ms: number) {
@@ -209,7 +334,8 @@ export async function storeProjectData(
         Item: {
             projectPath,
             dataPath,
-            data: serializedProjectData
+            data: serializedProjectData,
+            ...searchIndexAttributes(owner, dataPath)
         }
     };
 
@@ -217,7 +343,7 @@ export async function storeProjectData(
     const maximumRetries = 8;
     while (retries < maximumRetries) {
         try {
-            await dynamoDB.send(new PutCommand(params));
+            await timed(ServerTimingMetric.DatabaseWrite, () => dynamoDB.send(new PutCommand(params)));
             return;
         } catch (storageWriteError: any) {
             console.error(`[Storage] Error writing to DynamoDB `, storageWriteError.stack || storageWriteError);
@@ -340,7 +466,7 @@ export async function deleteProjectData(email: string | null, sourceType: Source
     };
 
     try {
-        await dynamoDB.send(new DeleteCommand(params));
+        await timed(ServerTimingMetric.DatabaseWrite, () => dynamoDB.send(new DeleteCommand(params)));
     } catch (error: any) {
         console.error(`[Storage] Error deleting project data: `, error.stack || error);
         throw error;
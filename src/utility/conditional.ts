@@ -0,0 +1,44 @@
+import { Request, Response } from 'express';
+import { createHash } from 'crypto';
+
+// strong validator for a response payload - identical content always produces the same ETag
+export const contentETag = (content: string | object) : string => {
+    const serialized = typeof content === 'string' ? content : JSON.stringify(content);
+    return `"${createHash('sha1').update(serialized).digest('base64url')}"`;
+}
+
+// set the cache validators on a response - clients may keep a private copy, but must always revalidate
+export const setConditionalHeaders = (res: Response, etag?: string, lastUpdatedInSeconds?: number) => {
+    if (etag) {
+        res.set('ETag', etag);
+    }
+    if (lastUpdatedInSeconds) {
+        res.set('Last-Modified', new Date(lastUpdatedInSeconds * 1000).toUTCString());
+    }
+    res.set('Cache-Control', 'private, no-cache');
+}
+
+// true if the client's cached copy is still current - per RFC 9110, If-None-Match takes precedence over If-Modified-Since
+//      so with no etag available yet (e.g. before loading the data), only an If-Modified-Since request can be answered
+export const isNotModified = (req: Request, etag?: string, lastUpdatedInSeconds?: number) : boolean => {
+    const ifNoneMatch = req.get('If-None-Match');
+    if (ifNoneMatch) {
+        if (!etag) {
+            return false;
+        }
+        const currentTag = etag.replace(/^W\//, '');
+        return ifNoneMatch.split(',')
+            .map(tag => tag.trim().replace(/^W\//, ''))
+            .some(tag => tag === '*' || tag === currentTag);
+    }
+
+    const ifModifiedSince = req.get('If-Modified-Since');
+    if (ifModifiedSince && lastUpdatedInSeconds) {
+        const sinceInMs = Date.parse(ifModifiedSince);
+        if (!isNaN(sinceInMs)) {
+            // HTTP dates only have second granularity - same as our lastUpdated timestamps
+            return lastUpdatedInSeconds * 1000 <= sinceInMs;
+        }
+    }
+    return false;
+}
@@ -3,6 +3,7 @@ import axios from 'axios';
 import { Request, Response } from 'express';
 import { header_X_Signed_Identity, signedAuthHeader } from '../auth';
 import { usFormatter } from './log';
+import { ServerTimingMetric, timed } from './timing';
 
 export const api_root_endpoint : string = '/api';
 
@@ -18,6 +19,8 @@ export const HTTP_SUCCESS = 200;
 export const HTTP_SUCCESS_ACCEPTED = 202;
 export const HTTP_SUCCESS_NO_CONTENT = 204;
 
+export const HTTP_NOT_MODIFIED = 304;
+
 export const HTTP_FAILURE_BAD_REQUEST_INPUT = 400;
 export const HTTP_FAILURE_UNAUTHORIZED = 401;
 export const HTTP_FAILURE_NO_ACCESS = 403;
@@ -86,6 +89,14 @@ export async function localSelfDispatch<T>(
     email: string, originalIdentityHeader: string, initialRequestOrSelfEndpoint: Request | string,
     path: string, httpVerb: string, bodyContent?: any, timeoutMs: number = 0, throwOnTimeout: boolean = true,
     extraHeaders = {}): Promise<T> {
+    return timed(ServerTimingMetric.SelfDispatch, () => selfDispatch<T>(
+        email, originalIdentityHeader, initialRequestOrSelfEndpoint, path, httpVerb, bodyContent, timeoutMs, throwOnTimeout, extraHeaders));
+}
+
+async function selfDispatch<T>(
+    email: string, originalIdentityHeader: string, initialRequestOrSelfEndpoint: Request | string,
+    path: string, httpVerb: string, bodyContent: any, timeoutMs: number, throwOnTimeout: boolean,
+    extraHeaders: {}): Promise<T> {
 
     if (!originalIdentityHeader) {
         const identityHeader = await signedAuthHeader(email);
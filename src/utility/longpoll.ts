@@ -0,0 +1,65 @@
+import { Request } from 'express';
+import { secondsBeforeRestRequestMaximumTimeout } from './dispatch';
+
+// a long-poll must be answered well before the request itself times out - leave headroom for the final read
+export const secondsMaximumLongPollWait = secondsBeforeRestRequestMaximumTimeout - 5;
+
+// how often the stored state is re-read while a long-poll is held open
+export const millisecondsLongPollInterval = 500;
+
+export interface LongPollRequest {
+    states: string[];
+    timeoutInSeconds: number;
+}
+
+const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+// parse ?waitFor=idle|error&timeout=20 - returns undefined if the caller isn't long-polling
+//      states are compared case-insensitively; timeout is capped so the request can't outlive the Lambda
+export const getLongPollRequest = (req: Request) : LongPollRequest | undefined => {
+    const waitFor = req.query?.waitFor;
+    if (typeof waitFor !== 'string' || !waitFor) {
+        return undefined;
+    }
+
+    const states = waitFor.split(/[|,]/)
+        .map(state => state.trim().toLowerCase())
+        .filter(state => state);
+    if (states.length === 0) {
+        return undefined;
+    }
+
+    const requestedTimeout = typeof req.query.timeout === 'string' ? parseInt(req.query.timeout) : NaN;
+    const timeoutInSeconds = isNaN(requestedTimeout) || requestedTimeout < 0 ?
+        secondsMaximumLongPollWait :
+        Math.min(requestedTimeout, secondsMaximumLongPollWait);
+
+    return { states, timeoutInSeconds };
+}
+
+// a value may be in several states at once (e.g. a project can be both 'idle' and 'synchronized')
+export const isLongPollSatisfied = (longPoll: LongPollRequest, state: string | string[] | undefined) : boolean => {
+    if (state === undefined) {
+        return false;
+    }
+    const states = Array.isArray(state) ? state : [state];
+    return states.some(current => longPoll.states.includes(current.toLowerCase()));
+}
+
+// re-load a value until its state is one of the requested states, or the long-poll times out
+//      always returns the most recently loaded value - the caller reports whatever state it ended in
+export const waitForState = async <T>(
+    longPoll: LongPollRequest,
+    load: () => Promise<T>,
+    stateOf: (value: T) => string | string[] | undefined,
+    initialValue?: T) : Promise<T> => {
+
+    const deadline = Date.now() + longPoll.timeoutInSeconds * 1000;
+
+    let value = initialValue !== undefined ? initialValue : await load();
+    while (!isLongPollSatisfied(longPoll, stateOf(value)) && Date.now() + millisecondsLongPollInterval < deadline) {
+        await delay(millisecondsLongPollInterval);
+        value = await load();
+    }
+    return value;
+}
@@ -0,0 +1,85 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import { performance } from 'perf_hooks';
+import { Request, Response, NextFunction } from 'express';
+
+// metrics reported in each response's Server-Timing header - https://www.w3.org/TR/server-timing/
+export enum ServerTimingMetric {
+    Auth = 'auth',
+    DatabaseRead = 'db-read',
+    DatabaseWrite = 'db-write',
+    GitHub = 'github',
+    OpenAI = 'openai',
+    SelfDispatch = 'self',
+}
+
+// the whole request - clients compare it to their own timing to tell network from service time
+export const serverTimingTotal = 'total';
+
+interface TimingMetric {
+    milliseconds: number;
+    count: number;
+}
+
+interface RequestTimings {
+    start: number;
+    metrics: Map<string, TimingMetric>;
+}
+
+// per-request timings - async context follows the request through every await, so storage, GitHub and OpenAI
+//      calls are attributed to the request that made them without threading it through each call
+const requestTimings = new AsyncLocalStorage<RequestTimings>();
+
+export const addServerTiming = (metric: ServerTimingMetric, milliseconds: number) => {
+    const timings = requestTimings.getStore();
+    if (!timings) {
+        return;
+    }
+    const existing = timings.metrics.get(metric);
+    if (existing) {
+        existing.milliseconds += milliseconds;
+        existing.count++;
+    } else {
+        timings.metrics.set(metric, { milliseconds, count: 1 });
+    }
+}
+
+// time an operation towards a metric - concurrent operations (e.g. Promise.all) each count, so a metric can
+//      exceed the total
+export async function timed<T>(metric: ServerTimingMetric, operation: () => Promise<T>): Promise<T> {
+    if (!requestTimings.getStore()) {
+        return operation();
+    }
+    const start = performance.now();
+    try {
+        return await operation();
+    } finally {
+        addServerTiming(metric, performance.now() - start);
+    }
+}
+
+export const formatServerTiming = (timings: RequestTimings) : string => {
+    const entries = Array.from(timings.metrics.entries())
+        .map(([name, metric]) => `${name};dur=${metric.milliseconds.toFixed(1)};desc="${metric.count} call${metric.count === 1 ? '' : 's'}"`);
+    entries.push(`${serverTimingTotal};dur=${(performance.now() - timings.start).toFixed(1)}`);
+    return entries.join(', ');
+}
+
+// express middleware - starts the request's timings, and adds the Server-Timing header as the response's headers
+//      are written (the last moment the breakdown can still be sent)
+export const serverTiming = (req: Request, res: Response, next: NextFunction) => {
+    const timings : RequestTimings = { start: performance.now(), metrics: new Map() };
+
+    const writeHead = res.writeHead;
+    res.writeHead = function (this: Response, ...args: any[]) {
+        if (!this.headersSent) {
+            this.setHeader('Server-Timing', formatServerTiming(timings));
+        }
+        return (writeHead as (...args: any[]) => Response).apply(this, args);
+    } as typeof res.writeHead;
+
+    if (process.env.TRACE_LEVEL) {
+        res.on('finish', () => console.log(`[Timing] ${req.method} ${req.originalUrl} ${res.statusCode} - ${formatServerTiming(timings)}`));
+    }
+
+    requestTimings.run(timings, next);
+}
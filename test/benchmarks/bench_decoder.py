@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+# Determine the test directory's path.
+test_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the test directory to sys.path.
+sys.path.append(test_dir)
+
+import requests  # noqa: E402
+
+from response_decoder import decode_response, json_backend  # noqa: E402
+
+
+def build_search_response(item_count):
+    # a synthetic /api/search/projects/status response, wrapped in the Lambda function URL envelope
+    items = [{
+        "_userName": f"user{i}@polytest.ai",
+        "_ownerName": f"org{i % 50}",
+        "_projectName": f"project{i}",
+        "status": "Synchronized" if i % 3 else "Out of Date",
+        "synchronized": bool(i % 3),
+        "activelyUpdating": not bool(i % 3),
+        "lastUpdated": 1713800000 + i,
+        "details": "x" * 200,
+        "resourcesState": {"projectsource": "idle", "aispec": "idle", "blueprint": "idle"},
+    } for i in range(item_count)]
+
+    envelope = {"statusCode": 200, "headers": {"content-type": "application/json"}, "body": json.dumps(items)}
+
+    response = requests.models.Response()
+    response.status_code = 200
+    response.headers["content-type"] = "application/json"
+    response._content = json.dumps(envelope).encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+def legacy_decode(response):
+    # the pre-decoder unwrapping pattern used by sara_rest_cli and the tests - parses the document up to 5 times
+    return response.json() if 'body' not in response.json() else json.loads(response.json()['body']) if (
+        len(response.json()['body']) > 0 and response.json()['body'][0] in ['{', '[']) else response.json()['body']
+
+
+def clone_response(response):
+    clone = requests.models.Response()
+    clone.status_code = response.status_code
+    clone.headers = response.headers
+    clone._content = response._content
+    clone.encoding = response.encoding
+    return clone
+
+
+def time_decoder(name, decoder, response_factory, runs):
+    samples = []
+    for _ in range(runs):
+        # a fresh response each run, so memoization on the response doesn't skew results
+        response = response_factory()
+        start = time.perf_counter()
+        decoder(response)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {"name": name, "min": samples[0], "median": samples[len(samples) // 2], "max": samples[-1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark for single-pass response decoding of large search responses.")
+    parser.add_argument("--items", type=int, default=20000, help="Number of projects in the synthetic search response")
+    parser.add_argument("--runs", type=int, default=10, help="Number of timed runs per decoder")
+    args = parser.parse_args()
+
+    template = build_search_response(args.items)
+    payload_mb = len(template.content) / (1024 * 1024)
+
+    def response_factory():
+        return clone_response(template)
+
+    print(f"Payload: {args.items} items, {payload_mb:.1f} MB - JSON backend: {json_backend}")
+
+    legacy = time_decoder("legacy (response.json() x N)", legacy_decode, response_factory, args.runs)
+    single = time_decoder("decode_response (single pass)", decode_response, response_factory, args.runs)
+
+    for result in [legacy, single]:
+        print(f"{result['name']:<32} min {result['min'] * 1000:8.1f} ms   median {result['median'] * 1000:8.1f} ms   max {result['max'] * 1000:8.1f} ms")
+    print(f"Speedup (median): {legacy['median'] / single['median']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
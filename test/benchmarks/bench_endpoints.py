@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import statistics
+
+# Determine the test directory's path.
+test_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the test directory to sys.path.
+sys.path.append(test_dir)
+
+from constants import LOCAL_URL, EMAIL, ORG, PUBLIC_PROJECT, PUBLIC_PROJECT_NAME, all_stages  # noqa: E402
+from http_client import client  # noqa: E402
+from utils import get_signed_headers  # noqa: E402
+from response_decoder import decode_response  # noqa: E402
+
+
+DEFAULT_WARMUP_RUNS = 2
+DEFAULT_RUNS = 10
+
+# a benchmark regresses when its median is this much slower than the baseline median...
+DEFAULT_REGRESSION_THRESHOLD = 0.20
+# ...and at least this many milliseconds slower - so noise on fast endpoints doesn't fail the gate
+DEFAULT_MINIMUM_REGRESSION_MS = 10
+
+# must match the stage names in src/generators - each is processed directly with generator/process
+GENERATOR_STAGES = {
+    "projectsource": ["Static Default", "Retrieve Source Sync Points", "File Paths Scan", "Full Source Code Import"],
+    "blueprint": ["Static Default", "File Import", "Source Language Scan", "File Scan", "Sampled Code", "Building Blueprint"],
+    "aispec": ["Static Default", "Identifying Files for Summarization"],
+}
+
+# benchmark groups - generator stages regenerate project data (and call OpenAI), so they only run when asked for
+DEFAULT_GROUPS = ["account", "status", "resource", "projects", "github"]
+ALL_GROUPS = DEFAULT_GROUPS + ["generators"]
+
+
+def build_benchmarks(org, project, repo, groups):
+    # each benchmark as name -> (group, verb, path, query parameters, JSON body)
+    project_path = f"/api/user_project/{org}/{project}"
+    benchmarks = {
+        "account": ("account", "GET", f"/api/user/{org}/account", None, None),
+        "status_readonly": ("status", "GET", f"{project_path}/status", {"readOnly": ""}, None),
+        **{f"resource_{resource}": ("resource", "GET", f"{project_path}/data/{resource}", None, None)
+           for resource in GENERATOR_STAGES},
+        "projects": ("projects", "GET", f"/api/user_project/{org}/projects", None, None),
+        "github_file": ("github", "GET", f"/api/user/{org}/connectors/github/file",
+                        {"uri": f"{repo}/blob/master/README.md"}, None),
+        "github_folders": ("github", "GET", f"/api/user/{org}/connectors/github/folders", {"uri": repo}, None),
+        "github_fullsource": ("github", "GET", f"/api/user/{org}/connectors/github/fullsource", {"uri": repo}, None),
+        **{f"generator_{resource}_{stage.lower().replace(' ', '_')}":
+           ("generators", "POST", f"{project_path}/data/{resource}/generator/process", None, {"stage": stage})
+           for resource, stages in GENERATOR_STAGES.items() for stage in stages},
+    }
+    return {name: benchmark for name, benchmark in benchmarks.items() if benchmark[0] in groups}
+
+
+def time_request(base_url, email, verb, path, params, body):
+    # seconds for a complete response (including the body download) and the status code
+    start = time.perf_counter()
+    response = client.request(verb, base_url + path, headers=get_signed_headers(email), params=params, json=body)
+    response.content
+    return time.perf_counter() - start, response.status_code
+
+
+def summarize(samples):
+    # statistical summary of a benchmark's samples - in milliseconds
+    milliseconds = sorted(sample * 1000 for sample in samples)
+    return {
+        "runs": len(milliseconds),
+        "minMs": milliseconds[0],
+        "medianMs": statistics.median(milliseconds),
+        "meanMs": statistics.fmean(milliseconds),
+        "stdevMs": statistics.stdev(milliseconds) if len(milliseconds) > 1 else 0.0,
+        "p90Ms": milliseconds[min(len(milliseconds) - 1, -(-len(milliseconds) * 9 // 10) - 1)],
+        "maxMs": milliseconds[-1],
+    }
+
+
+def run_benchmark(base_url, email, benchmark, warmup_runs, runs):
+    # warmup runs prime the Lambda, caches and connections - only the timed runs are summarized
+    _, verb, path, params, body = benchmark
+    for _ in range(warmup_runs):
+        time_request(base_url, email, verb, path, params, body)
+
+    samples = []
+    failures = {}
+    for _ in range(runs):
+        seconds, status_code = time_request(base_url, email, verb, path, params, body)
+        if status_code >= 400:
+            failures[str(status_code)] = failures.get(str(status_code), 0) + 1
+        samples.append(seconds)
+
+    result = summarize(samples)
+    result["samplesMs"] = [sample * 1000 for sample in samples]
+    if failures:
+        result["failures"] = failures
+    return result
+
+
+def service_version(base_url):
+    try:
+        response = client.get(f"{base_url}/api/status", timeout=(5, 30))
+        return decode_response(response).get("version") if response.status_code == 200 else None
+    except Exception:
+        return None
+
+
+def compare_results(baseline, results, threshold=DEFAULT_REGRESSION_THRESHOLD, minimum_ms=DEFAULT_MINIMUM_REGRESSION_MS,
+                    expected=None):
+    # returns (name, baseline median, current median, change) for each benchmark in both, and the regressions as
+    #   {name: reason} - failed requests count (a fast 500 isn't an improvement), as do benchmarks missing from either
+    #   run; 'expected' is the baseline benchmarks this run selected (default: all of them)
+    rows = []
+    regressions = {}
+    for name, result in results.items():
+        if "failures" in result:
+            regressions[name] = f"{sum(result['failures'].values())} failed requests ({', '.join(result['failures'])})"
+        if name not in baseline:
+            regressions.setdefault(name, "not in the baseline - save a new one")
+            continue
+        before = baseline[name]["medianMs"]
+        after = result["medianMs"]
+        change = (after - before) / before if before > 0 else 0.0
+        rows.append((name, before, after, change))
+        if change > threshold and after - before >= minimum_ms:
+            regressions.setdefault(name, f"{change:+.1%} ({after - before:+.1f}ms)")
+
+    for name in baseline:
+        if name not in results and (expected is None or name in expected):
+            regressions[name] = "in the baseline, but not run"
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the service's hot endpoints - save a baseline, or compare against one and flag regressions.")
+    parser.add_argument("--url", default=None, help=f"Service URL (default: {LOCAL_URL})")
+    parser.add_argument("--stage", choices=list(all_stages.keys()), default=None, help="Target a stage instead of --url")
+    parser.add_argument("--email", default=EMAIL, help=f"User to benchmark as (default: {EMAIL})")
+    parser.add_argument("--org", default=ORG, help=f"Org (default: {ORG})")
+    parser.add_argument("--project", default=PUBLIC_PROJECT_NAME, help=f"An existing, synchronized project (default: {PUBLIC_PROJECT_NAME})")
+    parser.add_argument("--repo", default=PUBLIC_PROJECT, help=f"GitHub repository for the connector benchmarks (default: {PUBLIC_PROJECT})")
+    parser.add_argument("--groups", default=",".join(DEFAULT_GROUPS), help=f"Benchmark groups to run (default: {','.join(DEFAULT_GROUPS)}) - from {', '.join(ALL_GROUPS)}")
+    parser.add_argument("--only", default=None, help="Comma separated benchmark names to run")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP_RUNS, help=f"Untimed runs before each benchmark (default: {DEFAULT_WARMUP_RUNS})")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"Timed runs per benchmark (default: {DEFAULT_RUNS})")
+    parser.add_argument("--save", default=None, help="Write the results as a baseline JSON file")
+    parser.add_argument("--compare", default=None, help="Compare against a baseline JSON file - exits non-zero on a regression")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD, help=f"Median slowdown that counts as a regression (default: {DEFAULT_REGRESSION_THRESHOLD * 100:.0f}%%)")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MINIMUM_REGRESSION_MS, help=f"Smallest slowdown in ms that counts as a regression (default: {DEFAULT_MINIMUM_REGRESSION_MS})")
+    parser.add_argument("--list", action='store_true', help="List the benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+
+    base_url = all_stages[args.stage] if args.stage else args.url if args.url else LOCAL_URL
+    groups = args.groups.split(",")
+    unknown = [group for group in groups if group not in ALL_GROUPS]
+    if unknown:
+        parser.error(f"Unknown groups {', '.join(unknown)} - choose from {', '.join(ALL_GROUPS)}")
+
+    benchmarks = build_benchmarks(args.org, args.project, args.repo, ALL_GROUPS if args.only else groups)
+    if args.only:
+        benchmarks = {name: benchmark for name, benchmark in benchmarks.items() if name in args.only.split(",")}
+
+    if args.list:
+        for name, (group, verb, path, _, _) in benchmarks.items():
+            print(f"{name:<48} {group:<12} {verb} {path}")
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+    version = service_version(base_url)
+    print(f"Benchmarking {len(benchmarks)} endpoints on {base_url}{f' (version {version})' if version else ''} - "
+          f"{args.warmup} warmup and {args.runs} timed runs each")
+    print(f"\n{'Benchmark':<48} {'Median':>9} {'Mean':>9} {'Stdev':>9} {'p90':>9} {'Min':>9} {'Max':>9}   (ms)")
+
+    results = {}
+    for name, benchmark in benchmarks.items():
+        result = run_benchmark(base_url, args.email, benchmark, args.warmup, args.runs)
+        result["group"] = benchmark[0]
+        results[name] = result
+        failed = f"   {sum(result['failures'].values())} failed ({', '.join(result['failures'])})" if "failures" in result else ""
+        print(f"{name:<48} {result['medianMs']:9.1f} {result['meanMs']:9.1f} {result['stdevMs']:9.1f} "
+              f"{result['p90Ms']:9.1f} {result['minMs']:9.1f} {result['maxMs']:9.1f}{failed}", flush=True)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "url": base_url,
+                "version": version,
+                "date": datetime.datetime.now().isoformat(),
+                "warmupRuns": args.warmup,
+                "runs": args.runs,
+                "benchmarks": results,
+            }, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+
+    if baseline is not None:
+        # the baseline benchmarks this run should have measured - baselines saved before groups were recorded
+        #   are expected in full
+        expected = [name for name, result in baseline["benchmarks"].items()
+                    if (name in args.only.split(",") if args.only else result.get("group", groups[0]) in groups)]
+        rows, regressions = compare_results(baseline["benchmarks"], results, args.threshold, args.min_delta, expected)
+        print(f"\nCompared to {args.compare} (version {baseline.get('version') or 'unknown'}, {baseline.get('date', 'unknown date')}):")
+        print(f"{'Benchmark':<48} {'Baseline':>9} {'Current':>9} {'Change':>8}")
+        for name, before, after, change in rows:
+            print(f"{name:<48} {before:9.1f} {after:9.1f} {change:+7.1%}{'   REGRESSION' if name in regressions else ''}")
+        if regressions:
+            print(f"\n{len(regressions)} regressions (slowdowns beyond {args.threshold:.0%} and {args.min_delta:g}ms, failures, "
+                  f"or missing benchmarks):")
+            for name, reason in regressions.items():
+                print(f"    {name}: {reason}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
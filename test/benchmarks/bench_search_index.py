@@ -0,0 +1,186 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# Determine the repository root path.
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Append the scripts directory to sys.path.
+sys.path.append(os.path.join(root_dir, "scripts"))
+
+from search_index import (  # noqa: E402
+    search_index_attributes, search_index_definitions,
+    SEARCH_TYPE_INDEX_NAME, SEARCH_OWNER_TYPE_INDEX_NAME,
+)
+
+DEFAULT_ENDPOINT = os.environ.get("DYNAMODB_ENDPOINT", "http://localhost:8000")
+DEFAULT_TABLE = "Boost.AnalysisDataStore.bench"
+
+# records written per project - mirrors what onboarding stores (searchable records plus larger resources)
+PROJECT_RECORDS = [
+    ("blob", "", "project"),
+    ("blob", "", "status"),
+    ("blob", "", "data_references"),
+    ("github", "/projectsource", "generator"),
+    ("github", "/aispec", "generator"),
+    ("github", "/blueprint", "generator"),
+    ("github", "resource/blueprint", "status"),
+    ("github", "", "blueprint"),
+    ("github", "", "aispec"),
+    ("github", "", "projectsource:part-1"),
+]
+
+
+def create_table(dynamodb, table_name):
+    try:
+        dynamodb.delete_table(TableName=table_name)
+        dynamodb.get_waiter("table_not_exists").wait(TableName=table_name)
+    except dynamodb.exceptions.ResourceNotFoundException:
+        pass
+
+    attribute_definitions, indexes = search_index_definitions()
+    dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[
+            {"AttributeName": "projectPath", "KeyType": "HASH"},
+            {"AttributeName": "dataPath", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=attribute_definitions + [{"AttributeName": "dataPath", "AttributeType": "S"}],
+        GlobalSecondaryIndexes=indexes,
+        BillingMode="PAY_PER_REQUEST")
+    dynamodb.get_waiter("table_exists").wait(TableName=table_name)
+
+
+def build_items(item_count, users, orgs):
+    items = []
+    project = 0
+    while len(items) < item_count:
+        user = f"user{project % users}@polytest.ai"
+        org = f"org{random.randrange(orgs)}"
+        for source_type, resource_path, analysis_type in PROJECT_RECORDS:
+            project_path = f"{user}/{source_type}/{org}/project{project}"
+            data_path = f"{resource_path}/{analysis_type}"
+            document = {"status": "idle", "lastUpdated": 1713800000 + project}
+            if analysis_type in ["blueprint", "aispec", "projectsource:part-1"]:
+                document["data"] = "x" * 2000
+            item = {
+                "projectPath": {"S": project_path},
+                "dataPath": {"S": data_path},
+                "data": {"S": json.dumps(document)},
+            }
+            item.update({name: {"S": value} for name, value in search_index_attributes(project_path, data_path).items()})
+            items.append(item)
+        project += 1
+    return items[:item_count]
+
+
+def seed(dynamodb, table_name, items, workers=16):
+    batches = [items[i:i + 25] for i in range(0, len(items), 25)]
+
+    def write_batch(batch):
+        request = {table_name: [{"PutRequest": {"Item": item}} for item in batch]}
+        while request:
+            response = dynamodb.batch_write_item(RequestItems=request)
+            request = response.get("UnprocessedItems") or None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(write_batch, batches))
+
+
+def run_search(dynamodb, table_name, operation, params):
+    # read every page of a search - returns (items matched, items read by DynamoDB)
+    matched = 0
+    read = 0
+    params = dict(params, TableName=table_name)
+    call = dynamodb.scan if operation == "scan" else dynamodb.query
+    while True:
+        response = call(**params)
+        matched += response["Count"]
+        read += response["ScannedCount"]
+        if "LastEvaluatedKey" not in response:
+            return matched, read
+        params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def search_cases(user, org):
+    # each case as the service's storage layer issues it - the legacy Scan and the indexed Query
+    return [
+        ("status of one user", {
+            "FilterExpression": "begins_with(projectPath, :emailVal) AND contains(projectPath, :sourceTypeVal) AND dataPath = :dataPathTarget",
+            "ExpressionAttributeValues": {":emailVal": {"S": f"{user}/"}, ":sourceTypeVal": {"S": "/blob/"}, ":dataPathTarget": {"S": "/status"}},
+        }, {
+            "IndexName": SEARCH_TYPE_INDEX_NAME,
+            "KeyConditionExpression": "searchType = :searchTypeVal AND begins_with(projectPath, :emailVal)",
+            "FilterExpression": "dataPath = :dataPathTarget",
+            "ExpressionAttributeValues": {":searchTypeVal": {"S": "status"}, ":emailVal": {"S": f"{user}/blob/"}, ":dataPathTarget": {"S": "/status"}},
+        }),
+        ("projects of one org", {
+            "FilterExpression": "contains(projectPath, :sourceTypeVal) AND contains(projectPath, :ownerVal) AND dataPath = :dataPathTarget",
+            "ExpressionAttributeValues": {":sourceTypeVal": {"S": "/blob/"}, ":ownerVal": {"S": f"/{org}/"}, ":dataPathTarget": {"S": "/project"}},
+        }, {
+            "IndexName": SEARCH_OWNER_TYPE_INDEX_NAME,
+            "KeyConditionExpression": "searchOwnerType = :searchOwnerTypeVal",
+            "FilterExpression": "contains(projectPath, :sourceTypeVal) AND dataPath = :dataPathTarget",
+            "ExpressionAttributeValues": {":searchOwnerTypeVal": {"S": f"{org}#project"}, ":sourceTypeVal": {"S": "/blob/"}, ":dataPathTarget": {"S": "/project"}},
+        }),
+        ("all generators", {
+            "FilterExpression": "contains(projectPath, :sourceTypeVal) AND contains(dataPath, :dataPathTarget)",
+            "ExpressionAttributeValues": {":sourceTypeVal": {"S": "/github/"}, ":dataPathTarget": {"S": "/generator"}},
+        }, {
+            "IndexName": SEARCH_TYPE_INDEX_NAME,
+            "KeyConditionExpression": "searchType = :searchTypeVal",
+            "FilterExpression": "contains(projectPath, :sourceTypeVal) AND contains(dataPath, :dataPathTarget)",
+            "ExpressionAttributeValues": {":searchTypeVal": {"S": "generator"}, ":sourceTypeVal": {"S": "/github/"}, ":dataPathTarget": {"S": "/generator"}},
+        }),
+    ]
+
+
+def time_search(dynamodb, table_name, operation, params, runs):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_search(dynamodb, table_name, operation, params)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-table Scan against the search index Query paths on DynamoDB Local.")
+    parser.add_argument("--endpoint-url", default=DEFAULT_ENDPOINT, help=f"DynamoDB endpoint (default: {DEFAULT_ENDPOINT})")
+    parser.add_argument("--table", default=DEFAULT_TABLE, help=f"Benchmark table - recreated when seeding (default: {DEFAULT_TABLE})")
+    parser.add_argument("--items", type=int, default=100000, help="Number of records to seed")
+    parser.add_argument("--users", type=int, default=500, help="Number of distinct users")
+    parser.add_argument("--orgs", type=int, default=200, help="Number of distinct orgs")
+    parser.add_argument("--runs", type=int, default=5, help="Number of timed runs per search")
+    parser.add_argument("--skip-seed", action='store_true', help="Reuse an already seeded table")
+    args = parser.parse_args()
+
+    import boto3
+
+    dynamodb = boto3.client("dynamodb", region_name="us-west-2", endpoint_url=args.endpoint_url,
+                            aws_access_key_id="local", aws_secret_access_key="local")
+
+    if not args.skip_seed:
+        random.seed(42)
+        start = time.perf_counter()
+        create_table(dynamodb, args.table)
+        seed(dynamodb, args.table, build_items(args.items, args.users, args.orgs))
+        print(f"Seeded {args.items} records in {time.perf_counter() - start:.1f} seconds")
+
+    print(f"{'Search':<22} {'Scan':>10} {'Query':>10} {'Speedup':>8}   {'Matched':>8} {'Read (scan)':>12} {'Read (query)':>13}")
+    for name, scan_params, query_params in search_cases("user7@polytest.ai", "org7"):
+        scan_seconds, (scan_matched, scan_read) = time_search(dynamodb, args.table, "scan", scan_params, args.runs)
+        query_seconds, (query_matched, query_read) = time_search(dynamodb, args.table, "query", query_params, args.runs)
+        if scan_matched != query_matched:
+            print(f"  WARNING: {name} - Scan matched {scan_matched} but Query matched {query_matched}")
+        print(f"{name:<22} {scan_seconds * 1000:8.1f}ms {query_seconds * 1000:8.1f}ms {scan_seconds / query_seconds:7.1f}x"
+              f"   {query_matched:>8} {scan_read:>12} {query_read:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Determine the test directory's path.
+test_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the test directory to sys.path.
+sys.path.append(test_dir)
+
+from constants import LOCAL_URL, LOCAL_ADMIN_EMAIL, EMAIL, TEST_ORG, TEST_PROJECT_NAME, all_stages  # noqa: E402
+from http_client import SaraHttpClient  # noqa: E402
+from utils import get_signed_headers  # noqa: E402
+from latency_histogram import LatencyHistogram, DEFAULT_PERCENTILES  # noqa: E402
+
+
+# each scenario as (verb, path, query parameters, JSON body) - {email}, {org}, {project} and {resource} are filled
+#   from the user/project pools; the read scenarios are safe against any stage, generator_process and discovery
+#   do real work (and cost) on the service, so they're only run when named in --mix
+SCENARIOS = {
+    "status": ("GET", "/api/user_project/{org}/{project}/status", None, None),
+    "resource": ("GET", "/api/user_project/{org}/{project}/data/{resource}", None, None),
+    "resource_status": ("GET", "/api/user_project/{org}/{project}/data/{resource}/status", None, None),
+    "search": ("GET", "/api/search/projects/status", {"user": "{email}", "limit": "100"}, None),
+    "projects": ("GET", "/api/user_project/{org}/projects", None, None),
+    "generator_status": ("GET", "/api/user_project/{org}/{project}/data/{resource}/generator", None, None),
+    "generator_process": ("POST", "/api/user_project/{org}/{project}/data/{resource}/generator/process", None, {}),
+    "discovery_status": ("GET", "/api/user_project/{org}/{project}/discovery", None, None),
+    "discovery": ("POST", "/api/user_project/{org}/{project}/discovery", None, {}),
+}
+
+# scenarios the service only serves to admins - signed as --admin-email, still searching for the pool user
+ADMIN_SCENARIOS = ["search"]
+
+DEFAULT_MIX = "status=50,resource=20,search=15,generator_status=10,discovery_status=5"
+
+DEFAULT_RESOURCES = ["blueprint", "aispec", "projectsource"]
+
+DEFAULT_DURATION_SECONDS = 30
+DEFAULT_WARMUP_SECONDS = 5
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+def parse_mix(mix):
+    # "status=50,search=10" - weights are relative, so they needn't add up to 100
+    weights = {}
+    for entry in mix.split(","):
+        name, _, weight = entry.strip().partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name} - choose from {', '.join(SCENARIOS)}")
+        weights[name] = float(weight) if weight else 1.0
+    if not any(weight > 0 for weight in weights.values()):
+        raise ValueError("The scenario mix needs at least one positive weight")
+    return weights
+
+
+def load_targets(targets_file=None, users=None, projects=None):
+    # (email, org, project) targets - a file of "email org/project" lines (or a JSON list of {email, org, project}),
+    #   otherwise every user paired with every project
+    if targets_file is not None:
+        with open(targets_file, "r") as f:
+            content = f.read()
+        if content.lstrip().startswith("["):
+            return [(entry["email"], entry["org"], entry["project"]) for entry in json.loads(content)]
+        targets = []
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            email, org_project = line.split()
+            org, project = org_project.split("/", 1)
+            targets.append((email, org, project))
+        return targets
+
+    users = users if users else [EMAIL]
+    projects = projects if projects else [f"{TEST_ORG}/{TEST_PROJECT_NAME}"]
+    return [(email, *project.split("/", 1)) for email in users for project in projects]
+
+
+class ScenarioStats:
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.status_codes = {}
+        self.errors = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds, status_code, ok):
+        self.histogram.record(seconds)
+        with self._lock:
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+            if not ok:
+                self.errors += 1
+
+    def record_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+
+class LoadTest:
+    # drives a weighted mix of scenarios against the service, either open-loop at a target request rate (--rps) or
+    #   closed-loop with a fixed number of concurrent users (--concurrency)
+    #   open-loop latency is measured from when each request was scheduled to start, not when a worker got to it - so
+    #   a saturated service shows up as queueing in the tail percentiles instead of quietly lowering the request rate
+
+    def __init__(self, base_url, weights, targets, resources=None, seed=None, timeout=60, admin_email=LOCAL_ADMIN_EMAIL):
+        self.base_url = base_url.rstrip("/")
+        self.admin_email = admin_email
+        self.scenarios = list(weights.keys())
+        self.weights = list(weights.values())
+        self.targets = targets
+        self.resources = resources if resources else DEFAULT_RESOURCES
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.timeout = timeout
+        self.stats = {scenario: ScenarioStats() for scenario in self.scenarios}
+        self.http = None
+
+    def _next_request(self):
+        with self.random_lock:
+            scenario = self.random.choices(self.scenarios, self.weights)[0]
+            email, org, project = self.random.choice(self.targets)
+            resource = self.random.choice(self.resources)
+        verb, path, params, body = SCENARIOS[scenario]
+        values = {"email": email, "org": org, "project": project, "resource": resource}
+        url = self.base_url + path.format(**values)
+        params = {name: value.format(**values) for name, value in params.items()} if params else None
+        signer = self.admin_email if scenario in ADMIN_SCENARIOS else email
+        return scenario, signer, verb, url, params, body
+
+    def _send(self, request, scheduled_at, record):
+        scenario, email, verb, url, params, body = request
+        try:
+            response = self.http.request(verb, url, headers=get_signed_headers(email), params=params, json=body,
+                                         timeout=self.timeout)
+            # read the whole body - a response isn't done until it's downloaded
+            response.content
+            status_code, ok = response.status_code, response.status_code < 400
+        except Exception as e:
+            status_code, ok = type(e).__name__, False
+        if record:
+            self.stats[scenario].record(time.perf_counter() - scheduled_at, status_code, ok)
+
+    def run_open_loop(self, rps, duration, warmup=0, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        # requests are scheduled at a fixed rate - when every worker is busy they queue (latency includes the wait),
+        #   and once the queue is as deep as the worker pool new requests are dropped and counted
+        self.http = SaraHttpClient(pool_maxsize=max_concurrency)
+        interval = 1.0 / rps
+        pending = [0]
+        pending_lock = threading.Lock()
+
+        def send(request, scheduled_at, record):
+            try:
+                self._send(request, scheduled_at, record)
+            finally:
+                with pending_lock:
+                    pending[0] -= 1
+
+        start = time.perf_counter()
+        measure_from = start + warmup
+        end = measure_from + duration
+        sent = 0
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            while True:
+                scheduled_at = start + sent * interval
+                if scheduled_at >= end:
+                    break
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                sent += 1
+
+                request = self._next_request()
+                record = scheduled_at >= measure_from
+                with pending_lock:
+                    saturated = pending[0] >= 2 * max_concurrency
+                    if not saturated:
+                        pending[0] += 1
+                if saturated:
+                    if record:
+                        self.stats[request[0]].record_dropped()
+                    continue
+                executor.submit(send, request, scheduled_at, record)
+        return time.perf_counter() - measure_from
+
+    def run_closed_loop(self, concurrency, duration, warmup=0):
+        # each worker sends its next request as soon as the last one completes
+        self.http = SaraHttpClient(pool_maxsize=concurrency)
+        start = time.perf_counter()
+        measure_from = start + warmup
+        end = measure_from + duration
+
+        def worker():
+            while True:
+                sent_at = time.perf_counter()
+                if sent_at >= end:
+                    return
+                self._send(self._next_request(), sent_at, sent_at >= measure_from)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(concurrency)]:
+                future.result()
+        return time.perf_counter() - measure_from
+
+    def report(self, elapsed, percentiles=DEFAULT_PERCENTILES):
+        # per-scenario (and overall) throughput, errors and latency percentiles
+        overall = ScenarioStats()
+        scenarios = {}
+        for scenario, stats in self.stats.items():
+            overall.histogram.merge(stats.histogram)
+            overall.errors += stats.errors
+            overall.dropped += stats.dropped
+            for status_code, count in stats.status_codes.items():
+                overall.status_codes[status_code] = overall.status_codes.get(status_code, 0) + count
+            scenarios[scenario] = stats
+        scenarios["all"] = overall
+
+        report = {}
+        for scenario, stats in scenarios.items():
+            count = stats.histogram.count
+            report[scenario] = {
+                **stats.histogram.summary(percentiles),
+                "requestsPerSecond": count / elapsed if elapsed > 0 else 0.0,
+                "errors": stats.errors,
+                "errorRate": stats.errors / count if count else 0.0,
+                "dropped": stats.dropped,
+                "statusCodes": {str(status_code): count for status_code, count in stats.status_codes.items()},
+            }
+        return report
+
+
+def print_report(report, elapsed, percentiles=DEFAULT_PERCENTILES):
+    percentile_columns = "".join(f"{f'p{percentile:g}':>10}" for percentile in percentiles)
+    print(f"\n{'Scenario':<18} {'Requests':>9} {'Req/s':>8} {'Errors':>8}{percentile_columns} {'Max':>10}   (latencies in ms, {elapsed:.1f} seconds measured)")
+    for scenario, summary in report.items():
+        if scenario == "all":
+            print("-" * (58 + 10 * len(percentiles)))
+        percentile_values = "".join(f"{summary[f'p{percentile:g}Ms']:10.1f}" for percentile in percentiles)
+        print(f"{scenario:<18} {summary['count']:>9} {summary['requestsPerSecond']:8.1f} {summary['errorRate'] * 100:7.1f}%"
+              f"{percentile_values} {summary['maxMs']:10.1f}")
+
+    for scenario, summary in report.items():
+        if scenario != "all" and (summary["errors"] or summary["dropped"]):
+            codes = ", ".join(f"{status_code}: {count}" for status_code, count in sorted(summary["statusCodes"].items()))
+            dropped = f" - {summary['dropped']} not sent (client saturated)" if summary["dropped"] else ""
+            print(f"  {scenario}: {codes}{dropped}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Put a weighted mix of realistic requests on the service and report throughput, errors and latency percentiles.")
+    parser.add_argument("--url", default=None, help=f"Service URL (default: {LOCAL_URL})")
+    parser.add_argument("--stage", choices=list(all_stages.keys()), default=None, help="Target a stage instead of --url")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted scenarios, e.g. status=50,search=10 (default: {DEFAULT_MIX}) - scenarios: {', '.join(SCENARIOS)}")
+    parser.add_argument("--users", default=None, help=f"Comma separated user emails (default: {EMAIL})")
+    parser.add_argument("--projects", default=None, help=f"Comma separated org/project names (default: {TEST_ORG}/{TEST_PROJECT_NAME})")
+    parser.add_argument("--admin-email", default=LOCAL_ADMIN_EMAIL, help=f"Admin user that signs the admin-only scenarios ({', '.join(ADMIN_SCENARIOS)}) (default: {LOCAL_ADMIN_EMAIL})")
+    parser.add_argument("--targets-file", default=None, help="File of 'email org/project' lines (or a JSON list of {email, org, project}) - instead of --users and --projects")
+    parser.add_argument("--resources", default=",".join(DEFAULT_RESOURCES), help="Comma separated resources for resource and generator scenarios")
+    parser.add_argument("--rps", type=float, default=None, help="Open-loop: target requests per second")
+    parser.add_argument("--concurrency", type=int, default=None, help=f"Closed-loop: concurrent users (default: {DEFAULT_CONCURRENCY} when --rps isn't set)")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY, help=f"Open-loop: most requests in flight (default: {DEFAULT_MAX_CONCURRENCY})")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_SECONDS, help=f"Seconds to measure (default: {DEFAULT_DURATION_SECONDS})")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP_SECONDS, help=f"Seconds of load before measuring (default: {DEFAULT_WARMUP_SECONDS})")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for a repeatable request sequence")
+    parser.add_argument("--report", default=None, help="Also write the report (with latency histograms) to this JSON file")
+    args = parser.parse_args()
+
+    if args.rps is not None and args.concurrency is not None:
+        parser.error("Use either --rps (open-loop) or --concurrency (closed-loop), not both")
+
+    base_url = all_stages[args.stage] if args.stage else args.url if args.url else LOCAL_URL
+    try:
+        weights = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    targets = load_targets(args.targets_file, args.users.split(",") if args.users else None,
+                           args.projects.split(",") if args.projects else None)
+
+    load_test = LoadTest(base_url, weights, targets, args.resources.split(","), args.seed, admin_email=args.admin_email)
+
+    mode = f"{args.rps:g} requests/sec" if args.rps is not None else f"{args.concurrency or DEFAULT_CONCURRENCY} concurrent users"
+    print(f"Load testing {base_url} at {mode} for {args.duration:g} seconds (after {args.warmup:g} seconds warmup) - "
+          f"{len(targets)} user/projects, mix {', '.join(f'{name}={weight:g}' for name, weight in weights.items())}")
+
+    if args.rps is not None:
+        elapsed = load_test.run_open_loop(args.rps, args.duration, args.warmup, args.max_concurrency)
+    else:
+        elapsed = load_test.run_closed_loop(args.concurrency or DEFAULT_CONCURRENCY, args.duration, args.warmup)
+
+    report = load_test.report(elapsed)
+    print_report(report, elapsed)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({
+                "url": base_url,
+                "mode": {"rps": args.rps} if args.rps is not None else {"concurrency": args.concurrency or DEFAULT_CONCURRENCY},
+                "seconds": elapsed,
+                "scenarios": report,
+                "histograms": {scenario: stats.histogram.to_dict() for scenario, stats in load_test.stats.items()},
+            }, f, indent=2)
+        print(f"\nReport written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
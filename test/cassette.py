@@ -0,0 +1,341 @@
+import io
+import os
+import sys
+import gzip
+import json
+import time
+import atexit
+import base64
+import hashlib
+import argparse
+import datetime
+import threading
+from collections import deque
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import jwt
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# record-and-replay of service traffic - SARA_CASSETTE=<file.json.gz> with SARA_CASSETTE_MODE:
+#   record - requests go to the service, and each request/response pair (and its timing) is saved on exit
+#   replay - responses are served from the cassette instantly, and client-side waits (polling, backoff) are skipped
+#   timed  - responses are served from the cassette after their recorded latency (divided by SARA_CASSETTE_SPEED)
+CASSETTE_PATH = os.environ.get("SARA_CASSETTE")
+CASSETTE_MODE = os.environ.get("SARA_CASSETTE_MODE", "replay")
+CASSETTE_SPEED = float(os.environ.get("SARA_CASSETTE_SPEED", 1))
+
+cassette_modes = ["record", "replay", "timed"]
+
+CASSETTE_FORMAT_VERSION = 1
+
+# query parameters that change from run to run without changing the response - e.g. a long-poll's remaining wait
+VOLATILE_PARAMS = ["timeout"]
+
+# recorded bodies are stored decoded, so the transfer headers no longer apply
+_TRANSFER_HEADERS = ["content-encoding", "transfer-encoding", "content-length", "connection"]
+
+
+class CassetteMiss(requests.exceptions.RequestException):
+    # a replayed request that was never recorded - the cassette is stale, or the client's requests changed
+    pass
+
+
+def request_identity(headers):
+    # the caller's email - signed identities differ on every signing, but the user they name doesn't
+    token = headers.get("X-Signed-Identity")
+    authorization = headers.get("Authorization", "")
+    if not token and authorization.startswith("Bearer "):
+        token = authorization[len("Bearer "):]
+    if token:
+        try:
+            return jwt.decode(token, options={"verify_signature": False}).get("email", "")
+        except jwt.PyJWTError:
+            return ""
+    return headers.get("X-User-Account", "")
+
+
+def request_key(method, url, headers, body):
+    # requests match on verb, path, (stable) query, identity and body - not on the host, so a cassette recorded
+    #   against one stage replays for any base url
+    parts = urlsplit(url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name not in VOLATILE_PARAMS)
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_hash = hashlib.sha1(body).hexdigest() if body else ""
+    return f"{method} {parts.path}?{urlencode(query)} {request_identity(headers)} {body_hash}"
+
+
+def server_timing(headers):
+    # the service's Server-Timing metrics, in order - [{"name", "milliseconds", "description"}] (either can be None)
+    metrics = []
+    for metric in headers.get("Server-Timing", "").split(","):
+        name, _, params = metric.strip().partition(";")
+        if not name:
+            continue
+        entry = {"name": name, "milliseconds": None, "description": None}
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                try:
+                    entry["milliseconds"] = float(value)
+                except ValueError:
+                    pass
+            elif key == "desc":
+                entry["description"] = value.strip('"')
+        metrics.append(entry)
+    return metrics
+
+
+def server_seconds(headers):
+    # service-side time from a Server-Timing 'total' metric, if the service reported one
+    for metric in server_timing(headers):
+        if metric["name"] == "total" and metric["milliseconds"] is not None:
+            return metric["milliseconds"] / 1000
+    return None
+
+
+class Cassette:
+    # request/response pairs in recorded order - repeats of the same request (e.g. status polling) replay in the
+    #   order they were recorded, and the last one repeats once they run out
+
+    def __init__(self, path, mode="replay", speed=CASSETTE_SPEED):
+        if mode not in cassette_modes:
+            raise ValueError(f"Unknown cassette mode {mode} - choose from {', '.join(cassette_modes)}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.interactions = []
+        self._queues = {}
+        self._last = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.recorded_seconds = 0.0
+
+        if mode != "record":
+            self.load()
+
+    @property
+    def replaying(self):
+        return self.mode != "record"
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            cassette = json.load(f)
+        self.interactions = cassette["interactions"]
+        for interaction in self.interactions:
+            self._queues.setdefault(interaction["key"], deque()).append(interaction)
+
+    def save(self):
+        # written to a temporary file first, so an interrupted save never leaves a truncated cassette
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            cassette = {
+                "version": CASSETTE_FORMAT_VERSION,
+                "recorded": datetime.datetime.now().isoformat(),
+                "interactions": list(self.interactions),
+            }
+        temporary_path = self.path + ".tmp"
+        with gzip.open(temporary_path, "wt", encoding="utf-8") as f:
+            json.dump(cassette, f)
+        os.replace(temporary_path, self.path)
+
+    def record(self, request, response, elapsed):
+        body = response.content or b""
+        try:
+            stored_body = {"body": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            stored_body = {"bodyBase64": base64.b64encode(body).decode("ascii")}
+
+        interaction = {
+            "key": request_key(request.method, request.url, request.headers, request.body),
+            "request": {"method": request.method, "url": request.url},
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {name: value for name, value in response.headers.items()
+                            if name.lower() not in _TRANSFER_HEADERS},
+                **stored_body,
+            },
+            "elapsedSeconds": elapsed,
+            "serverSeconds": server_seconds(response.headers),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+            self.recorded_seconds += elapsed
+
+    def next(self, request):
+        key = request_key(request.method, request.url, request.headers, request.body)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                interaction = queue.popleft()
+                self._last[key] = interaction
+            else:
+                interaction = self._last.get(key)
+            if interaction is None:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded response for {request.method} {request.url} in {self.path}")
+            self.hits += 1
+            self.recorded_seconds += interaction["elapsedSeconds"]
+            return interaction
+
+    def stats(self):
+        with self._lock:
+            return {"mode": self.mode, "interactions": len(self.interactions), "hits": self.hits,
+                    "misses": self.misses, "recordedSeconds": self.recorded_seconds}
+
+
+class CassetteAdapter(HTTPAdapter):
+    # wraps the client's pooled adapter - records through it, or replays without touching the network
+
+    def __init__(self, cassette, adapter=None):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter if adapter is not None else HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        if not self.cassette.replaying:
+            start = time.perf_counter()
+            response = self.adapter.send(request, **kwargs)
+            # the body is read here (even for a stream) so its download is part of the recorded latency
+            response.content
+            self.cassette.record(request, response, time.perf_counter() - start)
+            return response
+
+        interaction = self.cassette.next(request)
+        if self.cassette.mode == "timed" and self.cassette.speed > 0:
+            time.sleep(interaction["elapsedSeconds"] / self.cassette.speed)
+        elif self.cassette.mode == "replay":
+            # the response is instant, but deadlines still see it take as long as it did when recorded
+            advance_clock(interaction["elapsedSeconds"])
+        return self._build_response(request, interaction)
+
+    def _build_response(self, request, interaction):
+        recorded = interaction["response"]
+        body = base64.b64decode(recorded["bodyBase64"]) if "bodyBase64" in recorded else recorded["body"].encode("utf-8")
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded["reason"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = datetime.timedelta(seconds=interaction["elapsedSeconds"])
+        # callers that pace themselves by the server's response times (e.g. long-poll fallbacks) can tell
+        response.replayed = True
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+_active_cassette = None
+_active_lock = threading.RLock()
+
+# seconds the clock has been moved on by waits skipped (and responses served instantly) in instant replay
+_virtual_seconds = 0.0
+
+
+def use_cassette(path, mode="replay", speed=CASSETTE_SPEED):
+    # make a cassette the process-wide cassette - clients created afterwards record to (or replay from) it
+    #   a recording is saved when the process exits
+    global _active_cassette
+    cassette = Cassette(path, mode, speed)
+    with _active_lock:
+        _active_cassette = cassette
+    if mode == "record":
+        atexit.register(cassette.save)
+    return cassette
+
+
+def eject_cassette():
+    # stop recording or replaying - clients created afterwards talk to the service again (e.g. between tests)
+    global _active_cassette
+    with _active_lock:
+        _active_cassette = None
+
+
+def active_cassette():
+    # the process-wide cassette - configured from SARA_CASSETTE the first time it's needed
+    with _active_lock:
+        if _active_cassette is None and CASSETTE_PATH:
+            use_cassette(CASSETTE_PATH, CASSETTE_MODE)
+        return _active_cassette
+
+
+def is_instant_replay():
+    cassette = _active_cassette
+    return cassette is not None and cassette.mode == "replay"
+
+
+def advance_clock(seconds):
+    global _virtual_seconds
+    with _active_lock:
+        _virtual_seconds += seconds
+
+
+def now():
+    # time.time() for client-side deadlines - in instant replay the clock still moves on by each skipped wait and
+    #   each recorded response's latency, so a deadline loop replaying a repeated response times out after as many
+    #   checks as it made live, instead of spinning until the real deadline
+    return time.time() + _virtual_seconds
+
+
+def pause(seconds):
+    # time.sleep for client-side waits (polling, backoff) - skipped when replaying instantly, since the recorded
+    #   responses are already in the order the waits produced
+    if is_instant_replay():
+        advance_clock(seconds)
+        return
+    time.sleep(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a recorded cassette - requests, and where the recorded time went.")
+    parser.add_argument("cassette", help="Cassette file (.json.gz)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest requests to list (default: 10)")
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette)
+    interactions = cassette.interactions
+    if not interactions:
+        print(f"{args.cassette} is empty")
+        sys.exit(1)
+
+    total = sum(interaction["elapsedSeconds"] for interaction in interactions)
+    server = [interaction["serverSeconds"] for interaction in interactions if interaction.get("serverSeconds") is not None]
+    print(f"{len(interactions)} requests ({len(cassette._queues)} distinct) - {total:.2f} seconds of recorded latency"
+          f"{f', {sum(server):.2f} seconds reported by the service' if server else ''}")
+
+    by_route = {}
+    for interaction in interactions:
+        route = f"{interaction['request']['method']} {urlsplit(interaction['request']['url']).path}"
+        count, seconds = by_route.get(route, (0, 0.0))
+        by_route[route] = (count + 1, seconds + interaction["elapsedSeconds"])
+    print(f"\n{'Seconds':>9} {'Count':>6}  Request")
+    for route, (count, seconds) in sorted(by_route.items(), key=lambda item: -item[1][1]):
+        print(f"{seconds:9.2f} {count:6}  {route}")
+
+    print(f"\nSlowest {min(args.top, len(interactions))}:")
+    for interaction in sorted(interactions, key=lambda interaction: -interaction["elapsedSeconds"])[:args.top]:
+        print(f"{interaction['elapsedSeconds']:9.3f}  {interaction['response']['status']}  "
+              f"{interaction['request']['method']} {interaction['request']['url']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
+import os
+
+from namespaces import namespaced
+
 LOCAL_URL = "http://localhost:3000"  # Local Test Server
 CLOUD_URL_LEGACY = "https://pt5sl5vwfjn6lsr2k6szuvfhnq0vaxhl.lambda-url.us-west-2.on.aws"  # AWS Legacy - no longer maintained/compatible
 
@@ -7,6 +11,9 @@ CLOUD_URL_PROD = "https://33pdosoitl22c42c7sf46tabi40qwlae.lambda-url.us-west-2.
 
 TARGET_URL = LOCAL_URL  # CLOUD_URL_DEV  # LOCAL_URL
 
+# e.g. for test runners that target a stage per run (see run_parallel.py)
+TARGET_URL = os.environ.get("SARA_TARGET_URL", TARGET_URL)
+
 all_stages = {
     "dev": CLOUD_URL_DEV,
     "test": CLOUD_URL_TEST,
@@ -28,26 +35,27 @@ AARON_EMAIL = "aaron@polyverse.com"
 FREE_EMAIL = "unittest@free-polyverse.com"
 FREE_ORG = "free-polyverse-test-org"
 
-FREE_PROJECT_NAME = "free-test-project"
+# project names are suffixed with the worker namespace when the suites run in parallel - see namespaces.py
+FREE_PROJECT_NAME = namespaced("free-test-project")
 
 TEST_ORG = "org123"
-TEST_PROJECT_NAME = "project456"
+TEST_PROJECT_NAME = namespaced("project456")
 
 # PRIVATE_PROJECT = "https://github.com/StephenAFisher/testRepoForBoostGitHubApp"
 PRIVATE_PROJECT = "https://github.com/polyverse-appsec/sara"
-PRIVATE_PROJECT_NAME = "test-sara"
+PRIVATE_PROJECT_NAME = namespaced("test-sara")
 
-PRIVATE_PROJECT_NAME_CHECKIN_TEST = "checkin_test_private_repo"
+PRIVATE_PROJECT_NAME_CHECKIN_TEST = namespaced("checkin_test_private_repo")
 
 # PRIVATE_PROJECT = "https://github.com/polyverse-appsec/boostlambda"
 PUBLIC_PROJECT = "https://github.com/public-apis/public-apis"
-PUBLIC_PROJECT_NAME = "github-public-apis"
-PUBLIC_PROJECT_NAME_CHECKIN_TEST = "checkin_test_public_repo"
+PUBLIC_PROJECT_NAME = namespaced("github-public-apis")
+PUBLIC_PROJECT_NAME_CHECKIN_TEST = namespaced("checkin_test_public_repo")
 
-PRIVATE_PROJECT_LARGE_NAME = "test-sara-large"
+PRIVATE_PROJECT_LARGE_NAME = namespaced("test-sara-large")
 PRIVATE_PROJECT_LARGE = "https://github.com/polyverse-appsec/polyx"
 
-PRIVATE_PROJECT_NAME_CUSTOM_NFTMINT = "test-sara-nftmint"
+PRIVATE_PROJECT_NAME_CUSTOM_NFTMINT = namespaced("test-sara-nftmint")
 PRIVATE_PROJECT_CUSTOM_NFTMINT = "https://github.com/polyverse-appsec/NFT-Mint"
 
 PRIVATE_PROJECT_MEDIUM = "https://github.com/polyverse-appsec/EXM_DP_BizRules"
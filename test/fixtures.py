@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import client
+from utils import get_signed_headers
+from constants import TARGET_URL
+
+
+DEFAULT_CLEANUP_CONCURRENCY = 8
+
+
+def ensure_project(email, org, project, uri, base_url=TARGET_URL):
+    # create a project a suite reads (but doesn't create) if it doesn't exist yet - serial runs find the long-lived
+    #   project, while a fresh worker namespace gets its own copy
+    headers = get_signed_headers(email)
+    response = client.get(f"{base_url}/api/user_project/{org}/{project}", headers=headers)
+    if response.status_code == 200:
+        return False
+    if response.status_code != 404:
+        response.raise_for_status()
+
+    response = client.put(f"{base_url}/api/user_project/{org}/{project}", json={"resources": [{"uri": uri}]}, headers=headers)
+    response.raise_for_status()
+    return True
+
+
+def delete_project(entry):
+    # a registered project (see namespaces.py) - already deleted (e.g. by the test itself) counts as cleaned up
+    headers = get_signed_headers(entry["email"])
+    response = client.delete(f"{entry['url']}/api/user_project/{entry['org']}/{entry['project']}", headers=headers)
+    return response.status_code in [200, 404]
+
+
+def cleanup_projects(entries, concurrency=DEFAULT_CLEANUP_CONCURRENCY):
+    # deletes the projects concurrently, and returns the ones that couldn't be deleted
+    def attempt(entry):
+        try:
+            return delete_project(entry)
+        except Exception as e:
+            print(f"Failed to delete {entry['org']}/{entry['project']} for {entry['email']}: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        deleted = list(executor.map(attempt, entries))
+    return [entry for entry, ok in zip(entries, deleted) if not ok]
@@ -0,0 +1,134 @@
+import os
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from cassette import CassetteAdapter, active_cassette
+from namespaces import PROJECT_REGISTRY, record_created_project
+from timing import TimingAdapter, timed_pool_classes, timing_recorder
+
+
+# one pool per host (stage) we talk to, and enough connections per host for concurrent scripts
+DEFAULT_POOL_CONNECTIONS = int(os.environ.get("SARA_HTTP_POOL_CONNECTIONS", 8))
+DEFAULT_POOL_MAXSIZE = int(os.environ.get("SARA_HTTP_POOL_MAXSIZE", 32))
+
+# connect should be fast - read can be long since some requests wait on the full Lambda timeout
+DEFAULT_CONNECT_TIMEOUT = float(os.environ.get("SARA_HTTP_CONNECT_TIMEOUT", 10))
+DEFAULT_READ_TIMEOUT = float(os.environ.get("SARA_HTTP_READ_TIMEOUT", 15 * 60))
+
+# seconds of idle before the OS starts TCP keep-alive probes on a pooled connection
+TCP_KEEPALIVE_IDLE_SECONDS = 60
+
+
+def keepalive_socket_options():
+    options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # not all platforms expose the tuning options (e.g. macOS has no TCP_KEEPIDLE)
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE_SECONDS))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    # pooled adapter that keeps idle per-host connections alive at the TCP level
+    #   so they survive between polling calls instead of paying a new TCP+TLS handshake
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", keepalive_socket_options())
+        super().init_poolmanager(*args, **kwargs)
+        if getattr(self, "timed", False):
+            self.poolmanager.pool_classes_by_scheme = timed_pool_classes
+
+    def use_timed_pools(self):
+        # connections report their connect and TLS time to timed requests - see timing.py
+        #   only installed once a client is instrumented, so untimed clients stay on stock urllib3 pools
+        self.timed = True
+        self.poolmanager.clear()
+        self.poolmanager.pool_classes_by_scheme = timed_pool_classes
+
+
+class SaraHttpClient:
+    # shared HTTP client for the Boost API - a pooled keep-alive requests Session with default timeouts
+    #   mirrors the module-level requests.get/post/... API so it can be swapped in directly
+
+    def __init__(self,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT):
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_maxsize = pool_maxsize
+
+        self.session = requests.Session()
+        self.session.headers["Connection"] = "keep-alive"
+
+        self.adapter = KeepAliveAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._mount(self.adapter)
+
+        self.timing_hooks = []
+        self.timing_adapter = None
+
+        # SARA_CASSETTE records or replays all traffic - see cassette.py
+        cassette = active_cassette()
+        if cassette is not None:
+            self.use_cassette(cassette)
+
+        # parallel workers register the namespaced projects they create, for cleanup at the end of the run
+        if PROJECT_REGISTRY:
+            self.session.hooks["response"].append(record_created_project)
+
+        # SARA_TIMING and SARA_TRACE record every request's phase timings - see timing.py
+        recorder = timing_recorder()
+        if recorder is not None:
+            self.instrument(recorder)
+
+    def _mount(self, adapter):
+        # timed requests stay timed whatever adapter (pooled, or cassette) ends up underneath
+        if getattr(self, "timing_adapter", None) is not None:
+            self.timing_adapter.adapter = adapter
+            adapter = self.timing_adapter
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def use_cassette(self, cassette):
+        # record through the pooled adapter, or replay without the network
+        self._mount(CassetteAdapter(cassette, self.adapter))
+
+    def instrument(self, hook):
+        # hook(timing) is called with each request's RequestTiming (phases, sizes, request id) once it completes
+        if self.timing_adapter is None:
+            self.adapter.use_timed_pools()
+            self.timing_adapter = TimingAdapter(self.session.get_adapter("https://"), self.timing_hooks)
+            self.session.mount("https://", self.timing_adapter)
+            self.session.mount("http://", self.timing_adapter)
+        self.timing_hooks.append(hook)
+
+    def request(self, method, url, **kwargs):
+        # an explicit timeout (including None) from the caller always wins
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        return self.request("GET", url, params=params, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request("POST", url, data=data, json=json, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request("PUT", url, data=data, **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.request("PATCH", url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+# process-wide client shared by the tests and scripts
+client = SaraHttpClient()
@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+SECRET_NAME = "boost-sara/sara-client-private-key"
+SECRET_REGION = "us-west-2"
+
+# how long a fetched key is trusted before we go back to the provider (seconds)
+DEFAULT_KEY_CACHE_TTL = int(os.environ.get("SARA_KEY_CACHE_TTL", 60 * 60))
+
+# optional on-disk cache of the signing key - only used when a directory is explicitly configured
+#   since it writes a private key to disk (file is created owner read/write only)
+KEY_CACHE_DIR = os.environ.get("SARA_KEY_CACHE_DIR")
+
+# the in-memory cache can be disabled for debugging provider issues
+is_cache_enabled = not os.environ.get("SARA_DISABLE_KEY_CACHE")
+
+
+class KeyProvider(ABC):
+    # a source of the PEM-encoded Sara client private key
+    name = "base"
+
+    @abstractmethod
+    def fetch_pem(self):
+        pass
+
+
+class SecretsManagerKeyProvider(KeyProvider):
+    name = "secretsmanager"
+
+    def __init__(self, secret_name=SECRET_NAME, region_name=SECRET_REGION):
+        self.secret_name = secret_name
+        self.region_name = region_name
+
+    def fetch_pem(self):
+        # boto3 is only needed when we actually go to AWS - keeps offline runs free of the import cost
+        import boto3
+
+        # Create a Secrets Manager client
+        session = boto3.session.Session()
+        client = session.client(
+            service_name='secretsmanager',
+            region_name=self.region_name
+        )
+
+        get_secret_value_response = client.get_secret_value(
+            SecretId=self.secret_name
+        )
+
+        # Decrypts secret using the associated KMS key.
+        return get_secret_value_response['SecretString']
+
+
+class LocalKeyProvider(KeyProvider):
+    # reads the key from an environment variable (PEM content) or a local PEM file - for fully offline use
+    #   an explicit pem (e.g. a throwaway key) takes precedence over both
+    name = "local"
+
+    def __init__(self, key_file=None, env_var="SARA_CLIENT_PRIVATE_KEY", pem=None):
+        self.key_file = key_file if key_file is not None else os.environ.get("SARA_CLIENT_PRIVATE_KEY_FILE")
+        self.env_var = env_var
+        self.pem = pem
+
+    def is_available(self):
+        return self.pem is not None or bool(os.environ.get(self.env_var)) or (self.key_file is not None and os.path.isfile(self.key_file))
+
+    def fetch_pem(self):
+        if self.pem is not None:
+            return self.pem
+
+        pem = os.environ.get(self.env_var)
+        if pem:
+            # allow single-line keys with escaped newlines (e.g. from CI secrets)
+            return pem.replace("\\n", "\n")
+
+        if self.key_file is None:
+            raise Exception(f"No private key available - set {self.env_var} or SARA_CLIENT_PRIVATE_KEY_FILE")
+
+        with open(self.key_file, "r") as f:
+            return f.read()
+
+
+class CachedSigningKey:
+    # caches the key from a provider in memory (and optionally on disk), along with the pre-parsed RSA key object
+    #   so each JWT signing doesn't need to re-parse the PEM
+
+    def __init__(self, provider, ttl=DEFAULT_KEY_CACHE_TTL, cache_dir=KEY_CACHE_DIR):
+        self.provider = provider
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._pem = None
+        self._key = None
+        self._fetched_at = 0
+
+        self.cache_hits = 0
+        self.provider_fetches = 0
+        self.disk_hits = 0
+
+    def _is_fresh(self, fetched_at):
+        return self.ttl is None or (time.time() - fetched_at) < self.ttl
+
+    def _disk_cache_path(self):
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"sara-client-key.{self.provider.name}.json")
+
+    def _load_from_disk(self):
+        path = self._disk_cache_path()
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not self._is_fresh(cached.get("fetchedAt", 0)):
+            return None
+        return cached
+
+    def _save_to_disk(self, pem, fetched_at):
+        path = self._disk_cache_path()
+        if path is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"pem": pem, "fetchedAt": fetched_at}, f)
+        except OSError as e:
+            # disk cache is an optimization only - never fail a request because of it
+            print(f"Unable to write signing key cache {path}: {e}")
+
+    def _refresh(self):
+        cached = self._load_from_disk()
+        if cached is not None:
+            pem = cached["pem"]
+            fetched_at = cached["fetchedAt"]
+            self.disk_hits += 1
+        else:
+            pem = self.provider.fetch_pem()
+            fetched_at = time.time()
+            self.provider_fetches += 1
+            self._save_to_disk(pem, fetched_at)
+
+        self._key = serialization.load_pem_private_key(pem.encode("utf-8"), password=None)
+        self._pem = pem
+        self._fetched_at = fetched_at
+
+    def _ensure(self):
+        with self._lock:
+            if is_cache_enabled and self._key is not None and self._is_fresh(self._fetched_at):
+                self.cache_hits += 1
+                return
+            self._refresh()
+
+    def pem(self):
+        self._ensure()
+        return self._pem
+
+    def key(self):
+        self._ensure()
+        return self._key
+
+    def invalidate(self):
+        with self._lock:
+            self._pem = None
+            self._key = None
+            self._fetched_at = 0
+
+
+def throwaway_key_provider():
+    # a freshly generated key - for servers that don't verify signatures (e.g. the stand-in server), so offline
+    #   runs never need AWS access for the real key
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    return LocalKeyProvider(pem=pem.decode("utf-8"))
+
+
+def default_provider():
+    # prefer a local key when one is configured - otherwise go to AWS Secrets Manager
+    local = LocalKeyProvider()
+    if local.is_available():
+        return local
+    return SecretsManagerKeyProvider()
+
+
+_signing_key = None
+_signing_key_lock = threading.Lock()
+
+
+def get_signing_key():
+    global _signing_key
+    with _signing_key_lock:
+        if _signing_key is None:
+            _signing_key = CachedSigningKey(default_provider())
+        return _signing_key
+
+
+def set_key_provider(provider, ttl=DEFAULT_KEY_CACHE_TTL, cache_dir=KEY_CACHE_DIR):
+    # swap the process-wide provider (e.g. to a LocalKeyProvider for offline runs)
+    global _signing_key
+    with _signing_key_lock:
+        _signing_key = CachedSigningKey(provider, ttl, cache_dir)
+        return _signing_key
+
+
+def swap_signing_key(signing_key):
+    # install a signing key (None falls back to the default provider on next use) - returns the one it replaced,
+    #   so a suite can put it back
+    global _signing_key
+    with _signing_key_lock:
+        previous = _signing_key
+        _signing_key = signing_key
+        return previous
@@ -0,0 +1,102 @@
+import threading
+
+
+# sub-buckets per power of two - 2^11 keeps every recorded value within 0.05% (3 significant digits), like an
+#   HdrHistogram with significant figures = 3
+SUB_BUCKET_BITS = 11
+
+# latencies are recorded in whole microseconds
+MICROSECONDS_PER_SECOND = 1000000
+
+DEFAULT_PERCENTILES = [50, 90, 99, 99.9]
+
+
+class LatencyHistogram:
+    # HDR-style log-linear histogram of latencies - fixed relative precision over any range (microseconds to hours)
+    #   in a few KB, so millions of samples can be recorded (and merged across threads or runs) without keeping them
+
+    def __init__(self, sub_bucket_bits=SUB_BUCKET_BITS):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def _index(self, value):
+        # values below sub_bucket_count are exact; above that, each power of two is split into sub_bucket_half buckets
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return shift * self.sub_bucket_half + (value >> shift)
+
+    def _highest_equivalent(self, index):
+        # the largest value that falls in a bucket - percentiles report it, so they never understate a latency
+        if index < self.sub_bucket_count:
+            return index
+        shift = index // self.sub_bucket_half - 1
+        sub_bucket = index - shift * self.sub_bucket_half
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = max(0, int(seconds * MICROSECONDS_PER_SECOND))
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        with self._lock:
+            for index, count in other.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.count += other.count
+            self.total += other.total
+            if other.min is not None:
+                self.min = other.min if self.min is None else min(self.min, other.min)
+                self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percentile):
+        # latency (seconds) at or below which 'percentile' percent of samples fall
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = max(1, int(-(-self.count * percentile // 100)))
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= target:
+                    return min(self._highest_equivalent(index), self.max) / MICROSECONDS_PER_SECOND
+            return self.max / MICROSECONDS_PER_SECOND
+
+    def mean(self):
+        return self.total / self.count / MICROSECONDS_PER_SECOND if self.count else 0.0
+
+    def summary(self, percentiles=DEFAULT_PERCENTILES):
+        # count, mean, min, max and percentiles - all latencies in milliseconds
+        return {
+            "count": self.count,
+            "meanMs": self.mean() * 1000,
+            "minMs": (self.min or 0) / 1000,
+            "maxMs": (self.max or 0) / 1000,
+            **{f"p{percentile:g}Ms": self.percentile(percentile) * 1000 for percentile in percentiles},
+        }
+
+    def to_dict(self):
+        return {"subBucketBits": self.sub_bucket_bits, "counts": {str(index): count for index, count in self.counts.items()},
+                "count": self.count, "total": self.total, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data.get("subBucketBits", SUB_BUCKET_BITS))
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import random
+import threading
+
+import requests
+
+from cassette import pause, now
+from http_client import client
+
+
+# a successful probe is trusted for this long, so back-to-back invocations skip the probe entirely (seconds)
+PROBE_CACHE_TTL = float(os.environ.get("SARA_PROBE_CACHE_TTL", 120))
+PROBE_CACHE_DIR = os.environ.get("SARA_PROBE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "sara"))
+
+# a warm stage answers /test in milliseconds - keep the probe itself short
+PROBE_TIMEOUT = (1, 2)
+
+# exponential backoff between probes: base * 2^attempt, capped, with jitter
+PROBE_BASE_DELAY_SECONDS = 0.25
+PROBE_MAX_DELAY_SECONDS = 5
+
+# service responses that mean "slow down" (busy) or "try again shortly" (project locked by another update)
+BACKPRESSURE_STATUS_CODES = [429, 423]
+MAX_BACKPRESSURE_RETRIES = 8
+BACKPRESSURE_BASE_DELAY_SECONDS = 1
+BACKPRESSURE_MAX_DELAY_SECONDS = 60
+
+
+def _cache_path(stage):
+    return os.path.join(PROBE_CACHE_DIR, f"probe-{stage}.json")
+
+
+def is_probe_cached(stage, url, ttl=PROBE_CACHE_TTL):
+    if not stage or ttl <= 0:
+        return False
+    try:
+        with open(_cache_path(stage), "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return cached.get("url") == url and (time.time() - cached.get("lastSuccess", 0)) < ttl
+
+
+def record_probe(stage, url):
+    if not stage:
+        return
+    try:
+        os.makedirs(PROBE_CACHE_DIR, exist_ok=True)
+        with open(_cache_path(stage), "w") as f:
+            json.dump({"url": url, "lastSuccess": time.time()}, f)
+    except OSError:
+        # the cache is only an optimization
+        pass
+
+
+def backoff_delay(attempt, base=PROBE_BASE_DELAY_SECONDS, maximum=PROBE_MAX_DELAY_SECONDS):
+    # "equal jitter" - half the exponential delay is fixed, half is random, so retries from many clients spread out
+    delay = min(maximum, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def retry_after_seconds(response, attempt, base=BACKPRESSURE_BASE_DELAY_SECONDS, maximum=BACKPRESSURE_MAX_DELAY_SECONDS):
+    # the service's Retry-After (in seconds) when provided, otherwise an exponential backoff with jitter
+    retry_after = response.headers.get("Retry-After")
+    try:
+        return min(maximum, float(retry_after)) if retry_after else backoff_delay(attempt, base, maximum)
+    except ValueError:
+        return backoff_delay(attempt, base, maximum)
+
+
+def request_with_backoff(verb, url, http=client, on_retry=None, max_retries=MAX_BACKPRESSURE_RETRIES, **kwargs):
+    # retry requests the service pushes back on (429/423) - so many concurrent callers don't retry in lockstep
+    #   on_retry(response, attempt, delay) is called before each wait; the last response is returned once
+    #   retries run out
+    attempt = 0
+    while True:
+        response = http.request(verb, url, **kwargs)
+        if response.status_code not in BACKPRESSURE_STATUS_CODES or attempt >= max_retries:
+            return response
+
+        delay = retry_after_seconds(response, attempt)
+        if on_retry is not None:
+            on_retry(response, attempt, delay)
+        pause(delay)
+        attempt += 1
+
+
+def _is_retryable(error):
+    # look for RemoteDisconnected to retry
+    # or NewConnectionError to retry
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "NewConnectionError" in str(error) or "RemoteDisconnected" in str(error) or \
+            isinstance(error, requests.exceptions.ConnectTimeout)
+    if isinstance(error, requests.exceptions.RequestException):
+        return isinstance(error, requests.exceptions.Timeout) or \
+            (len(error.args) > 0 and type(error.args[0]).__name__ == "ReadTimeoutError")
+    return False
+
+
+def wait_until_ready(test_url, stage=None, on_retry=None, max_wait=None, use_cache=True):
+    # probe the service /test endpoint until it responds - returns True when ready, False if max_wait elapsed
+    #   a recent successful probe of the same stage is reused without touching the network
+    #   non-retryable errors are raised to the caller; on_retry(attempt, delay) is called before each wait
+    if use_cache and is_probe_cached(stage, test_url):
+        return True
+
+    start = now()
+    attempt = 0
+    while True:
+        try:
+            response = client.get(test_url, timeout=PROBE_TIMEOUT)
+            if response.status_code == 200:
+                record_probe(stage, test_url)
+                return True
+        except requests.exceptions.RequestException as e:
+            if not _is_retryable(e):
+                raise
+
+        delay = backoff_delay(attempt)
+        if max_wait is not None and (now() - start) + delay > max_wait:
+            return False
+        if on_retry is not None:
+            on_retry(attempt, delay)
+        pause(delay)
+        attempt += 1
+
+
+class BackgroundProbe:
+    # runs wait_until_ready on a background thread - so the Lambda warms up while the caller does other
+    #   setup (e.g. fetching the signing key) instead of serially
+
+    def __init__(self, test_url, stage=None, on_retry=None, max_wait=None, use_cache=True):
+        self.ready = None
+        self.error = None
+        self._thread = threading.Thread(
+            target=self._run, args=(test_url, stage, on_retry, max_wait, use_cache), daemon=True)
+        self._thread.start()
+
+    def _run(self, test_url, stage, on_retry, max_wait, use_cache):
+        try:
+            self.ready = wait_until_ready(test_url, stage, on_retry, max_wait, use_cache)
+        except Exception as e:
+            self.error = e
+
+    def wait(self):
+        # join in short slices so control-c still reaches the main thread
+        while self._thread.is_alive():
+            self._thread.join(0.1)
+        if self.error is not None:
+            raise self.error
+        return self.ready
@@ -0,0 +1,82 @@
+from cassette import pause, now
+from http_client import client
+from response_decoder import decode_response
+
+
+# how long the service holds a single ?waitFor= request open (the service caps this at 20 seconds)
+LONG_POLL_SECONDS = 20
+
+# a service without long-poll support answers immediately - fall back to polling at this interval
+FALLBACK_POLL_SECONDS = 2
+
+GENERATOR_DONE_STATES = ["idle", "error"]
+
+# the service answers a status request for a project it hasn't assessed yet (e.g. just created) with a 202 and an
+#   'Unknown' status - not in any wanted state yet, so keep waiting
+HTTP_ACCEPTED = 202
+
+# the service's ProjectStatus.Synchronized - older services reported it as 'Synchronized'
+SYNCHRONIZED_STATUSES = ["fully synchronized", "synchronized"]
+
+
+def _wait_for(url, headers, states, timeout, on_check, http, state_of):
+    # repeat long-poll requests until the state is one of 'states' - returns the last decoded response
+    #   'timeout' bounds the total wait (None waits forever); raises on an error response
+    #   states are compared case-insensitively, as the service does - state_of can return one state or several
+    states = [state.lower() for state in states]
+    deadline = now() + timeout if timeout is not None else None
+    params = {"waitFor": "|".join(states), "timeout": LONG_POLL_SECONDS}
+    check = 0
+    while True:
+        check += 1
+        if deadline is not None:
+            params["timeout"] = max(0, min(LONG_POLL_SECONDS, int(deadline - now())))
+
+        start = now()
+        response = http.get(url, headers=headers, params=params)
+        if response.status_code not in [200, HTTP_ACCEPTED]:
+            raise Exception(f"Wait for {states} failed ({response.status_code}): {response.text}")
+        result = decode_response(response)
+
+        if on_check is not None:
+            on_check(check, result)
+
+        current = state_of(result) if response.status_code != HTTP_ACCEPTED else []
+        current = current if isinstance(current, list) else [current]
+        if any(isinstance(state, str) and state.lower() in states for state in current):
+            return result
+        if deadline is not None and now() >= deadline:
+            return result
+
+        # the service returned before the long-poll window elapsed without reaching the state - it doesn't support
+        #   long-poll, so don't spin
+        if now() - start < 1:
+            pause(FALLBACK_POLL_SECONDS)
+
+
+def wait_for_generator(base_url, org, project, resource, headers, states=None, timeout=None, on_check=None, http=client):
+    # block until a resource generator is idle or in error - returns the final generator state
+    #   on_check(check_number, generator_state) is called after each response, e.g. for progress output
+    url = f"{base_url}/api/user_project/{org}/{project}/data/{resource}/generator"
+    return _wait_for(url, headers, states if states is not None else GENERATOR_DONE_STATES, timeout, on_check, http,
+                     lambda generator: generator.get("status"))
+
+
+def wait_for_project_status(base_url, org, project, headers, states=None, timeout=None, on_check=None, http=client):
+    # block until the project is synchronized (or another state, e.g. "idle" or "error") - returns the final status
+    url = f"{base_url}/api/user_project/{org}/{project}/status"
+    states = states if states is not None else ["synchronized"]
+
+    def state_of(status):
+        # mirrors the states the service matches for a project status long-poll (projectLongPollStates) - a
+        #   project can be in several at once, e.g. both synchronized and idle
+        current = [status.get("status")]
+        if status.get("synchronized") or str(status.get("status", "")).lower() in SYNCHRONIZED_STATUSES:
+            current.append("synchronized")
+        if not status.get("activelyUpdating"):
+            current.append("idle")
+        if status.get("status") == "Resources In Error":
+            current.append("error")
+        return current
+
+    return _wait_for(url, headers, states, timeout, on_check, http, state_of)
@@ -0,0 +1,66 @@
+import os
+import re
+import json
+import threading
+from urllib.parse import urlsplit
+
+from cassette import request_identity
+
+
+# per-worker project namespaces - SARA_TEST_NAMESPACE=<run>-w<n> (set by run_parallel.py for each worker) suffixes
+#   every project name the suites create, so workers never delete or regenerate each other's projects
+#   unset (the default), names are unchanged - serial runs and recorded cassettes keep their fixed projects
+TEST_NAMESPACE = os.environ.get("SARA_TEST_NAMESPACE")
+
+# projects created under the namespace are appended here (JSON lines), so they can be deleted in bulk afterwards
+PROJECT_REGISTRY = os.environ.get("SARA_TEST_REGISTRY")
+
+_PROJECT_PATH = re.compile(r"^/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)/?$")
+
+_registry_lock = threading.Lock()
+
+
+def namespaced(name, namespace=TEST_NAMESPACE):
+    return f"{name}-{namespace}" if namespace else name
+
+
+def is_namespaced(name, namespace=TEST_NAMESPACE):
+    # suites also derive names from namespaced ones (e.g. '<name>-test'), so the namespace can be mid-name
+    return bool(namespace) and f"-{namespace}" in name
+
+
+def record_created_project(response, *args, **kwargs):
+    # response hook for the shared client - registers each namespaced project a test creates (POST or PUT of
+    #   the project itself), with the base url and user needed to delete it later
+    request = response.request
+    if request.method not in ["POST", "PUT"] or response.status_code != 200:
+        return
+    parts = urlsplit(request.url)
+    match = _PROJECT_PATH.match(parts.path)
+    if match is None or not is_namespaced(match.group("project")):
+        return
+
+    entry = {
+        "url": f"{parts.scheme}://{parts.netloc}",
+        "email": request_identity(request.headers),
+        "org": match.group("org"),
+        "project": match.group("project"),
+    }
+    with _registry_lock:
+        with open(PROJECT_REGISTRY, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def registered_projects(paths):
+    # distinct projects from one or more registry files - missing files (workers that created nothing) are skipped
+    projects = {}
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                projects[(entry["url"], entry["email"], entry["org"], entry["project"])] = entry
+    return list(projects.values())
@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import hashlib
+
+from http_client import client
+from utils import get_signed_headers, write_json_atomically
+from response_decoder import decode_response
+from constants import TARGET_URL
+
+
+# synchronized projects kept between runs - one small .json file per project, so parallel workers never write the
+#   same file
+PROJECT_POOL_DIR = os.environ.get(
+    "SARA_PROJECT_POOL_DIR", os.path.join(os.path.expanduser("~"), ".cache", "sara", "projects"))
+
+is_pool_enabled = not os.environ.get("SARA_DISABLE_PROJECT_POOL")
+
+# SARA_REBUILD_PROJECTS forces every lease to rebuild - e.g. for a nightly run of the full discovery path
+is_rebuild_forced = bool(os.environ.get("SARA_REBUILD_PROJECTS"))
+
+
+class ProjectLease:
+    # a project a test can use - either reusable as-is (already synchronized at the current commit and service
+    #   version), or to be rebuilt by the test, which then calls synchronized() to return it to the pool
+
+    def __init__(self, pool, entry, reusable, reason):
+        self.pool = pool
+        self.entry = entry
+        self.reusable = reusable
+        self.reason = reason
+
+    @property
+    def project(self):
+        return self.entry["project"]
+
+    def synchronized(self):
+        self.entry["synchronizedAt"] = time.time()
+        self.entry["leases"] = 1
+        self.pool.save(self.entry)
+
+
+class ProjectPool:
+    # pool of synchronized projects keyed by (service url, user, org, project, repo) - an entry is only reused while
+    #   the repo's latest commit and the service version match the ones it was synchronized with, and the service
+    #   still reports the project as synchronized
+
+    def __init__(self, directory=PROJECT_POOL_DIR, enabled=is_pool_enabled, rebuild=is_rebuild_forced):
+        self.directory = directory
+        self.enabled = enabled
+        self.rebuild = rebuild
+
+        self.reused = 0
+        self.rebuilt = 0
+
+    def _path(self, base_url, email, org, project, repo):
+        key = hashlib.sha256(f"{base_url}\n{email}\n{org}\n{project}\n{repo}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".json")
+
+    def load(self, base_url, email, org, project, repo):
+        try:
+            with open(self._path(base_url, email, org, project, repo), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, entry):
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        write_json_atomically(self._path(entry["url"], entry["email"], entry["org"], entry["project"], entry["repo"]), entry)
+
+    def discard(self, entry):
+        try:
+            os.remove(self._path(entry["url"], entry["email"], entry["org"], entry["project"], entry["repo"]))
+        except OSError:
+            pass
+
+    def latest_commit(self, base_url, email, org, repo):
+        # via the service's GitHub connector, so private repos use the user's GitHub access
+        response = client.get(f"{base_url}/api/user/{org}/connectors/github/details", params={"uri": repo},
+                              headers=get_signed_headers(email))
+        if response.status_code != 200:
+            return None
+        return decode_response(response).get("lastCommitHash")
+
+    def service_version(self, base_url):
+        response = client.get(f"{base_url}/api/status")
+        if response.status_code != 200:
+            return None
+        return decode_response(response).get("version")
+
+    def is_synchronized(self, base_url, email, org, project):
+        # readOnly, so checking a pooled project never starts a refresh of it
+        response = client.get(f"{base_url}/api/user_project/{org}/{project}/status", params={"readOnly": ""},
+                              headers=get_signed_headers(email))
+        return response.status_code == 200 and decode_response(response).get("synchronized") is True
+
+    def lease(self, email, org, project, repo, base_url=TARGET_URL):
+        entry = {
+            "url": base_url,
+            "email": email,
+            "org": org,
+            "project": project,
+            "repo": repo,
+            "commit": None,
+            "version": None,
+        }
+        if not self.enabled:
+            # nothing will be reused, so don't spend requests on the commit or the service version
+            return ProjectLease(self, entry, False, "project pool is disabled")
+
+        entry["commit"] = self.latest_commit(base_url, email, org, repo)
+        entry["version"] = self.service_version(base_url)
+
+        reason = self._stale_reason(entry)
+        if reason is not None:
+            # the test is about to delete the project, so its old entry can't be leased by anyone else meanwhile
+            self.discard(entry)
+            self.rebuilt += 1
+            return ProjectLease(self, entry, False, reason)
+
+        pooled = self.load(base_url, email, org, project, repo)
+        entry["synchronizedAt"] = pooled["synchronizedAt"]
+        entry["leases"] = pooled.get("leases", 1) + 1
+        self.save(entry)
+        self.reused += 1
+        return ProjectLease(self, entry, True, f"synchronized at commit {entry['commit'][:12]} on version {entry['version']}")
+
+    def _stale_reason(self, entry):
+        # why a project has to be rebuilt - or None if the pooled one can be reused
+        if self.rebuild:
+            return "rebuild forced"
+        if entry["commit"] is None:
+            return "latest commit unavailable"
+        if entry["version"] is None:
+            return "service version unavailable"
+
+        pooled = self.load(entry["url"], entry["email"], entry["org"], entry["project"], entry["repo"])
+        if pooled is None:
+            return "not in the pool"
+        if pooled.get("commit") != entry["commit"]:
+            return f"repo changed from commit {(pooled.get('commit') or '')[:12]} to {entry['commit'][:12]}"
+        if pooled.get("version") != entry["version"]:
+            return f"service changed from version {pooled.get('version')} to {entry['version']}"
+        if not self.is_synchronized(entry["url"], entry["email"], entry["org"], entry["project"]):
+            return "project is no longer synchronized"
+        return None
+
+
+# process-wide pool shared by the tests
+project_pool = ProjectPool()
@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+
+import requests
+
+from http_client import client
+
+
+# where revalidatable responses are kept between runs - only used when a directory is explicitly configured, since
+#   cached resources include private project source (files are created owner read/write only)
+RESPONSE_CACHE_DIR = os.environ.get("SARA_RESPONSE_CACHE_DIR")
+
+is_cache_enabled = bool(RESPONSE_CACHE_DIR) and not os.environ.get("SARA_DISABLE_RESPONSE_CACHE")
+
+# the least recently used entries are evicted once the cached bodies exceed this size
+DEFAULT_RESPONSE_CACHE_MAX_MB = int(os.environ.get("SARA_RESPONSE_CACHE_MAX_MB", 256))
+
+HTTP_NOT_MODIFIED = 304
+
+
+class ResponseCache:
+    # on-disk cache of GET responses that carry an ETag or Last-Modified validator
+    #   entries are keyed by (url, email) - responses are per-user, so one user's copy is never served to another
+    #   each entry is a small .json metadata file (validators, headers) plus the raw .body bytes
+    #   the metadata file's mtime is the entry's last use, for LRU eviction
+
+    def __init__(self, directory=RESPONSE_CACHE_DIR, enabled=is_cache_enabled, max_bytes=DEFAULT_RESPONSE_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.enabled = enabled and bool(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _paths(self, url, email):
+        key = hashlib.sha256(f"{email or ''}\n{url}".encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def load(self, url, email):
+        # returns (metadata, body) - or (None, None) if there's no usable entry
+        meta_path, body_path = self._paths(url, email)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if meta.get("url") != url:
+            return None, None
+        return meta, body
+
+    def validators(self, url, email):
+        # the conditional request headers for a cached entry
+        meta, _ = self.load(url, email)
+        if meta is None:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("lastModified"):
+            headers["If-Modified-Since"] = meta["lastModified"]
+        return headers
+
+    def store(self, url, email, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+
+        meta = {
+            "url": url,
+            "etag": etag,
+            "lastModified": last_modified,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "storedAt": time.time(),
+        }
+        meta_path, body_path = self._paths(url, email)
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            # write the body first - a metadata file without its body is never treated as a hit
+            with os.fdopen(os.open(body_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+                f.write(response.content)
+            with os.fdopen(os.open(meta_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(meta, f)
+        except OSError:
+            # the cache is only an optimization
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        # remove the least recently used entries until the cached bodies fit in max_bytes
+        with self._lock:
+            try:
+                names = os.listdir(self.directory)
+            except OSError:
+                return
+            entries = []
+            total = 0
+            for name in names:
+                if not name.endswith(".body"):
+                    continue
+                base = os.path.join(self.directory, name[:-len(".body")])
+                try:
+                    size = os.path.getsize(base + ".body")
+                    # a body without metadata yet (being stored, or orphaned) ages from when it was written
+                    meta_path = base + ".json"
+                    last_used = os.path.getmtime(meta_path if os.path.exists(meta_path) else base + ".body")
+                except OSError:
+                    continue
+                entries.append((last_used, size, base))
+                total += size
+
+            for last_used, size, base in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for path in [base + ".json", base + ".body"]:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+
+    def invalidate(self, url, email):
+        for path in self._paths(url, email):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def response_from_cache(self, url, email, not_modified_response):
+        # rebuild the full 200 response for a 304 - None if the entry vanished in the meantime
+        meta, body = self.load(url, email)
+        if meta is None:
+            return None
+
+        response = requests.models.Response()
+        response.status_code = 200
+        response.headers.update(meta.get("headers", {}))
+        # the 304 carries the current validators
+        for header in ["ETag", "Last-Modified", "Cache-Control", "Date"]:
+            if header in not_modified_response.headers:
+                response.headers[header] = not_modified_response.headers[header]
+        response._content = body
+        response.encoding = meta.get("encoding")
+        response.url = url
+        response.request = not_modified_response.request
+        response.elapsed = not_modified_response.elapsed
+        response.from_cache = True
+
+        try:
+            # mark the entry as recently used
+            os.utime(self._paths(url, email)[0])
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(body)
+        return response
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytesSaved": self.bytes_saved,
+            }
+
+    def print_stats(self):
+        stats = self.stats()
+        print(f"Response Cache: {stats['hits']} revalidated (304), {stats['misses']} downloaded - "
+              f"{stats['bytesSaved'] / (1024 * 1024):.2f} MB not re-downloaded")
+
+
+response_cache = ResponseCache()
+
+if os.environ.get("SARA_RESPONSE_CACHE_STATS"):
+    atexit.register(response_cache.print_stats)
+
+
+def conditional_get(url, headers=None, email=None, cache=None, http=None, **kwargs):
+    # GET a url, revalidating any cached copy with If-None-Match / If-Modified-Since
+    #   a 304 is returned to the caller as the cached 200 response, so callers don't need to handle it
+    cache = cache if cache is not None else response_cache
+    http = http if http is not None else client
+
+    if not cache.enabled:
+        return http.get(url, headers=headers, **kwargs)
+
+    request_headers = dict(headers) if headers else {}
+    request_headers.update(cache.validators(url, email))
+
+    response = http.get(url, headers=request_headers, **kwargs)
+
+    if response.status_code == HTTP_NOT_MODIFIED:
+        cached_response = cache.response_from_cache(url, email, response)
+        if cached_response is not None:
+            return cached_response
+        # lost the cached copy - fetch it again without validators
+        response = http.get(url, headers=headers, **kwargs)
+
+    if response.status_code == 200:
+        cache.record_miss()
+        cache.store(url, email, response)
+    return response
@@ -0,0 +1,71 @@
+import json
+import time
+
+# use a faster JSON parser when one is installed - falls back to the standard library
+try:
+    import orjson
+
+    def loads(data):
+        return orjson.loads(data)
+
+    json_backend = "orjson"
+except ImportError:
+    def loads(data):
+        return json.loads(data)
+
+    json_backend = "json"
+
+
+def unwrap_envelope(response_obj):
+    # Lambda function URL responses may wrap the real payload in a {"body": "..."} envelope
+    #   a JSON body is parsed (once) - any other body is returned as the raw string
+    if not isinstance(response_obj, dict) or 'body' not in response_obj:
+        return response_obj
+
+    body = response_obj['body']
+    if isinstance(body, str) and len(body) > 0 and body[0] in ['{', '[']:
+        return loads(body)
+    return body
+
+
+def decode_response(response):
+    # parse a requests.Response a single time and unwrap the Lambda envelope
+    #   if running locally - the result will be a string, but if running remotely, the result will be a JSON object for HTTP frame
+    #   non-JSON responses are returned as text; the result is memoized on the response so repeat calls are free
+    cached = getattr(response, "_sara_decoded", None)
+    if cached is not None:
+        return cached[0]
+
+    start = time.perf_counter()
+    try:
+        decoded = unwrap_envelope(loads(response.content))
+    except ValueError:
+        decoded = response.text
+
+    # timed requests (see timing.py) count the parse as their decode phase
+    seconds = time.perf_counter() - start
+    timing = getattr(response, "timing", None)
+    if timing is not None:
+        timing.add_decode(time.time() - seconds, seconds)
+
+    response._sara_decoded = (decoded,)
+    return decoded
+
+
+def decode_text(response):
+    # the raw (unwrapped) text payload of a response - for resources that are plain text rather than JSON
+    cached = getattr(response, "_sara_decoded_text", None)
+    if cached is not None:
+        return cached
+
+    text = response.text
+    if len(text) > 0 and text[0] == '{':
+        try:
+            response_obj = loads(response.content)
+            if isinstance(response_obj, dict) and 'body' in response_obj:
+                text = response_obj['body']
+        except ValueError:
+            pass
+
+    response._sara_decoded_text = text
+    return text
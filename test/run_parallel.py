@@ -0,0 +1,184 @@
+import os
+import sys
+import json
+import time
+import queue
+import uuid
+import argparse
+import tempfile
+import threading
+import subprocess
+import unittest
+
+from constants import TARGET_URL, all_stages
+from namespaces import registered_projects
+from fixtures import cleanup_projects, DEFAULT_CLEANUP_CONCURRENCY
+
+
+# runs the suites across parallel worker processes - each worker gets its own project namespace (see namespaces.py)
+#   so tests that delete and recreate 'their' project can't collide, and the run is bounded by the slowest worker's
+#   synchronization waits instead of the sum of everyone's
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_WORKERS = 4
+
+DEFAULT_SUITES = ["test_unit", "test_unit_github", "test_negative", "test_checkin", "test_e2e"]
+
+granularities = ["module", "class", "test"]
+
+# lines of a failed job's output to show in the summary
+FAILURE_OUTPUT_LINES = 40
+
+
+def flatten(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from flatten(test)
+        else:
+            yield test
+
+
+def shard(modules, granularity):
+    # the unittest names each worker job runs - whole modules, test classes, or single tests
+    if granularity == "module":
+        return list(modules)
+
+    jobs = []
+    for module in modules:
+        for test in flatten(unittest.TestLoader().loadTestsFromName(module)):
+            test_id = test.id()
+            job = test_id.rsplit(".", 1)[0] if granularity == "class" else test_id
+            if job not in jobs:
+                jobs.append(job)
+    return jobs
+
+
+def schedule(jobs, timings):
+    # longest first (by the previous run's durations) so a slow job doesn't start last - jobs never timed before
+    #   go first, since they could be the slowest
+    return sorted(jobs, key=lambda job: -timings.get(job, float("inf")))
+
+
+def run_job(job, namespace, registry, log_path, base_url):
+    env = dict(os.environ, SARA_TEST_NAMESPACE=namespace, SARA_TEST_REGISTRY=registry, SARA_TARGET_URL=base_url)
+    start = time.perf_counter()
+    with open(log_path, "w") as log:
+        completed = subprocess.run([sys.executable, "-m", "unittest", job], cwd=test_dir, env=env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+    return completed.returncode, time.perf_counter() - start
+
+
+def run_jobs(jobs, workers, run_id, work_dir, base_url):
+    # each worker thread owns one namespace and runs its jobs one at a time - returns job -> (worker, exit code, seconds)
+    pending = queue.Queue()
+    for job in jobs:
+        pending.put(job)
+
+    results = {}
+    lock = threading.Lock()
+
+    def worker(index):
+        namespace = f"{run_id}-w{index}"
+        registry = os.path.join(work_dir, f"projects-w{index}.jsonl")
+        while True:
+            try:
+                job = pending.get_nowait()
+            except queue.Empty:
+                return
+            returncode, seconds = run_job(job, namespace, registry, os.path.join(work_dir, f"{job}.log"), base_url)
+            with lock:
+                results[job] = (index, returncode, seconds)
+                print(f"[w{index}] {'PASS' if returncode == 0 else 'FAIL'} {seconds:8.1f}s  {job}", flush=True)
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(min(workers, len(jobs)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def cleanup(work_dir, concurrency):
+    registries = [os.path.join(work_dir, name) for name in sorted(os.listdir(work_dir)) if name.endswith(".jsonl")]
+    projects = registered_projects(registries)
+    if not projects:
+        print("\nNo namespaced projects to clean up")
+        return True
+
+    start = time.perf_counter()
+    failed = cleanup_projects(projects, concurrency)
+    print(f"\nDeleted {len(projects) - len(failed)} of {len(projects)} namespaced projects in {time.perf_counter() - start:.1f}s")
+    for entry in failed:
+        print(f"    left behind: {entry['org']}/{entry['project']} ({entry['email']} on {entry['url']})")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the test suites across parallel workers, each in its own project namespace.")
+    parser.add_argument("suites", nargs="*", default=DEFAULT_SUITES, help=f"Test modules to run (default: {' '.join(DEFAULT_SUITES)})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Parallel workers (default: {DEFAULT_WORKERS}) - 1 runs serially")
+    parser.add_argument("--granularity", choices=granularities, default="class", help="Unit of work handed to a worker (default: class)")
+    parser.add_argument("--url", default=None, help=f"Service URL (default: {TARGET_URL})")
+    parser.add_argument("--stage", choices=list(all_stages.keys()), default=None, help="Target a stage instead of --url")
+    parser.add_argument("--run-id", default=None, help="Namespace prefix for the run (default: random)")
+    parser.add_argument("--work-dir", default=None, help="Directory for job logs and project registries (default: a new temporary directory)")
+    parser.add_argument("--timings", default=None, help="JSON file of job durations - read to schedule the slowest jobs first, then updated")
+    parser.add_argument("--keep", action='store_true', help="Leave the namespaced projects in place")
+    parser.add_argument("--cleanup", default=None, metavar="WORK_DIR", help="Only delete the projects registered by an earlier run's work directory")
+    parser.add_argument("--cleanup-concurrency", type=int, default=DEFAULT_CLEANUP_CONCURRENCY, help=f"Concurrent project deletes (default: {DEFAULT_CLEANUP_CONCURRENCY})")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        sys.exit(0 if cleanup(args.cleanup, args.cleanup_concurrency) else 1)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    base_url = all_stages[args.stage] if args.stage else args.url if args.url else TARGET_URL
+    run_id = args.run_id if args.run_id else f"r{uuid.uuid4().hex[:6]}"
+    work_dir = args.work_dir if args.work_dir else tempfile.mkdtemp(prefix=f"sara-{run_id}-")
+    os.makedirs(work_dir, exist_ok=True)
+
+    timings = {}
+    if args.timings and os.path.exists(args.timings):
+        with open(args.timings, "r") as f:
+            timings = json.load(f)
+
+    jobs = schedule(shard(args.suites, args.granularity), timings)
+    print(f"Running {len(jobs)} jobs ({args.granularity} granularity) on {min(args.workers, len(jobs))} workers "
+          f"against {base_url} - namespace {run_id}-w<n>, logs in {work_dir}\n", flush=True)
+
+    start = time.perf_counter()
+    results = run_jobs(jobs, args.workers, run_id, work_dir, base_url)
+    wall_clock = time.perf_counter() - start
+
+    failures = [job for job in jobs if results[job][1] != 0]
+    for job in failures:
+        with open(os.path.join(work_dir, f"{job}.log"), "r") as f:
+            lines = f.read().splitlines()
+        print(f"\n==== FAIL {job} (worker {results[job][0]}) - last {FAILURE_OUTPUT_LINES} lines of output ====")
+        print("\n".join(lines[-FAILURE_OUTPUT_LINES:]))
+
+    # serial time is estimated as the sum of the job durations - each measured while sharing the service with the
+    #   other workers, so contention inflates it; --workers 1 measures a true serial baseline
+    serial = sum(seconds for _, _, seconds in results.values())
+    print(f"\n{len(jobs) - len(failures)} of {len(jobs)} jobs passed - {wall_clock:.1f}s wall clock on "
+          f"{min(args.workers, len(jobs))} workers vs {serial:.1f}s serial, {serial / wall_clock if wall_clock else 0:.2f}x speedup")
+
+    if args.timings:
+        timings.update({job: seconds for job, (_, _, seconds) in results.items()})
+        with open(args.timings, "w") as f:
+            json.dump(timings, f, indent=2)
+
+    cleaned = True
+    if args.keep:
+        print(f"\nNamespaced projects kept - delete them later with --cleanup {work_dir}")
+    else:
+        cleaned = cleanup(work_dir, args.cleanup_concurrency)
+
+    sys.exit(1 if failures or not cleaned else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,970 @@
+import re
+import sys
+import json
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+import email.utils
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import jwt
+
+
+# an in-process stand-in for the Boost service - serves the routes used by sara_rest_cli.py and the test suites
+#   from in-memory storage, with injectable latency and errors, so client-side behavior (pooling, batching,
+#   polling, caching) can be exercised and benchmarked deterministically without AWS, GitHub or OpenAI
+
+STAND_IN_VERSION = "0.0.0-stand-in"
+
+LOCAL_ADMIN_EMAIL = "root@localhost"
+
+# the service caps a long-poll just under the request timeout
+LONG_POLL_MAXIMUM_SECONDS = 20
+
+DEFAULT_SEARCH_PAGE_SIZE = 100
+MAXIMUM_SEARCH_PAGE_SIZE = 1000
+
+# must match src/types/ProjectStatus.ts
+STATUS_MISSING = "Resources Missing"
+STATUS_INCOMPLETE = "Resources Incomplete"
+STATUS_IN_ERROR = "Resources In Error"
+STATUS_GENERATING = "Resources Generating"
+STATUS_NOT_SYNCHRONIZED = "Resources Not Synchronized"
+STATUS_SYNCHRONIZED = "Fully Synchronized"
+STATUS_UNKNOWN = "Unknown"
+
+# the stages each generator walks through - must match src/generators
+GENERATOR_STAGES = {
+    "projectsource": ["Static Default", "Retrieve Source Sync Points", "File Paths Scan", "Full Source Code Import"],
+    "blueprint": ["Static Default", "File Import", "Source Language Scan", "File Scan", "Sampled Code", "Building Blueprint"],
+    "aispec": ["Static Default", "Identifying Files for Summarization", "Summarization of Files using AI"],
+}
+STAGE_COMPLETE = "Complete"
+
+RESOURCE_FILENAMES = {
+    "projectsource": "allfiles_combined.md",
+    "blueprint": "blueprint.md",
+    "aispec": "aispec.md",
+}
+
+# latency and error presets - 'routes' overrides the defaults for individual routes (named as in ROUTES, plus
+#   'generator_stage' for failures while a generator processes a stage)
+PROFILES = {
+    # no added latency or errors - the client's own overhead
+    "instant": {},
+    # a local serverless instance
+    "local": {"latency": 0.005, "jitter": 0.005, "stage_seconds": 0.05},
+    # roughly a deployed stage - warm Lambda round trips, slow GitHub downloads and generator stages
+    "lambda": {"latency": 0.08, "jitter": 0.04, "stage_seconds": 1.0,
+               "routes": {"github_fullsource": {"latency": 1.5}, "generator_process": {"latency": 0.5}}},
+    # a stage under load - throttling and occasional server errors
+    "flaky": {"latency": 0.02, "jitter": 0.02, "stage_seconds": 0.1, "error_rate": 0.05, "error_statuses": [429, 500, 503]},
+}
+
+
+class StandInProfile:
+    # injectable latency and errors - each request waits latency + uniform(0, jitter) seconds, then fails with one
+    #   of error_statuses with probability error_rate; seeded, so a run can be reproduced exactly
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_statuses=None, stage_seconds=0.0,
+                 routes=None, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses) if error_statuses else [500]
+        # time each generator stage takes to process
+        self.stage_seconds = stage_seconds
+        self.routes = routes or {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def named(cls, name, seed=None, **overrides):
+        if name not in PROFILES:
+            raise ValueError(f"Unknown profile {name} - choose from {', '.join(PROFILES)}")
+        return cls(**{**PROFILES[name], **overrides}, seed=seed)
+
+    def _setting(self, route, name):
+        return self.routes.get(route, {}).get(name, getattr(self, name))
+
+    def delay(self, route):
+        latency = self._setting(route, "latency")
+        jitter = self._setting(route, "jitter")
+        with self._lock:
+            return latency + (self._random.uniform(0, jitter) if jitter > 0 else 0)
+
+    def error(self, route):
+        # an injected error status for this request - or None
+        error_rate = self._setting(route, "error_rate")
+        if error_rate <= 0:
+            return None
+        with self._lock:
+            if self._random.random() >= error_rate:
+                return None
+            return self._random.choice(self._setting(route, "error_statuses"))
+
+
+def normalize_email(email):
+    # same normalization as the service (src/auth.ts)
+    email = email.lower()
+    return re.sub(r"@polytest\.ai$", "@polyverse.com", email)
+
+
+def content_etag(content):
+    # same strong validator as the service (src/utility/conditional.ts) - sha1 of the serialized content
+    serialized = content if isinstance(content, str) else json.dumps(content, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha1(serialized.encode("utf-8")).digest()
+    return '"' + base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=") + '"'
+
+
+def repo_from_uri(uri):
+    # (repo uri, path within the repo) for a GitHub uri - or (None, None) if it isn't one
+    parts = urlsplit(uri)
+    if not parts.hostname or not parts.hostname.endswith("github.com"):
+        return None, None
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if len(segments) < 2:
+        return None, None
+    path = "/".join(segments[4:]) if len(segments) > 4 and segments[2] == "blob" else ""
+    return f"https://github.com/{segments[0]}/{segments[1]}", path
+
+
+def synthetic_repo(uri, files=40, file_bytes=2048):
+    # a deterministic source tree for a repository that hasn't been added to the store
+    seed = int(hashlib.sha1(uri.encode("utf-8")).hexdigest()[:8], 16)
+    sources = {"README.md": f"# {uri.rsplit('/', 1)[-1]}\n\nStand-in repository for {uri}\n"}
+    for index in range(files):
+        path = f"src/package_{index % 5}/module_{index}.py"
+        line = f"def function_{seed % 1000}_{index}(value):\n    return value * {index + 1}\n\n"
+        sources[path] = (line * (file_bytes // len(line) + 1))[:file_bytes]
+    return sources
+
+
+class StandInStore:
+    # in-memory service state - projects, status, generators, resources and data references per (user, org, project)
+    #   every change notifies waiting long-polls
+
+    def __init__(self, profile=None, version=STAND_IN_VERSION):
+        self.profile = profile or StandInProfile()
+        self.version = version
+        self.projects = {}
+        self.statuses = {}
+        self.discoveries = {}
+        self.generators = {}
+        self.resources = {}
+        self.data_references = {}
+        self.accounts = {}
+        self.repos = {}
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._file_ids = 0
+
+    # seeding
+    def add_repo(self, uri, files):
+        # files as {path: source}
+        with self._lock:
+            self.repos[uri.rstrip("/")] = dict(files)
+
+    def repo(self, uri):
+        with self._lock:
+            if uri not in self.repos:
+                self.repos[uri] = synthetic_repo(uri)
+            return self.repos[uri]
+
+    def add_project(self, email, org, project, uri, synchronized=True):
+        # a project as if it had been created and fully synchronized (or just created, with synchronized=False)
+        email = normalize_email(email)
+        key = (email, org, project)
+        with self._lock:
+            self.projects[key] = self._new_project(org, project, {"resources": [{"uri": uri}]})
+            if synchronized:
+                for resource in GENERATOR_STAGES:
+                    self._complete_resource(key, resource)
+                self._synchronize(key)
+            self._refresh_status(key)
+        return self.projects[key]
+
+    def set_account(self, email, **fields):
+        with self._lock:
+            self.accounts.setdefault(normalize_email(email), {}).update(fields)
+
+    # projects
+    def _new_project(self, org, project, body):
+        return {
+            "org": org,
+            "name": project,
+            "title": body.get("title") or "",
+            "description": body.get("description") or "",
+            "guidelines": body.get("guidelines") or [],
+            "resources": body.get("resources") or [],
+            "lastUpdated": time.time(),
+        }
+
+    def put_project(self, key, body):
+        with self._lock:
+            self.projects[key] = self._new_project(key[1], key[2], body)
+            self._refresh_status(key)
+            self.discover(key, {"resetResources": True, "requestor": "ProjectCreation"})
+            return self.projects[key]
+
+    def update_project(self, key, body):
+        with self._lock:
+            project = self.projects[key]
+            for field in ["resources", "guidelines", "title", "description"]:
+                if field in body:
+                    project[field] = body[field]
+            project["lastUpdated"] = time.time()
+            if "resources" in body or "guidelines" in body:
+                self.discover(key, {"resetResources": True, "requestor": "ProjectCreation"})
+            self._notify()
+
+    def delete_project(self, key):
+        with self._lock:
+            for table in [self.projects, self.statuses, self.discoveries, self.data_references]:
+                table.pop(key, None)
+            for resource in GENERATOR_STAGES:
+                self.generators.pop(key + (resource,), None)
+                self.resources.pop(key + (resource,), None)
+            self._notify()
+
+    def project_repo(self, key):
+        resources = self.projects[key].get("resources") or []
+        return repo_from_uri(resources[0]["uri"])[0] if resources else None
+
+    # discovery and generators
+    def discover(self, key, state):
+        with self._lock:
+            if state.get("resetResources"):
+                for resource in GENERATOR_STAGES:
+                    self.resources.pop(key + (resource,), None)
+                    self.generators.pop(key + (resource,), None)
+                self.data_references.pop(key, None)
+            self.discoveries[key] = {"resetResources": bool(state.get("resetResources")),
+                                     "requestor": state.get("requestor", "UserManual"),
+                                     "version": self.version, "lastUpdated": time.time()}
+            for resource in GENERATOR_STAGES:
+                self.start_generator(key, resource)
+            return self.discoveries[key]
+
+    def generator(self, key, resource):
+        with self._lock:
+            return dict(self.generators.get(key + (resource,), {"status": "idle"}))
+
+    def _set_generator(self, key, resource, **state):
+        stages = GENERATOR_STAGES[resource]
+        stage = state.get("stage")
+        processed = stages.index(stage) if stage in stages else len(stages) if stage == STAGE_COMPLETE else 0
+        self.generators[key + (resource,)] = {
+            "lastUpdated": time.time(),
+            "processedStages": processed,
+            "possibleStagesRemaining": len(stages) - processed,
+            **state,
+        }
+        self._refresh_status(key)
+
+    def start_generator(self, key, resource):
+        # walk the generator through its stages in the background - like the service's self-dispatched stages
+        with self._lock:
+            if self.generators.get(key + (resource,), {}).get("status") == "processing":
+                return self.generator(key, resource)
+            self._set_generator(key, resource, status="processing", stage=GENERATOR_STAGES[resource][0])
+        threading.Thread(target=self._run_generator, args=(key, resource), daemon=True).start()
+        return self.generator(key, resource)
+
+    def stop_generator(self, key, resource, status="idle"):
+        with self._lock:
+            current = self.generators.get(key + (resource,), {})
+            self._set_generator(key, resource, status=status, stage=current.get("stage", STAGE_COMPLETE))
+
+    def _run_generator(self, key, resource):
+        stage = GENERATOR_STAGES[resource][0]
+        while stage != STAGE_COMPLETE:
+            time.sleep(self.profile.stage_seconds)
+            with self._lock:
+                # the project was deleted, or the generator was stopped, while this stage ran
+                current = self.generators.get(key + (resource,))
+                if key not in self.projects or current is None or current.get("status") != "processing":
+                    return
+                try:
+                    stage = self._process(key, resource, stage)
+                except Exception as error:
+                    self._set_generator(key, resource, status="error", stage=stage, statusDetails=str(error))
+                    return
+                if stage != STAGE_COMPLETE:
+                    self._set_generator(key, resource, status="processing", stage=stage)
+        with self._lock:
+            if key in self.projects and all(key + (name,) in self.resources for name in GENERATOR_STAGES):
+                self._synchronize(key)
+
+    def _process(self, key, resource, stage):
+        # complete one stage - returns the next stage
+        stages = GENERATOR_STAGES[resource]
+        if stage == STAGE_COMPLETE:
+            return STAGE_COMPLETE
+        if stage not in stages:
+            raise ValueError(f"Invalid stage {stage} for {resource}")
+        if self.profile.error("generator_stage") is not None:
+            raise Exception(f"Injected failure in {resource} stage {stage}")
+        next_stage = stages[stages.index(stage) + 1] if stage != stages[-1] else STAGE_COMPLETE
+        if next_stage == STAGE_COMPLETE:
+            self._complete_resource(key, resource)
+        return next_stage
+
+    def process_stage(self, key, resource, stage):
+        # run a single stage synchronously - the generator/process route
+        time.sleep(self.profile.stage_seconds)
+        with self._lock:
+            if stage is None:
+                stage = self.generators.get(key + (resource,), {}).get("stage", GENERATOR_STAGES[resource][0])
+            next_stage = self._process(key, resource, stage)
+            status = "idle" if next_stage == STAGE_COMPLETE else "processing"
+            self._set_generator(key, resource, status=status, stage=next_stage)
+            return next_stage
+
+    def _complete_resource(self, key, resource):
+        repo = self.repo(self.project_repo(key)) if self.project_repo(key) else {}
+        if resource == "projectsource":
+            content = "".join(f"\n\n# File: {path}\n\n{source}" for path, source in sorted(repo.items()))
+        elif resource == "blueprint":
+            content = f"# Architectural Blueprint\n\n{len(repo)} files\n\n" + "".join(f"* {path}\n" for path in sorted(repo))
+        else:
+            content = "# AI Specification\n\n" + "".join(f"## {path}\n\nSummary of {len(source)} characters\n\n"
+                                                         for path, source in sorted(repo.items()))
+        self.resources[key + (resource,)] = {"content": content, "lastUpdated": time.time()}
+        self._set_generator(key, resource, status="idle", stage=STAGE_COMPLETE)
+
+    def resource(self, key, resource):
+        with self._lock:
+            return self.resources.get(key + (resource,))
+
+    def delete_resource(self, key, resource):
+        with self._lock:
+            self.resources.pop(key + (resource,), None)
+            self._refresh_status(key)
+
+    # data references
+    def _synchronize(self, key):
+        # 'upload' the generated resources - like the service does once all resources are complete
+        references = []
+        for resource in GENERATOR_STAGES:
+            stored = self.resources.get(key + (resource,))
+            if stored is None:
+                continue
+            self._file_ids += 1
+            references.append({"name": RESOURCE_FILENAMES[resource], "type": resource,
+                               "id": f"file-standin{self._file_ids:08d}", "lastUpdated": stored["lastUpdated"]})
+        self.data_references[key] = references
+        self._refresh_status(key)
+        return references
+
+    def synchronize(self, key):
+        with self._lock:
+            return self._synchronize(key)
+
+    def references(self, key):
+        with self._lock:
+            return self.data_references.get(key)
+
+    def delete_references(self, key):
+        with self._lock:
+            self.data_references.pop(key, None)
+            self._refresh_status(key)
+
+    # status
+    def _refresh_status(self, key):
+        if key not in self.projects:
+            return None
+        generators = [self.generators.get(key + (resource,), {}) for resource in GENERATOR_STAGES]
+        generated = [key + (resource,) in self.resources for resource in GENERATOR_STAGES]
+        references = self.data_references.get(key)
+        if any(generator.get("status") == "error" for generator in generators):
+            status = STATUS_IN_ERROR
+        elif any(generator.get("status") == "processing" for generator in generators):
+            status = STATUS_GENERATING
+        elif all(generated) and references and len(references) == len(generated):
+            status = STATUS_SYNCHRONIZED
+        elif all(generated):
+            status = STATUS_NOT_SYNCHRONIZED
+        elif any(generated):
+            status = STATUS_INCOMPLETE
+        else:
+            status = STATUS_MISSING
+
+        now = time.time()
+        previous = self.statuses.get(key, {})
+        self.statuses[key] = {
+            "status": status,
+            "synchronized": status == STATUS_SYNCHRONIZED,
+            "activelyUpdating": status == STATUS_GENERATING,
+            "lastSynchronized": now if status == STATUS_SYNCHRONIZED else previous.get("lastSynchronized"),
+            "processedStages": sum(generator.get("processedStages", 0) for generator in generators),
+            "possibleStagesRemaining": sum(generator.get("possibleStagesRemaining", 0) for generator in generators),
+            "childResources": sum(generated),
+            "details": f"{sum(generated)} of {len(generated)} resources generated",
+            "lastUpdated": now,
+            "version": self.version,
+        }
+        self._notify()
+        return self.statuses[key]
+
+    def status(self, key, refresh=False):
+        with self._lock:
+            if refresh or key not in self.statuses:
+                return dict(self._refresh_status(key) or {})
+            return dict(self.statuses[key])
+
+    def _notify(self):
+        self._changed.notify_all()
+
+    def wait_for(self, load, state_of, states, timeout):
+        # long-poll - re-load after every change until the state is one of 'states' or the timeout passes
+        deadline = time.time() + timeout
+        with self._lock:
+            value = load()
+            while not any(state in states for state in state_of(value)):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+                value = load()
+            return value
+
+    # search
+    def search(self, table, user=None, org=None, project=None):
+        # (key, value) pairs in a stable order, for admin searches
+        with self._lock:
+            return [(key, value) for key, value in sorted(table.items())
+                    if (user is None or key[0] == user) and (org is None or key[1] == org) and
+                    (project is None or key[2] == project)]
+
+
+def project_states(status):
+    # the summary states a project status long-poll can wait for - mirrors the service
+    states = [status.get("status", "").lower()]
+    if status.get("synchronized"):
+        states.append("synchronized")
+    if not status.get("activelyUpdating"):
+        states.append("idle")
+    if status.get("status") == STATUS_IN_ERROR:
+        states.append("error")
+    return states
+
+
+class StandInError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# route name, verbs, path pattern - names are used for per-route profile settings and request counts
+ROUTES = [
+    ("test", ["GET", "POST", "PATCH"], r"/test"),
+    ("version", ["GET"], r"/api/status"),
+    ("account", ["GET", "PATCH"], r"/api/user/(?P<org>[^/]+)/account"),
+    ("org_account", ["GET"], r"/api/org/(?P<org>[^/]+)/account"),
+    ("github", ["GET"], r"/api/user/(?P<org>[^/]+)/connectors/github/(?P<connector>file|files|folders|fullsource|access|details)"),
+    ("search_projects", ["GET"], r"/api/search/projects"),
+    ("search_status", ["GET"], r"/api/search/projects/status"),
+    ("search_generators", ["GET"], r"/api/search/projects/generators"),
+    ("projects", ["GET"], r"/api/user_project/(?P<org>[^/]+)/projects"),
+    ("status", ["GET", "POST", "DELETE"], r"/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)/status"),
+    ("discovery", ["GET", "POST", "DELETE"], r"/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)/discovery"),
+    ("data_references", ["GET", "POST", "PUT", "DELETE"], r"/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)/data_references/?"),
+    ("generator_process", ["POST"], r"/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)/data/(?P<resource>[^/]+)/generator/process"),
+    ("generator", ["GET", "POST", "PUT", "PATCH", "DELETE"], r"/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)/data/(?P<resource>[^/]+)/generator"),
+    ("resource_status", ["GET"], r"/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)/data/(?P<resource>[^/]+)/status"),
+    ("resource", ["GET", "DELETE"], r"/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)/data/(?P<resource>[^/]+)/?"),
+    ("project", ["GET", "POST", "PUT", "PATCH", "DELETE"], r"/api/user_project/(?P<org>[^/]+)/(?P<project>[^/]+)"),
+]
+COMPILED_ROUTES = [(name, verbs, re.compile(pattern + "$")) for name, verbs, pattern in ROUTES]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive - every response carries a Content-Length
+    protocol_version = "HTTP/1.1"
+    server_version = "BoostStandIn"
+    # headers and body are separate writes - without TCP_NODELAY, a kept-alive connection adds ~40ms of delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            sys.stderr.write(f"{self.address_string()} - {format % args}\n")
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        self._dispatch()
+
+    def do_PUT(self):
+        self._dispatch()
+
+    def do_PATCH(self):
+        self._dispatch()
+
+    def do_DELETE(self):
+        self._dispatch()
+
+    # responses
+    def _send(self, status, body=b"", content_type="application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+        elif isinstance(body, str):
+            body = body.encode("utf-8")
+        # a 204 or 304 never has a body
+        if status in [204, 304]:
+            body = b""
+        self.send_response(status)
+        if body or status not in [204, 304]:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        # same shape as the service's Server-Timing - the injected latency stands in for its downstream calls
+        started = getattr(self, "started", None)
+        if started is not None:
+            self.send_header("Server-Timing", f'latency;dur={self.injected * 1000:.1f};desc="injected", '
+                                              f'total;dur={(time.perf_counter() - started) * 1000:.1f}')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_conditional(self, content, last_updated, content_type="application/json"):
+        # ETag / Last-Modified validators and 304s - same rules as the service (If-None-Match wins)
+        etag = content_etag(content)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if last_updated:
+            headers["Last-Modified"] = email.utils.formatdate(last_updated, usegmt=True)
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            not_modified = any(tag.strip().replace("W/", "", 1) in ["*", etag] for tag in if_none_match.split(","))
+        else:
+            since = self.headers.get("If-Modified-Since")
+            parsed = email.utils.parsedate_to_datetime(since).timestamp() if since else None
+            not_modified = parsed is not None and last_updated is not None and int(last_updated) <= parsed
+        if not_modified:
+            self.server.count("notModified")
+            return self._send(304, headers=headers)
+        return self._send(200, content, content_type, headers)
+
+    # requests
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length > 0 else b""
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw.decode("utf-8", errors="replace")
+
+    def _json_body(self, required=True):
+        body = self.body
+        if body is None or body == "":
+            if required:
+                raise StandInError(400, "Missing body")
+            return {}
+        if not isinstance(body, dict):
+            raise StandInError(400, "Invalid JSON")
+        return body
+
+    def _email(self, admin=False):
+        token = self.headers.get("X-Signed-Identity")
+        authorization = self.headers.get("Authorization", "")
+        if not token and authorization.startswith("Bearer "):
+            token = authorization[len("Bearer "):]
+        if not token:
+            raise StandInError(401, "Unauthorized")
+        # the signature isn't checked - there's no service key here - but expiry is, like the service
+        try:
+            identity = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            raise StandInError(401, "Unauthorized")
+        if identity.get("expires") and identity["expires"] < time.time():
+            raise StandInError(401, "Unauthorized")
+        email_address = normalize_email(identity.get("email", ""))
+        if admin and email_address != LOCAL_ADMIN_EMAIL:
+            raise StandInError(401, "Unauthorized")
+        return email_address
+
+    def _dispatch(self):
+        self.started = time.perf_counter()
+        self.injected = 0.0
+        parts = urlsplit(self.path)
+        self.query = parse_qs(parts.query, keep_blank_values=True)
+        # always drain the body, so a kept-alive connection stays in sync even if the request fails
+        self.body = self._body()
+
+        for name, verbs, pattern in COMPILED_ROUTES:
+            match = pattern.match(parts.path)
+            if match:
+                break
+        else:
+            return self._send(404, f"Cannot {self.command} {parts.path}", "text/plain")
+        if self.command not in verbs:
+            return self._send(404, f"Cannot {self.command} {parts.path}", "text/plain")
+
+        # each github connector is its own route for profiles and counts - e.g. github_fullsource
+        route = f"{name}_{match.group('connector')}" if name == "github" else name
+
+        store = self.server.store
+        self.server.count("requests", route)
+        self.injected = store.profile.delay(route)
+        time.sleep(self.injected)
+        injected = store.profile.error(route)
+        if injected is not None:
+            self.server.count("injectedErrors")
+            headers = {"Retry-After": "1"} if injected == 429 else None
+            return self._send(injected, f"Injected {injected} for {route}", "text/plain", headers)
+
+        try:
+            params = {key: unquote(value) for key, value in match.groupdict().items()}
+            return getattr(self, f"_{name}")(store, **params)
+        except StandInError as error:
+            return self._send(error.status, str(error), "text/plain")
+        except Exception as error:
+            return self._send(500, f"Stand-in error: {error}", "text/plain")
+
+    def _param(self, name):
+        values = self.query.get(name)
+        return values[0] if values else None
+
+    def _project_key(self, store, org, project, must_exist=True):
+        key = (self._email(), org, project)
+        if must_exist and key not in store.projects:
+            raise StandInError(404, "Project not found")
+        return key
+
+    def _long_poll(self):
+        # (states, timeout) for ?waitFor=a|b&timeout=N - or None
+        wait_for = self._param("waitFor")
+        if not wait_for:
+            return None
+        states = [state.strip().lower() for state in re.split(r"[|,]", wait_for) if state.strip()]
+        timeout = self._param("timeout")
+        timeout = int(timeout) if timeout and timeout.isdigit() else LONG_POLL_MAXIMUM_SECONDS
+        return (states, min(timeout, LONG_POLL_MAXIMUM_SECONDS)) if states else None
+
+    def _paged(self, items):
+        # all items, or one {items, cursor} page for ?limit= / ?cursor= - cursors are offsets here
+        limit = self._param("limit")
+        cursor = self._param("cursor")
+        if limit is None and cursor is None:
+            return self._send(200, items)
+        if limit is not None and not re.match(r"^[1-9][0-9]*$", limit):
+            raise StandInError(400, "Invalid paging")
+        limit = min(int(limit), MAXIMUM_SEARCH_PAGE_SIZE) if limit else DEFAULT_SEARCH_PAGE_SIZE
+        start = int(cursor) if cursor and cursor.isdigit() else 0
+        page = items[start:start + limit]
+        return self._send(200, {"items": page, "cursor": str(start + limit) if start + limit < len(items) else None})
+
+    # routes
+    def _test(self, store):
+        if self.command == "GET":
+            return self._send(200, "Test HTTP GET Ack", "text/plain")
+        return self._send(200, f"Test HTTP {self.command} Ack: {self.body}", "text/plain")
+
+    def _version(self, store):
+        return self._send(200, {"version": store.version, "status": "available", "type": "stand-in"})
+
+    def _account(self, store, org):
+        email_address = self._email()
+        if self.command == "PATCH":
+            body = self._json_body()
+            if not body.get("githubUsername"):
+                raise StandInError(400, "Missing github username")
+            store.set_account(email_address, githubUsername=body["githubUsername"])
+            return self._send(200, body)
+        with store._lock:
+            account = {
+                "enabled": True, "status": "paid", "org": org, "owner": email_address, "plan": "premium",
+                "email": email_address, "billingUrl": "", "githubUsername": email_address.split("@")[0],
+                "backgroundAnalysisAuthorized": True, "details": "Stand-in account", "lastUpdated": time.time(),
+                **store.accounts.get(email_address, {}),
+            }
+        return self._send(200, account)
+
+    def _org_account(self, store, org):
+        self._email()
+        return self._send(200, {"enabled": True, "status": "trial", "plan": "free", "billingUrl": "", "adminUsername": "",
+                                "backgroundAnalysisAuthorized": True, "details": "Stand-in org account",
+                                "lastUpdated": time.time()})
+
+    def _github(self, store, org, connector):
+        self._email()
+        uri = self._param("uri")
+        if not uri:
+            raise StandInError(400, "Missing uri")
+        repo_uri, path = repo_from_uri(uri)
+        if repo_uri is None:
+            raise StandInError(400, "Invalid Resource - must be Github")
+        files = store.repo(repo_uri)
+        if connector == "access":
+            return self._send(200, True)
+        if connector == "details":
+            # the latest commit stands in as a hash of the repo's content, so it changes when the repo does
+            commit = hashlib.sha1(json.dumps(files, sort_keys=True).encode("utf-8")).hexdigest()
+            return self._send(200, {"data": {"uri": repo_uri, "private": False, "default_branch": "master"},
+                                    "lastCommitHash": commit})
+        if connector == "file":
+            path = self._param("path") or path
+            if path not in files:
+                raise StandInError(404, f"File not found: {path}")
+            return self._send(200, files[path], "text/plain", {"X-Resource-Access": "public"})
+        if connector == "files":
+            return self._send(200, sorted(files))
+        if connector == "folders":
+            folders = {"/".join(path.split("/")[:depth]) for path in files for depth in range(1, path.count("/") + 1)}
+            return self._send(200, sorted(folders))
+        return self._send(200, [{"path": path, "source": source} for path, source in sorted(files.items())])
+
+    def _search_projects(self, store):
+        self._email(admin=True)
+        results = store.search(store.projects, self._param("user"), self._param("org"), self._param("project"))
+        return self._paged([{**project, "owner": key[0]} for key, project in results])
+
+    def _search_status(self, store):
+        self._email(admin=True)
+        synchronized = self._param("synchronized")
+        results = store.search(store.statuses, self._param("user"), self._param("org"), self._param("project"))
+        items = [{**status, "owner": key[0], "org": key[1], "project": key[2]} for key, status in results
+                 if synchronized is None or status.get("synchronized") == (synchronized == "true")]
+        return self._paged(items)
+
+    def _search_generators(self, store):
+        self._email(admin=True)
+        resource = self._param("resource")
+        with store._lock:
+            items = [{**state, "owner": key[0], "org": key[1], "project": key[2], "resource": key[3]}
+                     for key, state in sorted(store.generators.items()) if resource is None or key[3] == resource]
+        return self._paged(items)
+
+    def _projects(self, store, org):
+        email_address = self._email()
+        results = store.search(store.projects, email_address, org)
+        return self._send(200, [{**project, "owner": key[0]} for key, project in results])
+
+    def _project(self, store, org, project):
+        if self.command in ["POST", "PUT"]:
+            key = self._project_key(store, org, project, must_exist=False)
+            body = self._json_body()
+            if not isinstance(body.get("guidelines", []), list):
+                raise StandInError(400, "Invalid guidelines - must be an array")
+            for resource in body.get("resources", []):
+                if repo_from_uri(resource.get("uri", ""))[0] is None:
+                    raise StandInError(400, "Invalid Resource - must be Github")
+            return self._send(200, store.put_project(key, body))
+
+        key = self._project_key(store, org, project)
+        if self.command == "PATCH":
+            store.update_project(key, self._json_body())
+            return self._send(200)
+        if self.command == "DELETE":
+            store.delete_project(key)
+            return self._send(200)
+        with store._lock:
+            return self._send(200, {**store.projects[key], "owner": key[0]})
+
+    def _status(self, store, org, project):
+        key = self._project_key(store, org, project)
+        if self.command == "DELETE":
+            with store._lock:
+                store.statuses.pop(key, None)
+            return self._send(200)
+        if self.command == "POST":
+            return self._send(200, store.status(key, refresh=True))
+
+        if "readOnly" in self.query and key not in store.statuses:
+            return self._send(202, {"status": STATUS_UNKNOWN, "lastUpdated": int(time.time())})
+        status = store.status(key)
+        long_poll = self._long_poll()
+        if long_poll:
+            status = store.wait_for(lambda: dict(store.statuses.get(key, status)), project_states, *long_poll)
+        return self._send_conditional(status, status.get("lastUpdated"))
+
+    def _discovery(self, store, org, project):
+        key = self._project_key(store, org, project)
+        if self.command == "POST":
+            return self._send(200, store.discover(key, self._json_body(required=False)))
+        if self.command == "DELETE":
+            with store._lock:
+                store.discoveries.pop(key, None)
+            return self._send(200)
+        with store._lock:
+            discovery = store.discoveries.get(key)
+        if discovery is None:
+            raise StandInError(404, "Discovery not found")
+        return self._send(200, discovery)
+
+    def _data_references(self, store, org, project):
+        key = self._project_key(store, org, project)
+        if self.command == "DELETE":
+            store.delete_references(key)
+            return self._send(200)
+        if not store.projects[key].get("resources"):
+            raise StandInError(400, "No resources found in project")
+        if self.command in ["POST", "PUT"]:
+            return self._send(200, store.synchronize(key))
+        references = store.references(key)
+        if references is None:
+            return self._send(204, [])
+        return self._send(200, references)
+
+    def _check_resource(self, resource):
+        if resource not in GENERATOR_STAGES:
+            raise StandInError(400, f"Invalid resource: {resource}")
+
+    def _generator(self, store, org, project, resource):
+        key = self._project_key(store, org, project)
+        self._check_resource(resource)
+        if self.command == "GET":
+            long_poll = self._long_poll()
+            if long_poll:
+                return self._send(200, store.wait_for(lambda: store.generator(key, resource),
+                                                      lambda state: [state.get("status")], *long_poll))
+            return self._send(200, store.generator(key, resource))
+        if self.command == "DELETE":
+            with store._lock:
+                store.generators.pop(key + (resource,), None)
+            return self._send(200)
+
+        body = self._json_body()
+        if body.get("status") == "processing":
+            return self._send(200, store.start_generator(key, resource))
+        if body.get("status") in ["idle", "error"]:
+            store.stop_generator(key, resource, body["status"])
+            return self._send(200, store.generator(key, resource))
+        raise StandInError(400, f"Invalid status: {body.get('status')}")
+
+    def _generator_process(self, store, org, project, resource):
+        key = self._project_key(store, org, project)
+        self._check_resource(resource)
+        body = self._json_body(required=False)
+        try:
+            return self._send(200, {"stage": store.process_stage(key, resource, body.get("stage"))})
+        except ValueError as error:
+            raise StandInError(400, str(error))
+
+    def _resource(self, store, org, project, resource):
+        key = self._project_key(store, org, project)
+        self._check_resource(resource)
+        if self.command == "DELETE":
+            store.delete_resource(key, resource)
+            return self._send(200)
+        stored = store.resource(key, resource)
+        if stored is None:
+            raise StandInError(404, f"Resource not found: {org}/{project}/data/{resource}")
+        return self._send_conditional(stored["content"], stored["lastUpdated"], "text/plain")
+
+    def _resource_status(self, store, org, project, resource):
+        key = self._project_key(store, org, project)
+        self._check_resource(resource)
+        stored = store.resource(key, resource)
+        if stored is None:
+            raise StandInError(404, f"Resource not found: {org}/{project}/data/{resource}")
+        return self._send(200, {"lastUpdated": stored["lastUpdated"]})
+
+
+class StandInServer(ThreadingHTTPServer):
+    # usage:
+    #   with StandInServer(profile=StandInProfile.named("lambda", seed=1)) as server:
+    #       server.store.add_project(EMAIL, ORG, "project", PUBLIC_PROJECT)
+    #       SaraClient(base_url=server.url, email=EMAIL) ...
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, profile=None, store=None, verbose=False):
+        super().__init__((host, port), StandInHandler)
+        self.store = store or StandInStore(profile)
+        self.verbose = verbose
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, counter, route=None):
+        with self._stats_lock:
+            self.counters[counter] = self.counters.get(counter, 0) + 1
+            if route is not None:
+                self.routes[route] = self.routes.get(route, 0) + 1
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.counters = {"requests": 0, "connections": 0, "notModified": 0, "injectedErrors": 0}
+            self.routes = {}
+
+    def stats(self):
+        # request and connection counts since the last reset - e.g. to check a client reuses connections or revalidates
+        with self._stats_lock:
+            return {**self.counters, "routes": dict(self.routes)}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an offline stand-in for the Boost service, with configurable latency and errors.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=3000, help="Port to listen on (default: 3000, the local stage)")
+    parser.add_argument("--profile", choices=list(PROFILES.keys()), default="instant", help="Latency and error preset (default: instant)")
+    parser.add_argument("--latency", type=float, default=None, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=None, help="Up to this many more seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=None, help="Fraction of requests that fail")
+    parser.add_argument("--error-statuses", default=None, help="Comma separated statuses for failed requests (default: 500)")
+    parser.add_argument("--stage-seconds", type=float, default=None, help="Seconds each generator stage takes")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed, to reproduce latency and errors")
+    parser.add_argument("--seed-project", action="append", default=[],
+                        help="Add a synchronized project as email,org,project,uri (repeatable)")
+    parser.add_argument("--verbose", action='store_true', help="Log every request")
+    args = parser.parse_args()
+
+    overrides = {name: value for name, value in [
+        ("latency", args.latency), ("jitter", args.jitter), ("error_rate", args.error_rate),
+        ("stage_seconds", args.stage_seconds),
+        ("error_statuses", [int(status) for status in args.error_statuses.split(",")] if args.error_statuses else None),
+    ] if value is not None}
+    profile = StandInProfile.named(args.profile, seed=args.seed, **overrides)
+
+    server = StandInServer(args.host, args.port, profile, verbose=args.verbose)
+    for seed_project in args.seed_project:
+        email_address, org, project, uri = seed_project.split(",", 3)
+        server.store.add_project(email_address, org, project, uri)
+
+    print(f"Stand-in service ({args.profile}) listening on {server.url} - Ctrl-C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{json.dumps(server.stats(), indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+import re
+import json
+import time
+import codecs
+
+
+# chunk size used when streaming response bodies
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# how much of a JSON object we'll buffer looking for the Lambda "body" key before treating the stream as raw
+ENVELOPE_DETECTION_LIMIT = 64 * 1024
+
+# longest run of complete JSON string content - plain characters and complete escapes
+_STRING_CONTENT = re.compile(r'(?:[^"\\]+|\\u[0-9a-fA-F]{4}|\\["\\/bfnrt])*')
+_HIGH_SURROGATE_ESCAPE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}$')
+
+_string_decoder = json.JSONDecoder(strict=False)
+
+
+def _is_escape_start(text, index):
+    # a backslash starts an escape only if it isn't itself escaped (an even number of backslashes precede it)
+    preceding = 0
+    while index - preceding - 1 >= 0 and text[index - preceding - 1] == '\\':
+        preceding += 1
+    return preceding % 2 == 0
+
+
+def _find_body_string(text):
+    # scan the start of a JSON object for a top-level "body" key with a string value
+    #   returns the index of the first character of the body string content, None if more input is needed
+    #   or -1 if this isn't an envelope with a string body
+    i = 0
+    length = len(text)
+    while i < length and text[i].isspace():
+        i += 1
+    if i == length:
+        return None
+    if text[i] != '{':
+        return -1
+
+    depth = 0
+    expecting_key = False
+    last_key = None
+    awaiting_value_for = None
+    while i < length:
+        c = text[i]
+        if c == '"':
+            if depth == 1 and not expecting_key and awaiting_value_for == "body":
+                return i + 1
+            m = _STRING_CONTENT.match(text, i + 1)
+            end = m.end()
+            if end >= length:
+                return None
+            if text[end] != '"':
+                # a partial escape at the end of the buffer needs more input - anything else is invalid
+                return None if length - end < 12 else -1
+            if depth == 1:
+                if expecting_key:
+                    last_key = _string_decoder.decode(text[i:end + 1])
+                    expecting_key = False
+                awaiting_value_for = None
+            i = end + 1
+            continue
+
+        if c in '{[':
+            if depth == 1 and awaiting_value_for == "body":
+                return -1
+            depth += 1
+            if depth == 1:
+                expecting_key = True
+            awaiting_value_for = None
+        elif c in '}]':
+            depth -= 1
+            if depth == 0:
+                return -1
+        elif c == ':' and depth == 1:
+            awaiting_value_for = last_key
+        elif c == ',' and depth == 1:
+            expecting_key = True
+            awaiting_value_for = None
+        elif not c.isspace() and depth == 1 and awaiting_value_for == "body":
+            # body is a number/literal - not a text envelope
+            return -1
+        i += 1
+    return None
+
+
+class EnvelopeStreamDecoder:
+    # incrementally unwraps a Lambda {"body": "..."} envelope from a byte stream
+    #   bytes that aren't an envelope are passed through unchanged; memory use is bounded by the chunk size
+    #   plus a small detection window, regardless of the payload size
+
+    DETECT = "detect"
+    BODY = "body"
+    PASSTHROUGH = "passthrough"
+    DONE = "done"
+
+    def __init__(self, detection_limit=ENVELOPE_DETECTION_LIMIT):
+        self.detection_limit = detection_limit
+        self.state = self.DETECT
+        self.is_envelope = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._raw_prefix = []
+        self._text = ""
+
+    def _decode_body(self):
+        # decode as much complete string content as we have - keeps any partial escape for the next chunk
+        m = _STRING_CONTENT.match(self._text)
+        end = m.end()
+        closed = end < len(self._text) and self._text[end] == '"'
+        if not closed:
+            # don't split a surrogate pair across chunks
+            surrogate = _HIGH_SURROGATE_ESCAPE.search(self._text, 0, end)
+            if surrogate is not None and _is_escape_start(self._text, surrogate.start()):
+                end = surrogate.start()
+
+        decoded = _string_decoder.decode('"' + self._text[:end] + '"') if end else ""
+
+        if closed:
+            self.state = self.DONE
+            self._text = ""
+        else:
+            self._text = self._text[end:]
+        return decoded.encode("utf-8", errors="replace")
+
+    def feed(self, chunk):
+        if self.state == self.PASSTHROUGH:
+            return chunk
+        if self.state == self.DONE:
+            return b""
+
+        text = self._utf8.decode(chunk)
+
+        if self.state == self.DETECT:
+            self._raw_prefix.append(chunk)
+            self._text += text
+            start = _find_body_string(self._text)
+            if start is None and len(self._text) < self.detection_limit:
+                return b""
+            if start is None or start < 0:
+                self.state = self.PASSTHROUGH
+                prefix = b"".join(self._raw_prefix)
+                self._raw_prefix = []
+                self._text = ""
+                return prefix
+
+            self.state = self.BODY
+            self.is_envelope = True
+            self._raw_prefix = []
+            self._text = self._text[start:]
+            return self._decode_body()
+
+        self._text += text
+        return self._decode_body()
+
+    def finish(self):
+        # flush anything still buffered at the end of the stream
+        if self.state == self.DETECT:
+            prefix = b"".join(self._raw_prefix)
+            self._raw_prefix = []
+            self.state = self.PASSTHROUGH
+            return prefix
+        if self.state == self.BODY and self._text:
+            raise ValueError("Response ended inside the envelope body")
+        return b""
+
+
+def stream_to_file(response, output, chunk_size=DOWNLOAD_CHUNK_BYTES, unwrap=True):
+    # write a (stream=True) response straight to a file as chunks arrive - returns transfer stats
+    decoder = EnvelopeStreamDecoder() if unwrap else None
+    received = 0
+    written = 0
+    start = time.perf_counter()
+
+    with open(output, "wb") as f:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            received += len(chunk)
+            data = decoder.feed(chunk) if decoder is not None else chunk
+            if data:
+                f.write(data)
+                written += len(data)
+        if decoder is not None:
+            data = decoder.finish()
+            if data:
+                f.write(data)
+                written += len(data)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "bytesReceived": received,
+        "bytesWritten": written,
+        "seconds": elapsed,
+        "mbPerSecond": (received / (1024 * 1024)) / elapsed if elapsed > 0 else 0.0,
+        "envelope": decoder.is_envelope if decoder is not None else False,
+    }
+
+
+class JsonArrayStreamParser:
+    # incrementally parses the items of a top-level JSON array from text chunks - each complete item is returned as
+    #   soon as it has arrived, so memory use is bounded by the largest item rather than the whole document
+    #   a top-level value that isn't an array (e.g. a single object) is returned as one item when the stream ends
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._started = False
+        self._is_array = None
+        self._done = False
+
+    def _skip_whitespace(self):
+        while self._position < len(self._buffer) and self._buffer[self._position].isspace():
+            self._position += 1
+
+    def feed(self, text, final=False):
+        items = []
+        if self._done:
+            return items
+        self._buffer += text
+
+        if not self._started:
+            self._skip_whitespace()
+            if self._position == len(self._buffer):
+                return items
+            self._started = True
+            self._is_array = self._buffer[self._position] == '['
+            if self._is_array:
+                self._position += 1
+
+        if not self._is_array:
+            # not an array - wait for the whole value
+            if final:
+                items.append(self._decoder.decode(self._buffer[self._position:]))
+                self._done = True
+            return items
+
+        while True:
+            self._skip_whitespace()
+            if self._position == len(self._buffer):
+                break
+            c = self._buffer[self._position]
+            if c == ',':
+                self._position += 1
+                continue
+            if c == ']':
+                self._done = True
+                break
+
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                if final:
+                    raise
+                # incomplete item - wait for more input
+                break
+            if not isinstance(item, (dict, list, str)):
+                # a number (or literal) is only complete once the ',' or ']' after it has arrived - '-2.' decodes
+                #   as -2, and the rest of it may be in the next chunk
+                following = end
+                while following < len(self._buffer) and self._buffer[following].isspace():
+                    following += 1
+                if following == len(self._buffer):
+                    break
+                if self._buffer[following] not in ",]":
+                    if final:
+                        raise ValueError(f"Unexpected text after JSON array item at {following}")
+                    break
+            items.append(item)
+            self._position = end
+
+        # drop consumed text once per chunk, rather than once per item
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+        if final and not self._done:
+            raise ValueError("Response ended inside the JSON array")
+        return items
+
+
+def iter_response_items(response, chunk_size=DOWNLOAD_CHUNK_BYTES, unwrap=True):
+    # yield the items of a (stream=True) JSON array response as they arrive - unwrapping any Lambda envelope
+    #   without buffering the whole document
+    envelope = EnvelopeStreamDecoder() if unwrap else None
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    parser = JsonArrayStreamParser()
+
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if not chunk:
+            continue
+        data = envelope.feed(chunk) if envelope is not None else chunk
+        if data:
+            yield from parser.feed(text_decoder.decode(data))
+
+    data = envelope.finish() if envelope is not None else b""
+    yield from parser.feed(text_decoder.decode(data, final=True), final=True)
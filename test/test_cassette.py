@@ -0,0 +1,117 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from cassette import use_cassette, eject_cassette, CassetteMiss
+from http_client import SaraHttpClient
+from long_poll import wait_for_project_status
+from stand_in_server import StandInServer, StandInProfile
+from utils import get_signed_headers
+from keys import CachedSigningKey, throwaway_key_provider
+from tokens import use_signing_key
+from constants import EMAIL, PUBLIC_PROJECT
+
+
+CASSETTE_ORG = "cassette-org"
+
+
+class CassetteRoundTripSuite(unittest.TestCase):
+    # records traffic against an in-process stand-in server, then replays it with the server out of the loop
+
+    @classmethod
+    def setUpClass(cls):
+        # the stand-in doesn't verify signatures - so no real key (and no AWS access) is needed
+        cls.previous_signing_key = use_signing_key(CachedSigningKey(throwaway_key_provider(), cache_dir=None))
+
+    @classmethod
+    def tearDownClass(cls):
+        use_signing_key(cls.previous_signing_key)
+
+    def setUp(self):
+        self.server = StandInServer(profile=StandInProfile()).start()
+        self.server.store.add_project(EMAIL, CASSETTE_ORG, "recorded", PUBLIC_PROJECT)
+        self.directory = tempfile.mkdtemp(prefix="sara-cassette-")
+        self.path = os.path.join(self.directory, "round_trip.json.gz")
+        self.headers = get_signed_headers(EMAIL)
+
+    def tearDown(self):
+        eject_cassette()
+        self.server.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def record(self, exchange):
+        # runs exchange(http) against the stand-in while recording - returns what it returned
+        cassette = use_cassette(self.path, "record")
+        http = SaraHttpClient()
+        try:
+            return exchange(http)
+        finally:
+            http.close()
+            cassette.save()
+            eject_cassette()
+
+    def replay(self, exchange):
+        # runs exchange(http) from the cassette - the stand-in must not see a single request
+        cassette = use_cassette(self.path, "replay")
+        http = SaraHttpClient()
+        self.server.reset_stats()
+        try:
+            return exchange(http), cassette
+        finally:
+            http.close()
+            self.assertEqual(self.server.stats()["requests"], 0)
+
+    def test_record_and_replay(self):
+        print("Running test: Cassette - recorded responses replay without the service")
+
+        def exchange(http):
+            version = http.get(f"{self.server.url}/api/status")
+            project = http.get(f"{self.server.url}/api/user_project/{CASSETTE_ORG}/recorded", headers=self.headers)
+            missing = http.get(f"{self.server.url}/api/user_project/{CASSETTE_ORG}/missing", headers=self.headers)
+            return [(response.status_code, response.content) for response in [version, project, missing]]
+
+        recorded = self.record(exchange)
+        self.assertEqual([status for status, _ in recorded], [200, 200, 404])
+
+        replayed, cassette = self.replay(exchange)
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(cassette.stats()["hits"], 3)
+
+    def test_replay_of_unrecorded_request_fails(self):
+        print("Running test: Cassette - a request that was never recorded raises CassetteMiss")
+        self.record(lambda http: http.get(f"{self.server.url}/api/status"))
+
+        def exchange(http):
+            with self.assertRaises(CassetteMiss):
+                http.get(f"{self.server.url}/api/user_project/{CASSETTE_ORG}/recorded", headers=self.headers)
+
+        self.replay(exchange)
+
+    def test_replayed_wait_times_out_without_spinning(self):
+        print("Running test: Cassette - a replayed long-poll wait times out on the replay clock, not the wall clock")
+
+        # a state the project never reaches - recorded as a one second long-poll (or two, if the first returns early)
+        def wait(timeout):
+            def exchange(http):
+                checks = []
+                status = wait_for_project_status(self.server.url, CASSETTE_ORG, "recorded", self.headers, ["error"],
+                                                 timeout, on_check=lambda check, _: checks.append(check), http=http)
+                return status.get("status"), len(checks)
+            return exchange
+
+        recorded_state, recorded_checks = self.record(wait(1))
+        self.assertIn(recorded_checks, [1, 2])
+
+        # the last recorded response repeats - each replay moves the clock on by its recorded latency, so a
+        #   30 second wait ends after about 30 checks instead of spinning for 30 seconds
+        start = time.time()
+        (replayed_state, replayed_checks), _ = self.replay(wait(30))
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(replayed_state, recorded_state)
+        self.assertLessEqual(replayed_checks, 31)
+
+
+if __name__ == '__main__':
+    unittest.main()
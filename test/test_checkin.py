@@ -1,9 +1,12 @@
 import unittest
-import requests
+from http_client import client
+from cassette import pause
 import json
 import time
 
 from utils import get_signed_headers
+from response_decoder import decode_response
+from project_pool import project_pool
 
 from constants import TARGET_URL, ORG, PREMIUM_EMAIL, PUBLIC_PROJECT, PRIVATE_PROJECT, EMAIL, PRIVATE_PROJECT_NAME_CHECKIN_TEST, PUBLIC_PROJECT_NAME_CHECKIN_TEST, PRIVATE_PROJECT_LARGE, PRIVATE_PROJECT_LARGE_NAME
 
@@ -14,7 +17,7 @@ class BoostBackendCheckinSuite(unittest.TestCase):
         print("Running test: Build User profile and verify")
         headers = get_signed_headers(PREMIUM_EMAIL)
 
-        response = requests.get(f"{TARGET_URL}/api/user/profile", headers=headers)
+        response = client.get(f"{TARGET_URL}/api/user/profile", headers=headers)
         self.assertEqual(response.status_code, 200)
 
         profile = {
@@ -23,24 +26,24 @@ class BoostBackendCheckinSuite(unittest.TestCase):
             "details": "I am a QA Engineer",
         }
 
-        response = requests.put(f"{TARGET_URL}/api/user/profile", json.dumps(profile), headers=headers)
+        response = client.put(f"{TARGET_URL}/api/user/profile", json.dumps(profile), headers=headers)
         self.assertEqual(response.status_code, 200)
         puttedData = response.json()
         self.assertEqual(puttedData['name'], profile['name'])
         self.assertEqual(puttedData['title'], profile['title'])
         self.assertEqual(puttedData['details'], profile['details'])
 
-        response = requests.get(f"{TARGET_URL}/api/user/profile", headers=headers)
+        response = client.get(f"{TARGET_URL}/api/user/profile", headers=headers)
         self.assertEqual(response.status_code, 200)
         gettedData = response.json()
         self.assertEqual(gettedData['name'], profile['name'])
         self.assertEqual(gettedData['title'], profile['title'])
         self.assertEqual(gettedData['details'], profile['details'])
 
-        response = requests.delete(f"{TARGET_URL}/api/user/profile", headers=headers)
+        response = client.delete(f"{TARGET_URL}/api/user/profile", headers=headers)
         self.assertEqual(response.status_code, 200)
 
-        response = requests.get(f"{TARGET_URL}/api/user/profile", headers=headers)
+        response = client.get(f"{TARGET_URL}/api/user/profile", headers=headers)
         self.assertEqual(response.status_code, 200)
         gettedData = response.json()
         self.assertFalse('name' in gettedData)
@@ -62,33 +65,49 @@ class BoostBackendCheckinSuite(unittest.TestCase):
                 print(f"Git Project: {git_project}")
 
         if private:
-            signedHeaders = get_signed_headers(PREMIUM_EMAIL)
+            email = PREMIUM_EMAIL
             git_project = PRIVATE_PROJECT if git_project is None else git_project
             project_name = PRIVATE_PROJECT_NAME_CHECKIN_TEST if project_name is None else project_name
         else:
-            signedHeaders = get_signed_headers(PREMIUM_EMAIL if PREMIUM_EMAIL else EMAIL)
+            email = PREMIUM_EMAIL if PREMIUM_EMAIL else EMAIL
             git_project = PUBLIC_PROJECT if git_project is None else git_project
             project_name = PUBLIC_PROJECT_NAME_CHECKIN_TEST if project_name is None else project_name
 
-        response = requests.get(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}", headers=signedHeaders)
+        signedHeaders = get_signed_headers(email)
+
+        # a project already synchronized at the repo's latest commit (on this service version) is reused rather than
+        #   rediscovered - see project_pool.py
+        lease = project_pool.lease(email, ORG, project_name, git_project)
+        if lease.reusable:
+            print(f"Reusing pooled project {project_name} - {lease.reason}")
+        else:
+            print(f"Rebuilding project {project_name} - {lease.reason}")
+            if self.helper_create_synchronized_project(signedHeaders, project_name, git_project, private):
+                lease.synchronized()
+
+        # refresh the data_references (and associated openai files)
+        response = client.put(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data_references", headers=signedHeaders)
+        self.assertEqual(response.status_code, 200)
+
+    def helper_create_synchronized_project(self, signedHeaders, project_name: str, git_project: str, private: bool) -> bool:
+        response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}", headers=signedHeaders)
         if response.status_code == 200:
             
             # delete the project
-            response = requests.delete(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}", headers=signedHeaders)
+            response = client.delete(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}", headers=signedHeaders)
             self.assertEqual(response.status_code, 200)
 
         project_data = {"resources": [{"uri": git_project}]}
         project_creation_time = time.time()
-        response = requests.post(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}", json=project_data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}", json=project_data, headers=signedHeaders)
         project_creation_time = time.time() - project_creation_time
         print(f"Project Creation Time: {project_creation_time} seconds")
         self.assertEqual(response.status_code, 200)
 
-        response = requests.get(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
-        gotten_project_data = response.json()
-        gotten_project_data = gotten_project_data if 'body' not in gotten_project_data else json.loads(gotten_project_data['body'])
+        gotten_project_data = decode_response(response)
         self.assertEqual(gotten_project_data['name'], project_name)
         self.assertEqual(gotten_project_data['resources'][0]['uri'], git_project)
 
@@ -100,11 +119,10 @@ class BoostBackendCheckinSuite(unittest.TestCase):
         max_iterations_public = iterations_in_one_min * 5
         max_iterations_private = iterations_in_one_min * 15
         for i in range(0, max_iterations_private if private else max_iterations_public):
-            response = requests.get(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/status", headers=signedHeaders)
+            response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/status", headers=signedHeaders)
             self.assertEqual(response.status_code, 200)
 
-            project_status = response.json()
-            project_status = project_status if 'body' not in project_status else json.loads(project_status['body'])
+            project_status = decode_response(response)
             if project_status['status'] == "Unknown":
                 print(f"Project Status is Unknown - {response.json()}")
                 break
@@ -126,13 +144,11 @@ class BoostBackendCheckinSuite(unittest.TestCase):
                 self.assertTrue(project_status['activelyUpdating'])
 
             # wait 20 seconds before probing again
-            time.sleep(20)
+            pause(20)
 
         print("Project is Fully Synchronized - Test success!")
 
-        # refresh the data_references (and associated openai files)
-        response = requests.put(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data_references", headers=signedHeaders)
-        self.assertEqual(response.status_code, 200)
+        return project_status['synchronized'] is True
 
     def test_user_project_resource_creation_public_project(self):
         self.helper_test_user_project_resource_creation_project(private=False)
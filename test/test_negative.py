@@ -1,5 +1,5 @@
 import unittest
-import requests
+from http_client import client
 import time
 
 from utils import get_signed_headers
@@ -16,7 +16,7 @@ class NegativeTestsServiceSuite(unittest.TestCase):
         data = {
             'resources': [{'uri': PUBLIC_PROJECT}]
         }
-        response = requests.post(f"{self.BASE_URL}/api/user_project/{TEST_ORG}/{PUBLIC_PROJECT_NAME}", data=data, headers=headers)
+        response = client.post(f"{self.BASE_URL}/api/user_project/{TEST_ORG}/{PUBLIC_PROJECT_NAME}", data=data, headers=headers)
         self.assertEqual(response.text, "Invalid JSON")
         self.assertEqual(response.status_code, 400)
 
@@ -24,14 +24,14 @@ class NegativeTestsServiceSuite(unittest.TestCase):
         print("Running test: user profile put no data")
         headers = get_signed_headers(self.EMAIL)
 
-        response = requests.put(f"{self.BASE_URL}/api/user/profile", None, headers=headers)
+        response = client.put(f"{self.BASE_URL}/api/user/profile", None, headers=headers)
         self.assertEqual(response.status_code, 400)
 
     def test_store_nonexisting_repo_in_project(self):
         print("Running test: Store data in the user's project")
         data = {"resources": [{"uri": "http://www.github.com/missing_org/this-repo-does-not-exist/"}]}
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.post(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
     def test_unpaid_user_accessing_private_repo(self):
@@ -40,17 +40,17 @@ class NegativeTestsServiceSuite(unittest.TestCase):
         signedHeaders = get_signed_headers(FREE_EMAIL)
         # measure the time it takes for the post
         start_time = time.time()
-        response = requests.post(f"{TARGET_URL}/api/user_project/{FREE_ORG}/{FREE_PROJECT_NAME}", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{FREE_ORG}/{FREE_PROJECT_NAME}", json=data, headers=signedHeaders)
         end_time = time.time()
         print(f"Time to create inaccessible project: {end_time - start_time}")
         self.assertEqual(response.status_code, 401)
 
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.get(f"{TARGET_URL}/api/user_project/{FREE_ORG}/{FREE_PROJECT_NAME}", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/{FREE_ORG}/{FREE_PROJECT_NAME}", headers=signedHeaders)
         self.assertEqual(response.status_code, 404)
 
     def test_retrieve_file_private_access_repo_path_invalid_params(self):
         print("Negative Test: Retrieve a private file from the team's project based on invalid uri and path")
         signedHeaders = get_signed_headers(PREMIUM_EMAIL)
-        response = requests.get(f"{TARGET_URL}/api/user/{TEST_ORG}/connectors/github/file?uri=https://github.com/polyverse-appsec/sara/&path=README.md", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user/{TEST_ORG}/connectors/github/file?uri=https://github.com/polyverse-appsec/sara/&path=README.md", headers=signedHeaders)
         self.assertEqual(response.status_code, 400)
@@ -0,0 +1,92 @@
+import os
+import sys
+import shutil
+import asyncio
+import tempfile
+import unittest
+
+from stand_in_server import StandInServer, StandInProfile, LOCAL_ADMIN_EMAIL
+from response_cache import ResponseCache
+from keys import CachedSigningKey, throwaway_key_provider
+from tokens import use_signing_key
+from constants import EMAIL, PUBLIC_PROJECT
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from sara_client import SaraClient  # noqa: E402
+
+
+STAND_IN_ORG = "stand-in-org"
+
+
+class StandInSmokeSuite(unittest.TestCase):
+    # drives SaraClient against an in-process stand-in server - keeps the stand-in's routes, status flow, ETags and
+    #   paging in step with what the client (and so the real service) expects, without a deployed service
+
+    @classmethod
+    def setUpClass(cls):
+        # the stand-in doesn't verify signatures - so no real key (and no AWS access) is needed
+        cls.previous_signing_key = use_signing_key(CachedSigningKey(throwaway_key_provider(), cache_dir=None))
+        cls.server = StandInServer(profile=StandInProfile(stage_seconds=0.01)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        use_signing_key(cls.previous_signing_key)
+
+    def setUp(self):
+        self.server.reset_stats()
+        self.cache_dir = tempfile.mkdtemp(prefix="sara-stand-in-")
+        self.sara = SaraClient(email=EMAIL, base_url=self.server.url, cache=ResponseCache(directory=self.cache_dir, enabled=True))
+
+    def tearDown(self):
+        self.sara.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_create_project_and_wait_for_synchronized(self):
+        print("Running test: Stand-in - create a project, discover it and long-poll until synchronized")
+
+        async def create_and_wait():
+            response = await self.sara.create_project(STAND_IN_ORG, "created", PUBLIC_PROJECT)
+            self.assertEqual(response.status_code, 200)
+
+            response = await self.sara.discover(STAND_IN_ORG, "created")
+            self.assertEqual(response.status_code, 200)
+
+            return await self.sara.wait_for_status(STAND_IN_ORG, "created", timeout=30)
+
+        status = asyncio.run(create_and_wait())
+        self.assertTrue(status["synchronized"])
+        self.assertEqual(status["status"], "Fully Synchronized")
+
+    def test_status_revalidated_with_etag(self):
+        print("Running test: Stand-in - an unchanged status is revalidated with a 304")
+        self.server.store.add_project(EMAIL, STAND_IN_ORG, "cached", PUBLIC_PROJECT)
+
+        first = asyncio.run(self.sara.status(STAND_IN_ORG, "cached"))
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.headers.get("ETag"))
+        self.assertFalse(getattr(first, "from_cache", False))
+
+        second = asyncio.run(self.sara.status(STAND_IN_ORG, "cached"))
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(getattr(second, "from_cache", False))
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(self.server.stats()["notModified"], 1)
+
+    def test_search_paging(self):
+        print("Running test: Stand-in - page through a project search with cursors")
+        projects = [f"paged{index}" for index in range(5)]
+        for project in projects:
+            self.server.store.add_project(EMAIL, STAND_IN_ORG, project, PUBLIC_PROJECT)
+
+        url = f"{self.sara.endpoint('projects_all')}?org={STAND_IN_ORG}"
+        items = list(self.sara.iter_search(url, page_size=2, email=LOCAL_ADMIN_EMAIL))
+
+        self.assertEqual(sorted(item["name"] for item in items if item["name"] in projects), projects)
+        # the org holds the paged projects (and any created by the other tests) - every page but the last is full
+        self.assertEqual(self.server.stats()["routes"]["search_projects"], -(-len(items) // 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
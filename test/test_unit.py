@@ -1,14 +1,18 @@
 import unittest
-import requests
+from http_client import client
 import datetime
 import json
 
 from utils import get_signed_headers
+from response_decoder import decode_response, decode_text
+from namespaces import namespaced, TEST_NAMESPACE
+from fixtures import ensure_project
 
 from constants import (  # noqa: F401
     TARGET_URL,
     CLOUD_URL_PROD, CLOUD_URL_TEST, CLOUD_URL_DEV, LOCAL_URL,
     EMAIL, ORG, PUBLIC_PROJECT, PUBLIC_PROJECT_NAME,
+    TEST_ORG, TEST_PROJECT_NAME, PRIVATE_PROJECT,
     PREMIUM_EMAIL, PRIVATE_PROJECT_NAME_CHECKIN_TEST, LOCAL_ADMIN_EMAIL,
     AARON_EMAIL, PRIVATE_PROJECT_CUSTOM_NFTMINT, PRIVATE_PROJECT_NAME_CUSTOM_NFTMINT,
     all_stages,
@@ -18,12 +22,24 @@ from constants import (  # noqa: F401
 
 class UnitTestSuite(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # projects these tests expect from earlier runs (or from the checkin suite) - in a parallel worker namespace
+        #   they're created when missing; serial runs use the shared projects as they always have
+        if not TEST_NAMESPACE:
+            return
+
+        if ensure_project(EMAIL, TEST_ORG, TEST_PROJECT_NAME, PUBLIC_PROJECT):
+            client.post(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}/goals", json={"goals": "goal value"}, headers=get_signed_headers(EMAIL))
+        ensure_project(PREMIUM_EMAIL, ORG, PRIVATE_PROJECT_NAME_CHECKIN_TEST, PRIVATE_PROJECT)
+        ensure_project("airbear109@gmail.com", "polyverse-appsec", namespaced("nftmintONE"), PRIVATE_PROJECT_CUSTOM_NFTMINT)
+
     def test_monitor_account_authn(self):
         print("Running test: Strong authentication")
 
         signedHeaders = get_signed_headers(MONITOR_EMAIL, False, True)
 
-        response = requests.get(f"{TARGET_URL}/api/user/{ORG}/account", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user/{ORG}/account", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
     def test_strong_authn(self):
@@ -31,7 +47,7 @@ class UnitTestSuite(unittest.TestCase):
 
         signedHeaders = get_signed_headers(EMAIL, True)
 
-        response = requests.get(f"{TARGET_URL}/api/user/{ORG}/account", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user/{ORG}/account", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
     def test_strong_authn_bearer_token(self):
@@ -39,7 +55,7 @@ class UnitTestSuite(unittest.TestCase):
 
         signedHeaders = get_signed_headers(EMAIL, True, True)
 
-        response = requests.get(f"{TARGET_URL}/api/user/{ORG}/account", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user/{ORG}/account", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
     def test_strong_authn_bearer_token_missing(self):
@@ -49,7 +65,7 @@ class UnitTestSuite(unittest.TestCase):
         # remove everything after Bearer to test broken token
         signedHeaders['Authorization'] = signedHeaders['Authorization'].split(' ')[0]
 
-        response = requests.get(f"{TARGET_URL}/api/user/{ORG}/account", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user/{ORG}/account", headers=signedHeaders)
         self.assertEqual(response.status_code, 401)
 
     def test_weak_authn(self):
@@ -59,7 +75,7 @@ class UnitTestSuite(unittest.TestCase):
 
         unsignedHeader = {'x-user-account': EMAIL}
 
-        response = requests.get(f"{TARGET_URL}/api/user/profile", headers=unsignedHeader)
+        response = client.get(f"{TARGET_URL}/api/user/profile", headers=unsignedHeader)
         self.assertEqual(response.status_code, 401)
 
     def test_user_account(self):
@@ -67,7 +83,7 @@ class UnitTestSuite(unittest.TestCase):
 
         signedHeaders = get_signed_headers(EMAIL)
 
-        response = requests.get(f"{TARGET_URL}/api/user/org123/account", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user/{TEST_ORG}/account", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         account = response.json()
         self.assertTrue(account["enabled"])
@@ -76,20 +92,20 @@ class UnitTestSuite(unittest.TestCase):
         print("Running test: Create basic user project")
         data = {"resources": [{"uri": PUBLIC_PROJECT}]}
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.post(f"{TARGET_URL}/api/user_project/org123/project456", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.get(f"{TARGET_URL}/api/user_project/org123/project456", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         responseData = response.json()
-        self.assertEqual(responseData['name'], "project456")
+        self.assertEqual(responseData['name'], TEST_PROJECT_NAME)
         self.assertNotEqual(len(responseData['resources']), 0)
 
     def test_project_status(self):
         print("Running test: Get Status of Private Project")
         signedHeaders = get_signed_headers(AARON_EMAIL)
-        response = requests.get(f"{TARGET_URL}/api/user_project/polyverse-appsec/sara/status", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/polyverse-appsec/sara/status", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         responseData = response.json()
@@ -99,25 +115,25 @@ class UnitTestSuite(unittest.TestCase):
         print("Running test: Retrieve data from the user's project")
 
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.post(f"{TARGET_URL}/api/user_project/org123/project456", json={}, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}", json={}, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.get(f"{TARGET_URL}/api/user_project/org123/project456", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         responseData = response.json()
-        self.assertEqual(responseData['name'], "project456")
+        self.assertEqual(responseData['name'], TEST_PROJECT_NAME)
         self.assertEqual(len(responseData['resources']), 0)
 
     def test_search_for_projects(self):
         print("Running test: Retrieve data from the user's project")
 
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.post(f"{TARGET_URL}/api/user_project/org123/project456", json={}, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}", json={}, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         signedHeaders = get_signed_headers(LOCAL_ADMIN_EMAIL)
-        response = requests.get(f"{TARGET_URL}/api/search/projects?user=*&project=*&org=*", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/search/projects?user=*&project=*&org=*", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         responseData = response.json()
         self.assertGreaterEqual(len(responseData), 1)
@@ -126,20 +142,20 @@ class UnitTestSuite(unittest.TestCase):
         print("Running test: Store goals data in the user's project")
         signedHeaders = get_signed_headers(EMAIL)
         data = {"goals": "goal value"}
-        response = requests.post(f"{TARGET_URL}/api/user_project/org123/project456/goals", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}/goals", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
     def test_retrieve_goals_data_from_project(self):
         print("Running test: Retrieve goals data from the user's project")
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.get(f"{TARGET_URL}/api/user_project/org123/project456/goals", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}/goals", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"goals": "goal value"})
 
     def test_retrieve_sara_project_data_references(self):
         print("Running test: Retrieve goals data from the user's project")
         signedHeaders = get_signed_headers('aaron@polyverse.com')
-        response = requests.get(f"{TARGET_URL}/api/user_project/polyverse-appsec/sara/data_references", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/polyverse-appsec/sara/data_references", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         data_references = response.json()
         self.assertIsNotNone(data_references)
@@ -149,13 +165,13 @@ class UnitTestSuite(unittest.TestCase):
         print("Running test: Updating project data")
         signedHeaders = get_signed_headers(EMAIL)
         data = {"resources": [{"uri": PUBLIC_PROJECT}]}
-        response = requests.patch(f"{TARGET_URL}/api/user_project/org123/project456", json=data, headers=signedHeaders)
+        response = client.patch(f"{TARGET_URL}/api/user_project/{TEST_ORG}/{TEST_PROJECT_NAME}", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
     def test_api_version(self):
         print("Running test: check version of service")
         signedHeaders = get_signed_headers(EMAIL)
-        response = requests.get(f"{TARGET_URL}/api/status", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/status", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         self.assertNotEqual(response.json()['version'], None)
         self.assertEqual(response.json()['type'], 'dev')
@@ -170,18 +186,43 @@ class UnitTestSuite(unittest.TestCase):
         now = datetime.datetime.now()
         unixtime = int(now.timestamp())
 
-        response = requests.post(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
-        response = requests.get(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test/data/blueprint", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test/data/blueprint", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         self.assertNotEqual(response.text, None)
 
-        response = requests.get(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test/data/blueprint/status", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test/data/blueprint/status", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
         self.assertNotEqual(response.json()['lastUpdated'], None)
         self.assertGreater(response.json()['lastUpdated'], unixtime)
 
+    def test_resource_conditional_get(self):
+        print("Running test: Revalidate an unchanged resource with If-None-Match")
+        data = {"resources": [{"uri": PUBLIC_PROJECT}]}
+        signedHeaders = get_signed_headers(EMAIL)
+
+        response = client.post(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test", json=data, headers=signedHeaders)
+        self.assertEqual(response.status_code, 200)
+
+        response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test/data/blueprint", headers=signedHeaders)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+
+        conditionalHeaders = {**signedHeaders, 'If-None-Match': etag}
+        response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test/data/blueprint", headers=conditionalHeaders)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers.get('ETag'), etag)
+        self.assertEqual(len(response.content), 0)
+
+        # a stale tag still gets the full resource
+        conditionalHeaders = {**signedHeaders, 'If-None-Match': '"stale"'}
+        response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{PUBLIC_PROJECT_NAME}-test/data/blueprint", headers=conditionalHeaders)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(len(response.content), 0)
+
     def test_generator_resource_projectsource_stage_filescan(self):
         print("Running test: Generator Resource ProjectSource Stage Filescan")
 
@@ -190,19 +231,15 @@ class UnitTestSuite(unittest.TestCase):
         data = {"stage": 'File Paths Scan'}
         signedHeaders = get_signed_headers(PREMIUM_EMAIL)
 
-        # response = requests.post(f"{TARGET_URL}/test", json=data, headers=signedHeaders)
+        # response = client.post(f"{TARGET_URL}/test", json=data, headers=signedHeaders)
         # self.assertEqual(response.status_code, 200)
 
-        response = requests.post(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource/generator/process", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource/generator/process", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         # if running locally - the result will be a string, but if running remotely, the result will be a JSON object for HTTP frame
         #     so we need to see if we can parse the JSON, and if not, just use the string
-        try:
-            response = response.json()
-            response = json.loads(response['body']) if 'body' in response else response
-        except json.JSONDecodeError:
-            response = response.text
+        response = decode_response(response)
 
         self.assertEqual(response['stage'], 'Full Source Code Import')
 
@@ -214,19 +251,15 @@ class UnitTestSuite(unittest.TestCase):
         data = {"stage": 'File Paths Scan'}
         signedHeaders = get_signed_headers(PREMIUM_EMAIL)
 
-        # response = requests.post(f"{TARGET_URL}/test", json=data, headers=signedHeaders)
+        # response = client.post(f"{TARGET_URL}/test", json=data, headers=signedHeaders)
         # self.assertEqual(response.status_code, 200)
 
-        response = requests.post(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource/generator/process", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource/generator/process", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         # if running locally - the result will be a string, but if running remotely, the result will be a JSON object for HTTP frame
         #     so we need to see if we can parse the JSON, and if not, just use the string
-        try:
-            response = response.json()
-            response = json.loads(response['body']) if 'body' in response else response
-        except json.JSONDecodeError:
-            response = response.text
+        response = decode_response(response)
 
         self.assertEqual(response['stage'], 'Full Source Code Import')
 
@@ -238,16 +271,12 @@ class UnitTestSuite(unittest.TestCase):
         data = {"stage": 'Full Source Code Import'}
         signedHeaders = get_signed_headers(PREMIUM_EMAIL)
 
-        response = requests.post(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource/generator/process", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource/generator/process", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         # if running locally - the result will be a string, but if running remotely, the result will be a JSON object for HTTP frame
         #     so we need to see if we can parse the JSON, and if not, just use the string
-        try:
-            response = response.json()
-            response = json.loads(response['body']) if 'body' in response else response
-        except json.JSONDecodeError:
-            response = response.text
+        response = decode_response(response)
 
         self.assertEqual(response['stage'], 'Complete')
 
@@ -259,22 +288,18 @@ class UnitTestSuite(unittest.TestCase):
         email = "airbear109@gmail.com"
 
         org = "polyverse-appsec"
-        project_name = "nftmintONE"
+        project_name = namespaced("nftmintONE")
 
         dataPathScan = {"stage": 'File Paths Scan'}
         dataSourceImport = {"stage": 'Full Source Code Import'}
         signedHeaders = get_signed_headers(email)
 
-        response = requests.post(f"{TARGET_URL}/api/user_project/{org}/{project_name}/data/projectsource/generator/process", json=dataPathScan, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{org}/{project_name}/data/projectsource/generator/process", json=dataPathScan, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         # if running locally - the result will be a string, but if running remotely, the result will be a JSON object for HTTP frame
         #     so we need to see if we can parse the JSON, and if not, just use the string
-        try:
-            response = response.json()
-            response = json.loads(response['body']) if 'body' in response else response
-        except json.JSONDecodeError:
-            response = response.text
+        response = decode_response(response)
 
         self.assertEqual(response['stage'], dataSourceImport['stage'])
 
@@ -284,23 +309,19 @@ class UnitTestSuite(unittest.TestCase):
         project_name = PRIVATE_PROJECT_CUSTOM_NFTMINT
 
         org = "polyverse-appsec"
-        project_name = "nftmintONE"
+        project_name = namespaced("nftmintONE")
         email = PREMIUM_EMAIL
         email = "airbear109@gmail.com"
 
         data = {"status": 'processing'}
         signedHeaders = get_signed_headers(email)
 
-        response = requests.post(f"{TARGET_URL}/api/user_project/{org}/{project_name}/data/projectsource/generator", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{org}/{project_name}/data/projectsource/generator", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         # if running locally - the result will be a string, but if running remotely, the result will be a JSON object for HTTP frame
         #     so we need to see if we can parse the JSON, and if not, just use the string
-        try:
-            response = response.json()
-            response = json.loads(response['body']) if 'body' in response else response
-        except json.JSONDecodeError:
-            response = response.text
+        response = decode_response(response)
 
         self.assertEqual(response['stage'], 'Complete')
 
@@ -310,7 +331,7 @@ class UnitTestSuite(unittest.TestCase):
         project_name = PRIVATE_PROJECT_CUSTOM_NFTMINT
 
         org = "polyverse-appsec"
-        project_name = "nftmintONE"
+        project_name = namespaced("nftmintONE")
         email = PREMIUM_EMAIL
         email = "airbear109@gmail.com"
 
@@ -318,16 +339,12 @@ class UnitTestSuite(unittest.TestCase):
         data = {"stage": 'Full Source Code Import', "forceProcessing": True}
         signedHeaders = get_signed_headers(email)
 
-        response = requests.post(f"{TARGET_URL}/api/user_project/{org}/{project_name}/data/projectsource/generator/process", json=data, headers=signedHeaders)
+        response = client.post(f"{TARGET_URL}/api/user_project/{org}/{project_name}/data/projectsource/generator/process", json=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         # if running locally - the result will be a string, but if running remotely, the result will be a JSON object for HTTP frame
         #     so we need to see if we can parse the JSON, and if not, just use the string
-        try:
-            response = response.json()
-            response = json.loads(response['body']) if 'body' in response else response
-        except json.JSONDecodeError:
-            response = response.text
+        response = decode_response(response)
 
         self.assertEqual(response['stage'], 'Complete')
 
@@ -342,22 +359,18 @@ class UnitTestSuite(unittest.TestCase):
         # Set the 'Content-Type' header to 'text/plain'
         signedHeaders['Content-Type'] = 'text/plain'
 
-        response = requests.delete(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource", headers=signedHeaders)
+        response = client.delete(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
-        response = requests.put(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource", data=data, headers=signedHeaders)
+        response = client.put(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource", data=data, headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
-        response = requests.get(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource", headers=signedHeaders)
+        response = client.get(f"{TARGET_URL}/api/user_project/{ORG}/{project_name}/data/projectsource", headers=signedHeaders)
         self.assertEqual(response.status_code, 200)
 
         # if running locally - the result will be a string, but if running remotely, the result will be a JSON object for HTTP frame
         #     so we need to see if we can parse the JSON, and if not, just use the string
-        try:
-            response = response.json()
-            response = response['body'] if 'body' in response else response
-        except json.JSONDecodeError:
-            response = response.text
+        response = decode_text(response)
 
         self.assertEqual(response, data)
 
@@ -372,7 +385,7 @@ class UnitTestSuite(unittest.TestCase):
 
         for env, base_url in all_stages.items():
             call_start = datetime.datetime.now()
-            response = requests.get(f"{base_url}/api/user_project/{ORG}/projects", headers=signedHeaders)
+            response = client.get(f"{base_url}/api/user_project/{ORG}/projects", headers=signedHeaders)
             call_time = datetime.datetime.now() - call_start
             print(f"{env.capitalize()} Call Time: {call_time}")
 
@@ -384,7 +397,7 @@ class UnitTestSuite(unittest.TestCase):
 
             # Parse the JSON response
             try:
-                parsed_response = json.loads(response.json()['body']) if 'body' in response.json() else response.json()
+                parsed_response = decode_response(response)
                 self.assertEqual(type(parsed_response), list)
                 self.assertGreaterEqual(len(parsed_response), 0)
                 responses[env] = parsed_response
@@ -0,0 +1,348 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from cassette import server_seconds, server_timing
+
+
+# per-request timing of the shared client - SARA_TIMING=1 prints a summary table at exit, and SARA_TRACE=<file.json>
+#   writes every request as a trace (SARA_TRACE_FORMAT: chrome for chrome://tracing or Perfetto, otlp for
+#   OpenTelemetry-style spans)
+TIMING_SUMMARY = bool(os.environ.get("SARA_TIMING"))
+TRACE_PATH = os.environ.get("SARA_TRACE")
+TRACE_FORMAT = os.environ.get("SARA_TRACE_FORMAT", "chrome")
+
+trace_formats = ["chrome", "otlp"]
+
+# response headers that identify a request on the service side (Express, then the Lambda function URL)
+REQUEST_ID_HEADERS = ["X-Request-Id", "x-amzn-RequestId", "Apigw-Requestid"]
+
+# phases in the order they happen - connect (DNS and TCP) and tls are only paid by requests that open a connection
+PHASES = ["connect", "tls", "wait", "download", "decode"]
+
+_connection_timing = threading.local()
+
+
+class TimedConnectionMixin:
+    # reports how long opening the connection took to the request (in this thread) that's being timed
+
+    is_tls = False
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self._tcp_seconds = time.perf_counter() - start
+
+    def connect(self):
+        self._tcp_seconds = 0.0
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            phases = getattr(_connection_timing, "phases", None)
+            if phases is not None:
+                phases["connect"] += self._tcp_seconds
+                if self.is_tls:
+                    phases["tls"] += max(0.0, time.perf_counter() - start - self._tcp_seconds)
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    is_tls = True
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+timed_pool_classes = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+class RequestTiming:
+    # one request's phases (in seconds), sizes and ids - attached to its response as response.timing
+
+    def __init__(self, method, url, start):
+        self.method = method
+        self.url = url
+        self.start = start
+        self.phases = {phase: 0.0 for phase in PHASES}
+        # decode happens later (when the caller parses the body) - kept as (epoch start, seconds) spans
+        self.decodes = []
+        self.status = None
+        self.error = None
+        self.server = None
+        # the service's own breakdown (auth, db-read, github, ...) from its Server-Timing header
+        self.server_metrics = []
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.request_id = None
+        self.replayed = False
+        self.thread = threading.get_ident()
+
+    @property
+    def route(self):
+        return f"{self.method} {urlsplit(self.url).path}"
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+    def add_decode(self, start, seconds):
+        self.decodes.append((start, seconds))
+        self.phases["decode"] += seconds
+
+    def to_dict(self):
+        return {"method": self.method, "url": self.url, "start": self.start, "status": self.status, "error": self.error,
+                "phases": dict(self.phases), "serverSeconds": self.server, "serverTiming": self.server_metrics, "requestBytes": self.request_bytes,
+                "responseBytes": self.response_bytes, "requestId": self.request_id, "replayed": self.replayed}
+
+
+def body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    # streamed (file or generator) bodies aren't read just to size them
+    return 0
+
+
+class TimingAdapter(HTTPAdapter):
+    # wraps the client's adapter (pooled, or a cassette) - times each request and hands it to the client's hooks
+
+    def __init__(self, adapter, hooks):
+        super().__init__()
+        self.adapter = adapter
+        self.hooks = hooks
+
+    def send(self, request, **kwargs):
+        timing = RequestTiming(request.method, request.url, time.time())
+        timing.request_bytes = body_size(request.body)
+
+        _connection_timing.phases = timing.phases
+        start = time.perf_counter()
+        try:
+            response = self.adapter.send(request, **kwargs)
+        except Exception as e:
+            timing.error = type(e).__name__
+            timing.phases["wait"] = max(0.0, time.perf_counter() - start - timing.phases["connect"] - timing.phases["tls"])
+            self._report(timing)
+            raise
+        finally:
+            _connection_timing.phases = None
+        headers_received = time.perf_counter()
+        timing.phases["wait"] = max(0.0, headers_received - start - timing.phases["connect"] - timing.phases["tls"])
+
+        # streamed bodies are downloaded by the caller as it reads them, so only their headers are timed
+        if not kwargs.get("stream"):
+            response.content
+            timing.phases["download"] = time.perf_counter() - headers_received
+            timing.response_bytes = len(response.content)
+        else:
+            timing.response_bytes = int(response.headers.get("Content-Length", 0) or 0)
+
+        timing.status = response.status_code
+        timing.server = server_seconds(response.headers)
+        timing.server_metrics = server_timing(response.headers)
+        timing.request_id = next((response.headers[name] for name in REQUEST_ID_HEADERS if name in response.headers), None)
+        timing.replayed = getattr(response, "replayed", False)
+        response.timing = timing
+        self._report(timing)
+        return response
+
+    def _report(self, timing):
+        for hook in list(self.hooks):
+            hook(timing)
+
+    def close(self):
+        self.adapter.close()
+
+
+class TimingRecorder:
+    # timing hook that keeps every request - for the summary table and trace exports
+
+    def __init__(self):
+        self.timings = []
+        self._lock = threading.Lock()
+
+    def __call__(self, timing):
+        with self._lock:
+            self.timings.append(timing)
+
+    def by_route(self):
+        with self._lock:
+            timings = list(self.timings)
+        routes = {}
+        for timing in timings:
+            routes.setdefault(timing.route, []).append(timing)
+        return routes
+
+    def breakdown(self):
+        # seconds spent in the network, the service and the client - the service's share is only known for
+        #   responses with a Server-Timing total, so the rest of their wait is network (and Lambda overhead)
+        with self._lock:
+            timings = list(self.timings)
+        network = service = client = unattributed = 0.0
+        for timing in timings:
+            phases = timing.phases
+            network += phases["connect"] + phases["tls"] + phases["download"]
+            client += phases["decode"]
+            if timing.server is not None:
+                service += min(timing.server, phases["wait"])
+                network += max(0.0, phases["wait"] - timing.server)
+            else:
+                unattributed += phases["wait"]
+        return {"network": network, "service": service, "client": client, "wait": unattributed}
+
+    def summary(self, out=sys.stdout):
+        routes = self.by_route()
+        if not routes:
+            return
+        print(f"\nRequest timing - {sum(len(timings) for timings in routes.values())} requests (mean ms per request)", file=out)
+        print(f"{'Count':>6} {'Total':>9} {'Connect':>9} {'TLS':>9} {'Wait':>9} {'Server':>9} {'Download':>9} {'Decode':>9} {'KB in':>8}  Request", file=out)
+        for route, timings in sorted(routes.items(), key=lambda item: -sum(timing.total for timing in item[1])):
+            count = len(timings)
+            means = {phase: sum(timing.phases[phase] for timing in timings) / count * 1000 for phase in PHASES}
+            reported = [timing.server for timing in timings if timing.server is not None]
+            server = f"{sum(reported) / len(reported) * 1000:9.1f}" if reported else f"{'-':>9}"
+            kilobytes = sum(timing.response_bytes for timing in timings) / count / 1024
+            print(f"{count:6} {sum(means.values()):9.1f} {means['connect']:9.1f} {means['tls']:9.1f} {means['wait']:9.1f} "
+                  f"{server} {means['download']:9.1f} {means['decode']:9.1f} {kilobytes:8.1f}  {route}", file=out)
+
+        breakdown = self.breakdown()
+        total = sum(breakdown.values())
+        if total > 0:
+            parts = [f"{breakdown['network'] / total:.0%} network", f"{breakdown['service'] / total:.0%} service",
+                     f"{breakdown['client'] / total:.0%} client"]
+            if breakdown["wait"] > 0:
+                parts.append(f"{breakdown['wait'] / total:.0%} waiting on responses without Server-Timing")
+            print(f"{total:.2f} seconds in requests - {', '.join(parts)}", file=out)
+
+    def chrome_trace(self):
+        # Chrome trace event format - one complete ('X') event per request, with its phases nested under it
+        with self._lock:
+            timings = list(self.timings)
+        pid = os.getpid()
+        events = []
+        for timing in timings:
+            args = {key: value for key, value in timing.to_dict().items() if key not in ["phases", "start", "method"]}
+            network_seconds = sum(timing.phases[phase] for phase in PHASES if phase != "decode")
+            events.append({"name": timing.route, "cat": "request", "ph": "X", "pid": pid, "tid": timing.thread,
+                           "ts": timing.start * 1e6, "dur": network_seconds * 1e6, "args": args})
+            offset = timing.start
+            for phase in PHASES[:-1]:
+                seconds = timing.phases[phase]
+                if seconds > 0:
+                    events.append({"name": phase, "cat": "phase", "ph": "X", "pid": pid, "tid": timing.thread,
+                                   "ts": offset * 1e6, "dur": seconds * 1e6})
+                if phase == "wait" and timing.server is not None:
+                    # the service's share, centered in the wait - the network's share is split either side of it
+                    server = min(timing.server, seconds)
+                    events.append({"name": "server", "cat": "phase", "ph": "X", "pid": pid, "tid": timing.thread,
+                                   "ts": (offset + (seconds - server) / 2) * 1e6, "dur": server * 1e6})
+                offset += seconds
+            for start, seconds in timing.decodes:
+                events.append({"name": "decode", "cat": "phase", "ph": "X", "pid": pid, "tid": timing.thread,
+                               "ts": start * 1e6, "dur": seconds * 1e6, "args": {"request": timing.route}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def otlp_trace(self):
+        # OpenTelemetry (OTLP/JSON) style - a client span per request, with a child span per phase
+        with self._lock:
+            timings = list(self.timings)
+        spans = []
+        for timing in timings:
+            trace_id = os.urandom(16).hex()
+            span_id = os.urandom(8).hex()
+            network_seconds = sum(timing.phases[phase] for phase in PHASES if phase != "decode")
+            attributes = {"http.request.method": timing.method, "url.full": timing.url,
+                          "http.response.status_code": timing.status, "http.request.body.size": timing.request_bytes,
+                          "http.response.body.size": timing.response_bytes, "sara.request_id": timing.request_id,
+                          "sara.server_seconds": timing.server, "error.type": timing.error}
+            spans.append(otlp_span(trace_id, span_id, None, timing.route, timing.start, network_seconds, attributes))
+            offset = timing.start
+            for phase in PHASES[:-1]:
+                seconds = timing.phases[phase]
+                if seconds > 0:
+                    spans.append(otlp_span(trace_id, os.urandom(8).hex(), span_id, phase, offset, seconds, {}))
+                offset += seconds
+            for start, seconds in timing.decodes:
+                spans.append(otlp_span(trace_id, os.urandom(8).hex(), span_id, "decode", start, seconds, {}))
+        return {"resourceSpans": [{
+            "resource": {"attributes": [otlp_attribute("service.name", "sara-test-client")]},
+            "scopeSpans": [{"scope": {"name": "sara.timing"}, "spans": spans}],
+        }]}
+
+    def export(self, path, trace_format=TRACE_FORMAT):
+        if trace_format not in trace_formats:
+            raise ValueError(f"Unknown trace format {trace_format} - choose from {', '.join(trace_formats)}")
+        trace = self.chrome_trace() if trace_format == "chrome" else self.otlp_trace()
+        with open(path, "w") as f:
+            json.dump(trace, f)
+
+
+def otlp_attribute(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def otlp_span(trace_id, span_id, parent_span_id, name, start, seconds, attributes):
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        # SPAN_KIND_CLIENT for the request, SPAN_KIND_INTERNAL for its phases
+        "kind": 3 if parent_span_id is None else 1,
+        "startTimeUnixNano": str(int(start * 1e9)),
+        "endTimeUnixNano": str(int((start + seconds) * 1e9)),
+        "attributes": [otlp_attribute(key, value) for key, value in attributes.items() if value is not None],
+    }
+    if parent_span_id is not None:
+        span["parentSpanId"] = parent_span_id
+    return span
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def report_at_exit(recorder, summary=TIMING_SUMMARY, trace_path=TRACE_PATH, trace_format=TRACE_FORMAT):
+    if summary:
+        recorder.summary()
+    if trace_path:
+        recorder.export(trace_path, trace_format)
+        print(f"Request trace ({trace_format}) written to {trace_path}")
+
+
+def timing_recorder():
+    # the process-wide recorder - created (with its exit report) the first time it's needed, when SARA_TIMING or
+    #   SARA_TRACE ask for one
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None and (TIMING_SUMMARY or TRACE_PATH):
+            _recorder = TimingRecorder()
+            atexit.register(report_at_exit, _recorder)
+        return _recorder
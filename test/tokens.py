@@ -0,0 +1,117 @@
+import os
+import time
+import atexit
+import threading
+
+import jwt
+
+from keys import get_signing_key, swap_signing_key
+
+
+# lifetime of an expiring identity token - matches the server's expectations for short-lived tokens
+EXPIRING_TOKEN_LIFETIME_SECONDS = 60
+
+# stop reusing an expiring token this many seconds before its 'expires' claim, so it can't expire in flight
+EXPIRY_SAFETY_MARGIN_SECONDS = 15
+
+is_cache_enabled = not os.environ.get("SARA_DISABLE_TOKEN_CACHE")
+
+
+class TokenCache:
+    # reuses signed identity tokens keyed by (email, expire, bearer-style)
+    #   - non-expiring identities are reused indefinitely
+    #   - expiring identities are reused until shortly before their 'expires' claim
+
+    def __init__(self, lifetime=EXPIRING_TOKEN_LIFETIME_SECONDS, margin=EXPIRY_SAFETY_MARGIN_SECONDS):
+        self.lifetime = lifetime
+        self.margin = margin
+        self._lock = threading.Lock()
+        self._tokens = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.signing_seconds = 0.0
+
+    def _sign(self, email, expire):
+        unsigned_identity = {"email": email}
+        expires = None
+        if expire:
+            expires = int(time.time()) + self.lifetime
+            unsigned_identity["expires"] = expires
+
+        start = time.perf_counter()
+        signed_identity = jwt.encode(unsigned_identity, get_signing_key().key(), algorithm='RS256')
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.misses += 1
+            self.signing_seconds += elapsed
+
+        return signed_identity, expires
+
+    def get(self, email, expire=False, uses_auth_bearer=False):
+        key = (email, bool(expire), bool(uses_auth_bearer))
+
+        if is_cache_enabled:
+            with self._lock:
+                cached = self._tokens.get(key)
+                if cached is not None:
+                    token, expires = cached
+                    if expires is None or time.time() < expires - self.margin:
+                        self.hits += 1
+                        return token
+
+        token, expires = self._sign(email, expire)
+
+        if is_cache_enabled:
+            with self._lock:
+                self._tokens[key] = (token, expires)
+
+        return token
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+    def stats(self):
+        with self._lock:
+            average_signing_seconds = self.signing_seconds / self.misses if self.misses else 0.0
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "signingSeconds": self.signing_seconds,
+                "averageSigningSeconds": average_signing_seconds,
+                # each hit avoided one signing operation
+                "estimatedSecondsSaved": self.hits * average_signing_seconds,
+            }
+
+    def print_stats(self):
+        stats = self.stats()
+        print(f"Token Cache: {stats['hits']} hits, {stats['misses']} misses - "
+              f"{stats['signingSeconds']:.3f}s spent signing, ~{stats['estimatedSecondsSaved']:.3f}s saved")
+
+
+token_cache = TokenCache()
+
+if os.environ.get("SARA_TOKEN_CACHE_STATS"):
+    atexit.register(token_cache.print_stats)
+
+
+def use_signing_key(signing_key):
+    # sign with a different key from now on - tokens signed with the old one are dropped; returns the old key
+    previous = swap_signing_key(signing_key)
+    token_cache.clear()
+    return previous
+
+
+def headers_for_token(token, uses_auth_bearer=False):
+    # always build a new dict - callers commonly add or mutate headers on the result
+    if uses_auth_bearer:
+        return {'Authorization': 'Bearer ' + token}
+    return {'x-signed-identity': token}
+
+
+def mint_many(emails, expire=False, uses_auth_bearer=False):
+    # sign identities for many users up front (e.g. multi-user test setup) - returns a dict of email to headers
+    return {email: headers_for_token(token_cache.get(email, expire, uses_auth_bearer), uses_auth_bearer)
+            for email in dict.fromkeys(emails)}
@@ -1,48 +1,27 @@
-import jwt
-import time
-import boto3
+import os
+import json
 
+from keys import get_signing_key
+from tokens import token_cache, headers_for_token, mint_many  # noqa: F401
 
-def get_signed_headers(email, expire=False, uses_auth_bearer=False):
-    private_key = get_private_key()
-
-    # create an unsigned object that expires in 60 seconds from now (unix system time + 60 seconds)
-    expiration_unix_time = int(time.time()) + 60
-
-    if expire:
-        # create an unsigned object that expires in 15 seconds from now (unix system time + 15 seconds)
-        unsigedIdentity = {"email": email, "expires": expiration_unix_time}
-    else:
-        unsigedIdentity = {"email": email}
-
-    # Create the JWT token
-    signedIdentity = jwt.encode(unsigedIdentity, private_key, algorithm='RS256')
 
-    if uses_auth_bearer:
-        signedHeaders = {'Authorization': 'Bearer ' + signedIdentity}
-    else:
-        signedHeaders = {'x-signed-identity': signedIdentity}
+def get_signed_headers(email, expire=False, uses_auth_bearer=False):
+    # signed tokens are reused until shortly before they expire (non-expiring tokens are reused indefinitely)
+    #   expiring tokens carry an 'expires' claim 60 seconds from signing time - see tokens.py
+    signedIdentity = token_cache.get(email, expire, uses_auth_bearer)
 
-    return signedHeaders
+    return headers_for_token(signedIdentity, uses_auth_bearer)
 
 
 def get_private_key():
+    # the key is fetched once per process (and TTL) from the configured provider - see keys.py
+    return get_signing_key().pem()
 
-    secret_name = "boost-sara/sara-client-private-key"
-    region_name = "us-west-2"
-
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=region_name
-    )
-
-    get_secret_value_response = client.get_secret_value(
-        SecretId=secret_name
-    )
-
-    # Decrypts secret using the associated KMS key.
-    private_key = get_secret_value_response['SecretString']
 
-    return private_key
+def write_json_atomically(path, data):
+    # checkpoints and pool entries are written to a temporary file first, so a concurrent reader (or a run
+    #   interrupted mid-write) never sees a partial file
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temporary_path, path)